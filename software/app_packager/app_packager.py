@@ -8,6 +8,7 @@ import hashlib
 import io
 import json
 import tarfile
+import zlib
 import html
 from typing import Tuple, Iterator, List, Protocol, runtime_checkable
 
@@ -18,6 +19,13 @@ DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
 DIRECTORY_WEB_DOWNOADSx = "web_downloads"
 
 TAR_SUFFIX = ".tar"
+GZ_SUFFIX = ".gz"
+# The deflate window: The device needs 2**GZIP_WBITS bytes of RAM to decompress.
+# Must match 'utils_tar_stream.GZIP_WBITS'.
+GZIP_WBITS = 10
+MANIFEST_SUFFIX = ".json"
+# Per file blobs, named by their sha256: Shared by all branches
+DIRECTORY_BLOBS = "blobs"
 FILENAME_APP_PACKAGE_PY = "app_package.py"
 
 
@@ -165,11 +173,16 @@ class TarSrc:
         self._verbose = verbose
         self._app_package = app_package
         link = self.version + "/" + (branch.sha + TAR_SUFFIX)
-        self.tar_filename = directory_web_downloads / app_package.name / link
+        link_manifest = self.version + "/" + (branch.sha + MANIFEST_SUFFIX)
+        link_blobs = self.version + "/" + DIRECTORY_BLOBS
+        directory_app = directory_web_downloads / app_package.name
+        self.tar_filename = directory_app / link
 
         self.tar_filename.parent.mkdir(parents=True, exist_ok=True)
+        (directory_app / link_blobs).mkdir(parents=True, exist_ok=True)
         with self.tar_filename.open("wb") as f:
             files: List[str] = []
+            files_sha256 = {}
             with tarfile.open(name="app.tar", mode="w", fileobj=f) as tar:
 
                 def add_file(name: str, data: bytes):
@@ -187,23 +200,43 @@ class TarSrc:
                         if verbose:
                             print(f"    TarSrc: {name=}")
                         add_file(name, compiled_bytes)
+                        sha256 = hashlib.sha256(compiled_bytes).hexdigest()
+                        files_sha256[name] = sha256
+                        (directory_app / link_blobs / sha256).write_bytes(
+                            compiled_bytes
+                        )
 
                 dict_manifest = dict(
                     files=files,
+                    sha256=files_sha256,
                     branch=branch.name,
                     commit_sha=branch.sha,
                     commit_pretty=branch.commit_pretty,
                 )
-                add_file(
-                    "config_package_manifest.json",
-                    json.dumps(dict_manifest, indent=4).encode(),
-                )
+                manifest = json.dumps(dict_manifest, indent=4).encode()
+                add_file("config_package_manifest.json", manifest)
+                (directory_app / link_manifest).write_bytes(manifest)
 
         data = self.tar_filename.read_bytes()
+        self.tar_gz_filename = self.tar_filename.with_name(
+            self.tar_filename.name + GZ_SUFFIX
+        )
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + GZIP_WBITS)
+        data_gz = compressor.compress(data) + compressor.flush()
+        self.tar_gz_filename.write_bytes(data_gz)
+        if verbose:
+            print(f"    {self.version}: {len(data)} bytes tar, {len(data_gz)} bytes gz")
         self.dict_tar = dict(
             link=link,
             sha256=hashlib.sha256(data).hexdigest(),
             size_bytes=len(data),
+            # The same tar compressed: 'sha256' verifies the decompressed tar
+            link_gz=link + GZ_SUFFIX,
+            size_bytes_gz=len(data_gz),
+            # Delta update: The manifest and the blobs of the changed files
+            manifest=link_manifest,
+            manifest_sha256=hashlib.sha256(manifest).hexdigest(),
+            blobs=link_blobs,
         )
 
     def _build_filename_relative(self, file: pathlib.Path, suffix: str) -> str:
@@ -304,6 +337,7 @@ def main(repo_directory: pathlib.Path, verbose: bool, no_checkout: bool) -> None
                             verbose=verbose,
                         )
                         index_app.add_index(link=tar.tar_filename, tag="p")
+                        index_app.add_index(link=tar.tar_gz_filename, tag="p")
                         dict_tars[tar.version] = tar.dict_tar
 
                     index_app.add_branch(branch=branch, dict_tars=dict_tars)
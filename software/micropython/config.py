@@ -2,8 +2,77 @@ from utils_constants import DURATION_MIN_MS, DURATION_S_MS
 
 MEASURE_INTERVAL_MS = const(10000)
 
+# SHT31 acquisition mode:
+#  "single_shot": Start a measurement every cycle (command, wait, read)
+#  "periodic": The SHT31 measures SHT31_PERIODIC_MPS times per second, every cycle reads the latest measurement
+#  "art": Like "periodic" with accelerated response time, 4 measurements per second
+# "periodic" and "art" are opt-in: 1/SHT31_PERIODIC_MPS must be shorter than MEASURE_INTERVAL_MS,
+# else the SHT31 NACKs the fetch as there is no new measurement.
+SHT31_MODE = "single_shot"
+SHT31_PERIODIC_MPS = 0.5  # 0.5, 1, 2, 4 or 10 measurements per second
+
 HEATER_BOARD_MAX_C = const(110.0)
 
+# The main loop, see 'main.py':
+#  False: Sequential loop `main_core2()`, sensors, heater and network in turn.
+#    A stalled broker or NTP server delays the heater: Up to
+#    `utils_wlan.MQTT_SOCKET_TIMEOUT_S` per publish and per spool replay
+#    (SPOOL_REPLAY_PUBLISHES) and the NTP timeout on a reconnect.
+#  True: Core 0 runs sensors, statemachine and heater `main_core0()`,
+#    core 1 runs WLAN, MQTT and app package polling `main_core1()`
+ENABLE_DUAL_CORE = False
+
+# Number of previous sample frames kept by `Sensors.frame`
+SAMPLE_HISTORY = const(6)
+
+# Logfile on flash in DIRECTORY_LOGS. False: stdout only.
+# Lines are buffered and written once the buffer is full, after LOGFILE_FLUSH_MS,
+# on a state change and on an error.
+LOGFILE_ENABLED = False
+LOGFILE_FLUSH_BYTES = const(4096)  # LittleFS block size
+LOGFILE_FLUSH_MS = 5 * DURATION_MIN_MS
+# True: SENSORS_VALUES are written in binary to 'logdata_<n>.bin'
+LOGFILE_BINARY = True
+# Rotation: Segments 'logdata_<n>.*', the oldest ones are removed.
+LOGFILE_BUDGET_BYTES = const(400_000)  # All segments
+LOGFILE_SEGMENT_BYTES = const(50_000)  # Then a new segment is started
+LOGFILE_SEGMENTS_MAX = const(10)
+LOGFILE_FLOOR_BYTES = const(150_000)  # Free bytes on the filesystem, os.statvfs()
+
+# Without LOGFILE_ENABLED: The recent lines are kept in a RAM ring.
+# The ring is written to flash on a state change, on an error, on a late
+# watchdog feed and before a reset and published by MQTT after the next boot.
+# 0: disabled
+LOGRING_BYTES = const(8_000)
+# Also written every LOGRING_PERSIST_MS if lines were added, for example
+# 10 * DURATION_MIN_MS. 0: disabled, every write of the ring wears the flash.
+LOGRING_PERSIST_MS = const(0)
+
+# Store and forward: Samples which could not be published are stored on flash
+# and replayed as soon as the broker is reachable again.
+SPOOL_BUDGET_BYTES = const(256_000)  # 0: disabled. Above, the oldest segment is evicted.
+SPOOL_SEGMENT_BYTES = const(8_000)
+SPOOL_INTERVAL_MS = DURATION_MIN_MS  # Store at most one sample per interval, annotations always
+SPOOL_REPLAY_LINES = const(8)  # Lines per replay publish
+SPOOL_REPLAY_PUBLISHES = const(3)  # Replay publishes per cycle
+
+# Line protocol timestamps: "s", "ms" or "ns".
+# Must match the receiver, for telegraf 'influx_timestamp_precision'.
+INFLUXDB_TIMESTAMP_PRECISION = "ns"
+# True: Every publish carries the device timestamp.
+# False: Only batched and spooled records carry the device timestamp.
+MQTT_TIMESTAMPS = False
+
+# MQTT delta mode: A field is only published if it moved beyond the deadband
+# of its Measurement. All fields are published every MQTT_FULL_FRAME_MS.
+MQTT_DELTA = False
+MQTT_FULL_FRAME_MS = 10 * DURATION_MIN_MS
+
+# MQTT batching: Samples and annotations are collected and published as one
+# multi line payload with timestamps. Requires the RTC to be set by NTP.
+MQTT_BATCH_SAMPLES = const(1)  # 1: Every sample is published immediately
+MQTT_BATCH_MS = const(60_000)  # Publish at the latest after this time
+
 # Statemachine
 SM_REGENERATE_DIFF_ABS_G_KG = const(10.0)
 SM_REGENERATE_HOT_C = HEATER_BOARD_MAX_C - 5.0
@@ -5,6 +5,44 @@ R_HIGH   = const(1)
 R_MEDIUM = const(2)
 R_LOW    = const(3)
 
+# Datasheet: max. measurement duration for high repeatability: 15.5 ms
+MEASURE_MS = const(16)
+
+_CMD_ART = b'\x2b\x32'
+_CMD_BREAK = b'\x30\x93'
+_CMD_FETCH_DATA = const(0xe000)
+
+class CRCError(Exception):
+    pass
+
+
+def _crc8(buf, start):
+    """
+    CRC-8 of the two bytes buf[start], buf[start+1].
+    Datasheet: polynomial 0x31, initialization 0xFF.
+    """
+    crc = 0xff
+    for i in range(start, start + 2):
+        crc ^= buf[i]
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xff
+            else:
+                crc = (crc << 1) & 0xff
+    return crc
+
+
+def _decode(raw):
+    """
+    Check the CRC of both words and return the raw temperature and humidity.
+    """
+    if _crc8(raw, 0) != raw[2]:
+        raise CRCError('CRC mismatch temperature: %s' % bytes(raw))
+    if _crc8(raw, 3) != raw[5]:
+        raise CRCError('CRC mismatch humidity: %s' % bytes(raw))
+    return (raw[0] << 8) + raw[1], (raw[3] << 8) + raw[4]
+
+
 class SHT31(object):
     """
     This class implements an interface to the SHT31 temprature and humidity
@@ -25,6 +63,15 @@ class SHT31(object):
             }
         }
 
+    # Periodic data acquisition: measurements per second -> repeatability -> command
+    _map_mps_r = {
+        0.5: {R_HIGH: b'\x20\x32', R_MEDIUM: b'\x20\x24', R_LOW: b'\x20\x2f'},
+        1: {R_HIGH: b'\x21\x30', R_MEDIUM: b'\x21\x26', R_LOW: b'\x21\x2d'},
+        2: {R_HIGH: b'\x22\x36', R_MEDIUM: b'\x22\x20', R_LOW: b'\x22\x2b'},
+        4: {R_HIGH: b'\x23\x34', R_MEDIUM: b'\x23\x22', R_LOW: b'\x23\x29'},
+        10: {R_HIGH: b'\x27\x37', R_MEDIUM: b'\x27\x21', R_LOW: b'\x27\x2a'},
+    }
+
     def __init__(self, i2c, addr=0x44):
         """
         Initialize a sensor object on the given I2C bus and accessed by the
@@ -51,16 +98,78 @@ class SHT31(object):
 
     def _raw_temp_humi(self, r=R_HIGH, cs=True):
         """
-        Read the raw temperature and humidity from the sensor and skips CRC
-        checking.
+        Read the raw temperature and humidity from the sensor.
+        Raises CRCError if the data is corrupt.
         Returns a tuple for both values in that order.
         """
-        if r not in (R_HIGH, R_MEDIUM, R_LOW):
-            raise ValueError('Wrong repeatabillity value given!')
-        self._send(self._map_cs_r[cs][r])
+        self.trigger(r, cs)
         time.sleep_ms(50)
-        raw = self._recv(6)
-        return (raw[0] << 8) + raw[1], (raw[3] << 8) + raw[4]
+        return self.fetch()
+
+    def trigger(self, resolution=R_HIGH, clock_stretch=True):
+        """
+        Start a single shot measurement and return immediately.
+        Call `fetch()` after the conversion time (`MEASURE_MS`).
+        """
+        if resolution not in (R_HIGH, R_MEDIUM, R_LOW):
+            raise ValueError('Wrong repeatabillity value given!')
+        self._send(self._map_cs_r[clock_stretch][resolution])
+
+    def fetch(self):
+        """
+        Read the raw temperature and humidity of a measurement started
+        by `trigger()`. Raises CRCError if the data is corrupt.
+        Returns a tuple for both values in that order.
+        """
+        return _decode(self._recv(6))
+
+    def start_periodic(self, mps=1, resolution=R_HIGH):
+        """
+        Start the periodic data acquisition with 'mps' measurements per
+        second (0.5, 1, 2, 4 or 10). The sensor measures on its own,
+        use `fetch_periodic()` to read the latest measurement.
+        """
+        if mps not in self._map_mps_r:
+            raise ValueError('Wrong measurements per second value given!')
+        if resolution not in (R_HIGH, R_MEDIUM, R_LOW):
+            raise ValueError('Wrong repeatabillity value given!')
+        self._send(self._map_mps_r[mps][resolution])
+
+    def start_art(self):
+        """
+        Start the periodic data acquisition with accelerated response
+        time (ART): 4 measurements per second.
+        Use `fetch_periodic()` to read the latest measurement.
+        """
+        self._send(_CMD_ART)
+
+    def stop_periodic(self):
+        """
+        Stop the periodic data acquisition and return to single shot mode.
+        The sensor requires 1 ms before it accepts the next command.
+        """
+        self._send(_CMD_BREAK)
+        time.sleep_ms(1)
+
+    def fetch_periodic(self):
+        """
+        Read the latest measurement in periodic data acquisition mode:
+        Fetch data command and read in one I2C transaction (repeated start).
+        The sensor NACKs (OSError) if there was no new measurement since
+        the last fetch. Raises CRCError if the data is corrupt.
+        Returns the raw temperature and humidity in that order.
+        """
+        return _decode(
+            self._i2c.readfrom_mem(self._addr, _CMD_FETCH_DATA, 6, addrsize=16)
+        )
+
+    def get_raw_temp_humi(self, resolution=R_HIGH, clock_stretch=True):
+        """
+        Read the raw temperature and humidity counts (16 bit each).
+        Use `convert_temp_humi()` to get physical values.
+        Returns a tuple for both values in that order.
+        """
+        return self._raw_temp_humi(resolution, clock_stretch)
 
     def get_temp_humi(self, resolution=R_HIGH, clock_stretch=True, celsius=True):
         """
@@ -69,6 +178,15 @@ class SHT31(object):
         Returns a tuple for both values in that order.
         """
         t, h = self._raw_temp_humi(resolution, clock_stretch)
+        return self.convert_temp_humi(t, h, celsius)
+
+    @staticmethod
+    def convert_temp_humi(t, h, celsius=True):
+        """
+        Convert the raw counts to the temperature in degree celsius or
+        fahrenheit and relative humidity.
+        Returns a tuple for both values in that order.
+        """
         if celsius:
             temp = -45 + (175 * (t / 65535))
         else:
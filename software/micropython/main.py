@@ -1,6 +1,7 @@
 import rp2
 import os
 import gc
+import time
 import machine
 import micropython
 import _thread
@@ -11,6 +12,8 @@ micropython.alloc_emergency_exception_buf(100)
 import utils_button
 import utils_wlan
 import utils_constants
+import utils_ring_buffer
+import config
 import config_secrets
 from utils_wdt import wdt
 from utils_logstdout import logfile
@@ -24,6 +27,10 @@ from utils_constants import DIRECTORY_LOGS
 
 ENABLE_APP_PACKAGE_UPDATE = True
 ENABLE_WDT = True
+# Core 1: samples and annotations queued from core 0 to core 1
+TELEMETRY_RING_SIZE = 8
+# Core 1: reboot if core 1 did not report for this time
+CORE1_TIMEOUT_MS = 5 * utils_constants.DURATION_MIN_MS
 
 boot_cause = {
     machine.PWRON_RESET: "power on",
@@ -41,8 +48,25 @@ else:
     ENABLE_APP_PACKAGE_UPDATE = False
     wdt.disable()
 
+
+def wdt_late(duration_ms: int) -> None:
+    # The next hang might reset the board: Keep the log
+    line = f"wdt.feed() late: {duration_ms}ms"
+    # `wdt.feed()` might be called while this core holds a log lock or
+    # `utils_fs.lock`: Waiting for them would deadlock.
+    if not logfile.flush(blocking=False):
+        print(f"WARNING: {line}: logfile busy")
+        return
+    # The locks are not held by this core
+    logfile.log(LogfileTags.LOG_WARNING, line)
+    logfile.flush()
+
+
+wdt.register_late_cb(wdt_late)
+
 # hardware.production_test(wdt.feed)
-sensoren = Sensoren(hardware=hardware)
+# Dual core: The network runs on core 1
+sensoren = Sensoren(hardware=hardware, dual_core=config.ENABLE_DUAL_CORE)
 
 sm = Statemachine(hardware=hardware, sensoren=sensoren)
 sensoren.sensor_statemachine.set_sm(sm=sm)
@@ -53,23 +77,43 @@ class AppPackage:
         self.next_poll_ms = 0
 
     def poll(self):
+        dict_tar = self.poll_new_version(wdt_feed=wdt.feed)
+        if dict_tar is not None:
+            if self.download(dict_tar, wdt_feed=wdt.feed):
+                reboot_after_update()
+
+    def poll_new_version(self, wdt_feed):
+        """
+        Return dict_tar if a new version is available.
+        """
         if not ENABLE_APP_PACKAGE_UPDATE:
-            return
+            return None
 
         if tb.now_ms < self.next_poll_ms:
-            return
+            return None
 
         self.next_poll_ms += 10 * utils_constants.DURATION_MIN_MS
 
         # version = "mpy_version/6.1"
         version = "src"
-        dict_tar = new_version_available(version, wdt_feed=wdt.feed)
+        return new_version_available(version, wdt_feed=wdt_feed)
 
-        if dict_tar is not None:
-            # Upload late: We will reboot afterwords!
-            from utils_app_package_download import download_new_version
+    def download(self, dict_tar, wdt_feed) -> bool:
+        """
+        Return True if installed: The caller has to reboot.
+        """
+        # Upload late: We will reboot afterwords!
+        from utils_app_package_download import download_new_version
+
+        # The logring: In case the download crashes
+        logfile.flush()
+        return download_new_version(dict_tar, wdt_feed=wdt_feed)
 
-            download_new_version(dict_tar, wdt_feed=wdt.feed)
+
+def reboot_after_update():
+    hardware.heater.set_power(False)
+    logfile.flush()
+    machine.soft_reset()
 
 
 def main_core2(mqtt):
@@ -98,15 +142,177 @@ def main_core2(mqtt):
         hardware.led_toggle()
 
         sm.state()
-        hardware.heater.set_board_C(board_C=sensoren.heater_C)
+        hardware.heater.set_board_C(board_C=sensoren.heater_board_C)
 
         # logfile.log(LogfileTags.LOG_DEBUG, f"{tb.sleep_done_ms}, {tb.sleep_done_ms}")
+        logfile.log_values(sensoren.sensors, sensoren.stdout_measurements)
+
+        # Send two annotations within 20s
+        if mqtt_first_time_counter == 1:
+            if mqtt.publish_annotation(
+                title="Software version",
+                text=sw_version(),
+            ):
+                mqtt_first_time_counter += 1
+        if mqtt_first_time_counter == 0:
+            if mqtt.publish_annotation(
+                title=f"Boot due to {boot_cause}",
+                text=f"serial {config_secrets.HW_SERIAL}, {config_secrets.HW_VERSION}, {wlan.ip_address}",
+            ):
+                mqtt_first_time_counter += 1
+
+        values = sensoren.sensors.get_mqtt_values()
+        if mqtt.publish_values(values):
+            sensoren.sensors.mqtt_published(values)
+
+        if wlan.got_ip_address:
+            try:
+                app_package.poll()
+            except Exception as e:
+                print(f"ERROR: app package update failed: {e}")
+
+        # Idle point: Rotate the logfile
+        logfile.housekeeping()
+        sensoren.sensor_uptime.collect_garbage()
+        tb.reanchor()
+        tb.sleep()
+
+
+class Core1Handover:
+    """
+    Dual core: State written by core 1 and consumed by core 0.
+    Every attribute is written by one core only, or handed over by
+    assigning a single reference.
+    """
+
+    def __init__(self):
+        self.alive_ms = time.ticks_ms()
+        # MQTT requested this state: Switched by core 0
+        self.pending_state = None
+        # Core 1 installed a new app package: Core 0 reboots
+        self.reboot = False
+
+    def alive(self) -> None:
+        """
+        Core 1 reports. Also passed as 'wdt_feed' to the blocking calls of core 1.
+        """
+        self.alive_ms = time.ticks_ms()
+
+
+def start_core1(mqtt) -> tuple:
+    """
+    Start `main_core1()` on core 1.
+    Statechanges and MQTT requests are handed over from now on.
+    Return (ring, handover) for `control_core0()`.
+    """
+    ring = utils_ring_buffer.RingBuffer(size=TELEMETRY_RING_SIZE)
+    sensoren.sensor_telemetry.set_ring(ring)
+    handover = Core1Handover()
+
+    def statechange(old: str, new: str, why: str) -> None:
+        annotation = utils_wlan.annotation(
+            title=f"Statechange: {old} -> {new}", text=f"Why: {why}"
+        )
+        ring.put((time.ticks_ms(), tb.epoch_ms, None, annotation))
+
+    sm.statechange_cb = statechange
+
+    def statemachine_cb(msg: str):
+        # Called on core 1
+        print(f"statemachine_cb: {msg}")
+        handover.pending_state = msg
+
+    mqtt.register_callback("statemachine", statemachine_cb)
+
+    # The watchdog must detect a hanging core 0: Core 1 must not feed it.
+    wlan.register_wdt_feed_cb(lambda: False)
+    _thread.start_new_thread(main_core1, (mqtt, ring, handover))
+    return ring, handover
+
+
+def control_core0(ring, handover) -> None:
+    """
+    One cycle of core 0: Never waits for the network.
+    * runs the sensors, the statemachine and the heater
+    * queues the sample for core 1
+    * reboots if core 1 hangs or installed a new app package
+    """
+    hardware.led_toggle()
+    sensoren.measure()
+    hardware.led_toggle()
+
+    pending_state = handover.pending_state
+    if pending_state is not None:
+        handover.pending_state = None
+        sm.switch_by_name(pending_state)
+    sm.state()
+    hardware.heater.set_board_C(board_C=sensoren.heater_board_C)
+
+    logfile.log_values(sensoren.sensors, sensoren.stdout_measurements)
+    # Stamped now, not when core 1 publishes.
+    # Copy: The list is reused by the next cycle
+    ring.put(
+        (
+            time.ticks_ms(),
+            tb.epoch_ms,
+            list(sensoren.sensors.get_mqtt_values()),
+            None,
+        )
+    )
+
+    duration_ms = time.ticks_diff(time.ticks_ms(), handover.alive_ms)
+    if duration_ms > CORE1_TIMEOUT_MS:
         logfile.log(
-            LogfileTags.SENSORS_VALUES,
-            sensoren.sensors.get_values(sensoren.stdout_measurements),
-            stdout=False,
+            LogfileTags.LOG_ERROR,
+            f"Core 1 did not respond for {duration_ms}ms: reboot!",
         )
+        hardware.heater.set_power(False)
+        machine.reset()
+
+    if handover.reboot:
+        reboot_after_update()
+
+    # Idle point: Rotate the logfile
+    logfile.housekeeping()
+    sensoren.sensor_uptime.collect_garbage()
+
 
+def main_core0(mqtt):
+    """
+    Dual core: Core 0, see `control_core0()`. Feeds the watchdog.
+    """
+    print("DEBUG: main_core0: started")
+    ring, handover = start_core1(mqtt)
+
+    while True:
+        if button_pressed.take():
+            sm.set_forward_to_next_state()
+        control_core0(ring, handover)
+        tb.sleep()
+
+
+def main_core1(mqtt, ring, handover):
+    """
+    Dual core: Core 1
+    * connects to WLAN
+    * publishes the samples and annotations queued by core 0
+    * polls for new app packages and installs them: Core 0 keeps
+      controlling the heater and reboots afterwards
+    """
+    print("DEBUG: main_core1: started")
+    mqtt_first_time_counter = 0
+    app_package = AppPackage()
+    while True:
+        handover.alive()
+        tb.reanchor()
+
+        item = ring.get()
+        if item is None:
+            time.sleep_ms(100)
+            continue
+
+        # Either 'values' of a sample or 'annotation' = (fields, tags)
+        put_ms, epoch_ms, values, annotation = item
         # Send two annotations within 20s
         if mqtt_first_time_counter == 1:
             if mqtt.publish_annotation(
@@ -121,24 +327,65 @@ def main_core2(mqtt):
             ):
                 mqtt_first_time_counter += 1
 
-        mqtt.publish(fields=sensoren.sensors.get_mqtt_fields(), tags={})
+        if annotation is None:
+            success = mqtt.publish_values(values, timestamp_ms=epoch_ms)
+            if success:
+                sensoren.sensors.mqtt_published(values)
+        else:
+            fields, tags = annotation
+            success = mqtt.publish(fields=fields, tags=tags, timestamp_ms=epoch_ms)
+        if success:
+            sensoren.sensor_telemetry.latency_ms = time.ticks_diff(
+                time.ticks_ms(), put_ms
+            )
 
         if wlan.got_ip_address:
-            app_package.poll()
+            try:
+                dict_tar = app_package.poll_new_version(wdt_feed=handover.alive)
+                if dict_tar is not None:
+                    if app_package.download(dict_tar, wdt_feed=handover.alive):
+                        handover.reboot = True
+                        return
+            except Exception as e:
+                print(f"ERROR: app package update failed: {e}")
 
-        gc.collect()
-        tb.sleep()
+
+class ButtonFlag:
+    """
+    Dual core: Set by `pressed()`, consumed by core 0.
+    """
+
+    def __init__(self):
+        self._set = False
+
+    def set(self) -> None:
+        self._set = True
+
+    def take(self) -> bool:
+        if self._set:
+            self._set = False
+            return True
+        return False
 
 
 def pressed(duration_ms: int) -> None:
+    if button_pressed is not None:
+        # Dual core: forwarded by `main_core0()`
+        button_pressed.set()
+        return
     sm.set_forward_to_next_state()
 
 
 def long_pressed(timer) -> None:
+    # A scheduled callback: It might have interrupted the owner of a log lock
+    logfile.flush(blocking=False)
     # Hard reset micropython
     machine.reset()
 
 
+# Dual core: set by `pressed()`
+button_pressed = None
+
 utils_button.Button(
     hardware.PIN_GPIO_BUTTON,
     pressed_cb=pressed,
@@ -224,8 +471,13 @@ wlan.register_wdt_feed_cb(wdt.feed)
 wlan.power_off()
 wlan.connect()
 mqtt = utils_wlan.MQTT(wlan)
+mqtt.set_field_names(sensoren.sensors.get_mqtt_tags())
+sensoren.sensor_telemetry.set_mqtt(mqtt)
 
-if True:
+if config.ENABLE_DUAL_CORE:
+    button_pressed = ButtonFlag()
+    main_core0(mqtt)
+elif True:
     main_core2(mqtt)
 else:
     _thread.start_new_thread(main_core2, (mqtt,))
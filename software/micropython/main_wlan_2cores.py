@@ -84,7 +84,7 @@ def main_core2(mqtt):
         sensoren.measure()
 
         sm.state()
-        hardware.heater.set_board_C(board_C=sensoren.heater_C)
+        hardware.heater.set_board_C(board_C=sensoren.heater_board_C)
 
         # logfile.log(LogfileTags.LOG_DEBUG, f"{tb.sleep_done_ms}, {tb.sleep_done_ms}")
         logfile.log(
@@ -97,6 +97,9 @@ def main_core2(mqtt):
         # print(sensors.get_mqtt_fields())
         mqtt.publish(fields=sensoren.sensors.get_mqtt_fields())
 
+        # Idle point: Rotate the logfile
+        logfile.housekeeping()
+        tb.reanchor()
         tb.sleep()
 
 def pressed(duration_ms: int) -> None:
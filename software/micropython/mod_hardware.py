@@ -7,13 +7,17 @@ import config
 class Heater:
     def __init__(self, hardware: "Hardware"):
         self._power = False
-        self._board_C = 0.0
+        # None: The board temperature is not known, do not heat
+        self._board_C = None
         self._hardware = hardware
         self.write_power()
 
     @property
     def power_controlled(self) -> bool:
-        if self._board_C > config.HEATER_BOARD_MAX_C:
+        board_C = self._board_C
+        if board_C is None:
+            return False
+        if board_C > config.HEATER_BOARD_MAX_C:
             return False
         return self._power
 
@@ -22,7 +26,7 @@ class Heater:
 
         self.write_power()
 
-    def set_board_C(self, board_C: int):
+    def set_board_C(self, board_C: float):
         self._board_C = board_C
 
         self.write_power()
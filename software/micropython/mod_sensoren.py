@@ -7,12 +7,16 @@ from utils_measurement import (
     SensorHeater,
     Sensors,
     SensorStatemachine,
+    SensorTelemetry,
     SensorUptime,
 )
 
 
 class Sensoren:
-    def __init__(self, hardware: Hardware):
+    def __init__(self, hardware: Hardware, dual_core: bool = False):
+        """
+        dual_core: Telemetry of the queue from core 0 to core 1.
+        """
         self.sensor_uptime = SensorUptime()
         self.sensor_sht31_ambient = SensorSHT31("ambient", addr=0x45, i2c=hardware.i2c0)
         self.sensor_sht31_heater = SensorSHT31("heater", addr=0x44, i2c=hardware.i2c1)
@@ -21,10 +25,19 @@ class Sensoren:
         )
         self.sensor_heater_power = SensorHeater("heater", hardware.heater)
         self.sensor_statemachine = SensorStatemachine()
+        self.sensor_telemetry = SensorTelemetry(dual_core=dual_core)
+        self.stdout_measurements = [
+            self.sensor_statemachine.measurement_string,
+            self.sensor_heater_power.measurement_power,
+            self.sensor_sht31_ambient.measurement_H,  # measurement_C, measurement_H, measurement_dew_C
+            self.sensor_sht31_heater.measurement_H,
+            self.sensor_sht31_filament.measurement_H,
+        ]
         self.sensors = Sensors(
             sensors=[
                 self.sensor_uptime,
                 self.sensor_statemachine,
+                self.sensor_telemetry,
                 SensorOnOff("button", "", hardware.PIN_GPIO_BUTTON, inverse=True),
                 SensorOnOff("led_green", "", hardware.PIN_GPIO_LED_GREEN),
                 SensorOnOff("led_red", "", hardware.PIN_GPIO_LED_RED),
@@ -36,14 +49,8 @@ class Sensoren:
                 self.sensor_sht31_heater,
                 self.sensor_sht31_filament,
             ],
+            log_measurements=self.stdout_measurements,
         )
-        self.stdout_measurements = [
-            self.sensor_statemachine.measurement_string,
-            self.sensor_heater_power.measurement_power,
-            self.sensor_sht31_ambient.measurement_H,  # measurement_C, measurement_H, measurement_dew_C
-            self.sensor_sht31_heater.measurement_H,
-            self.sensor_sht31_filament.measurement_H,
-        ]
 
     def measure(self) -> None:
         self.sensors.measure()
@@ -71,3 +78,10 @@ class Sensoren:
     @property
     def heater_C(self) -> float:
         return self.sensor_sht31_heater.measurement_C.value
+
+    @property
+    def heater_board_C(self) -> float:
+        """
+        For `Heater.set_board_C()`: None if the SHT31 is broken.
+        """
+        return self.sensor_sht31_heater.measurement_C.value_valid
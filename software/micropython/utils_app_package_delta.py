@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import binascii
+
+import utils_fs
+from utils_tar_stream import STAGING_SUFFIX
+
+FILENAME_MANIFEST = "config_package_manifest.json"
+
+
+def changed_files(manifest_local: dict, manifest_new: dict) -> list:
+    """
+    Return the files of 'manifest_new' whose SHA-256 differs from 'manifest_local'.
+    None if a manifest has no SHA-256 per file: A full update is required.
+    """
+    if manifest_local is None:
+        return None
+    sha256_local = manifest_local.get("sha256", None)
+    sha256_new = manifest_new.get("sha256", None)
+    if (sha256_local is None) or (sha256_new is None):
+        return None
+    return [
+        name
+        for name, sha256 in sha256_new.items()
+        if (sha256_local.get(name, None) != sha256) or not utils_fs.exists(name)
+    ]
+
+
+class DeltaInstaller:
+    """
+    Installs only the files which changed since the local manifest.
+
+    The new manifest is downloaded from `dict_tar["manifest"]`, every changed
+    file from `dict_tar["blobs"]/<sha256>`. The files are staged like
+    `utils_tar_stream.TarStreamInstaller` and renamed when all are verified.
+
+    'get': `get(link)` returns a stream with `readinto()` and `close()`.
+    """
+
+    def __init__(self, get, wdt_feed=lambda: False, chunk_size=2048):
+        self._get = get
+        self._wdt_feed = wdt_feed
+        self._buf = bytearray(chunk_size)
+        self._mv = memoryview(self._buf)
+        # The names of the staged files
+        self.staged = []
+        self.files_total = 0
+        self.size_bytes = 0
+
+    def _download(self, link: str, f) -> str:
+        """
+        Write 'link' into 'f'. Return the SHA-256.
+        """
+        hash = hashlib.sha256()
+        stream = self._get(link)
+        try:
+            while True:
+                n = stream.readinto(self._mv)
+                if not n:
+                    break
+                hash.update(self._mv[:n])
+                with utils_fs.lock:
+                    f.write(self._mv[:n])
+                self.size_bytes += n
+                self._wdt_feed()
+        finally:
+            stream.close()
+        return binascii.hexlify(hash.digest()).decode("ascii")
+
+    def _stage(self, name: str, link: str, sha256_expected: str) -> None:
+        self.staged.append(name)
+        with utils_fs.lock:
+            f = open(name + STAGING_SUFFIX, "wb")
+        try:
+            sha256 = self._download(link, f)
+        finally:
+            with utils_fs.lock:
+                f.close()
+        if sha256 != sha256_expected:
+            raise ValueError(f"{name}: {sha256=} {sha256_expected=}!")
+        print(f"  stage {name}")
+
+    def install(self, dict_tar: dict, manifest_local: dict) -> bool:
+        """
+        Return True if the changed files have been replaced.
+        False if nothing changed on the filesystem: A full update is required.
+        """
+        try:
+            self._stage(
+                FILENAME_MANIFEST, dict_tar["manifest"], dict_tar["manifest_sha256"]
+            )
+            with utils_fs.lock:
+                with open(FILENAME_MANIFEST + STAGING_SUFFIX, "r") as f:
+                    manifest_new = json.load(f)
+            names = changed_files(manifest_local, manifest_new)
+            if names is None:
+                print("Delta update: No SHA-256 per file")
+                self.abort()
+                return False
+            self.files_total = len(manifest_new["sha256"])
+            print(f"Delta update: {len(names)} of {self.files_total} files changed")
+            for name in names:
+                sha256 = manifest_new["sha256"][name]
+                self._stage(name, f"{dict_tar['blobs']}/{sha256}", sha256)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ERROR: Delta update failed: {e}")
+            self.abort()
+            return False
+        self.commit()
+        return True
+
+    def commit(self) -> None:
+        # The manifest at last: It marks the update as complete
+        with utils_fs.lock:
+            for name in self.staged[1:] + self.staged[:1]:
+                os.rename(name + STAGING_SUFFIX, name)
+
+    def abort(self) -> None:
+        with utils_fs.lock:
+            for name in self.staged:
+                try:
+                    os.remove(name + STAGING_SUFFIX)
+                except OSError:
+                    pass
+        self.staged = []
@@ -1,14 +1,19 @@
 import os
+import time
 import urequests
-import machine
-import hashlib
-import lib_tarfile
 import json
-import binascii
 import config_secrets
+import utils_fs
+from utils_constants import FILENAME_LOGRING, FILENAME_LOGRING_UPLOAD
+from utils_tar_stream import STAGING_SUFFIX, install, decompress
+from utils_app_package_delta import DeltaInstaller
+from utils_app_package_poll import read_manifest
 
+# Written by previous versions which saved the tar before unpacking it.
 TAR_FILENAME = const("config_package.tar")
 FILENAME_UPDATE_SUCCESS = const("update_success.txt")
+# Data, not part of the package
+FILES_KEEP = (FILENAME_LOGRING[1:], FILENAME_LOGRING_UPLOAD[1:])
 
 
 # class _DirCacheObsolete:
@@ -54,48 +59,28 @@ FILENAME_UPDATE_SUCCESS = const("update_success.txt")
 #         assert False, ex
 
 
-def _save_response_to_file(response, wdt_feed, chunk_size=2048):
-    # https://github.com/SpotlightKid/mrequests/
-    with open(TAR_FILENAME, "wb") as f:
-        hash = hashlib.sha256()
-
-        while True:
-            chunk = response.raw.read(chunk_size)
-            if not chunk:
-                break
-            hash.update(chunk)
-            f.write(chunk)
-            wdt_feed()
-
-        response.raw.close()
-        return binascii.hexlify(hash.digest()).decode("ascii")
-
-
-def _unpack_tarfile():
-    t = lib_tarfile.TarFile(TAR_FILENAME)
-    for i in t:
-        if i.type == lib_tarfile.DIRTYPE:
-            os.mkdir(i.name)
-            continue
-        f = t.extractfile(i)
-        print(f"  {TAR_FILENAME}: {i.name}")
-        with open(i.name, "wb") as of:
-            of.write(f.read())
-
-
 def _remove_obsolete_files():
+    """
+    The caller holds `utils_fs.lock`.
+    """
     with open("config_package_manifest.json", "r") as f:
         files = json.load(f)["files"]
 
-    for file in os.listdir():
+    for entry in os.ilistdir():
+        file = entry[0]
+        if entry[1] == 0x4000:
+            # Directories like DIRECTORY_LOGS
+            continue
         if file.startswith("config_"):
             continue
         if file in files:
             continue
+        if file in FILES_KEEP:
+            continue
         print(f"Remove file {file}")
         try:
             os.remove(file)
-        except OsError as e:
+        except OSError as e:
             print(f"Failed to remove '{file}': {e}")
 
     if "main.mpy" in files:
@@ -105,29 +90,94 @@ def _remove_obsolete_files():
             f.write("import main2\n")
 
 
-def download_new_version(dict_tar: dict, wdt_feed = lambda: False) -> None:
-    url = f"{config_secrets.APP_PACKAGE_URL}/{dict_tar['link']}"
+def _remove_staged_files():
+    """
+    '*.new' files left by an update which was interrupted by a reset.
+    `_remove_obsolete_files()` keeps 'config_*': For example
+    'config_package_manifest.json.new'.
+    The caller holds `utils_fs.lock`.
+    """
+    for entry in os.ilistdir():
+        file = entry[0]
+        if (entry[1] != 0x4000) and file.endswith(STAGING_SUFFIX):
+            print(f"Remove staged file {file}")
+            try:
+                os.remove(file)
+            except OSError as e:
+                print(f"Failed to remove '{file}': {e}")
+
+
+def _get_stream(link: str):
+    url = f"{config_secrets.APP_PACKAGE_URL}/{link}"
+    response = urequests.get(url, stream=True)
+    if response.status_code != 200:
+        response.close()
+        raise OSError(f"{url}: status {response.status_code}")
+    return response.raw
+
+
+def _download_full(dict_tar: dict, wdt_feed) -> bool:
+    # The '.tar.gz' is several times smaller: Packages built before only have the tar.
+    compressed = "link_gz" in dict_tar
+    link = dict_tar["link_gz"] if compressed else dict_tar["link"]
+    size_bytes = dict_tar["size_bytes_gz"] if compressed else dict_tar["size_bytes"]
+    url = f"{config_secrets.APP_PACKAGE_URL}/{link}"
     print(f"Download new package from: {url}")
+    start_ms = time.ticks_ms()
     wdt_feed()
     response = urequests.get(url, stream=True)
     wdt_feed()
     assert response.status_code == 200, response.status_code
 
-    sha256 = _save_response_to_file(response, wdt_feed=wdt_feed)
-    sha256_expected = dict_tar["sha256"]
-    if sha256 != sha256_expected:
-        print(f"{TAR_FILENAME}: {sha256=} {sha256_expected=}!")
-        os.remove(TAR_FILENAME)
-        return
-
+    try:
+        stream = decompress(response.raw) if compressed else response.raw
+        installed = install(
+            stream, sha256_expected=dict_tar["sha256"], wdt_feed=wdt_feed
+        )
+    finally:
+        response.raw.close()
+    duration_ms = time.ticks_diff(time.ticks_ms(), start_ms)
+    print(
+        f"Full update: {size_bytes} bytes downloaded ({dict_tar['size_bytes']} bytes tar) in {duration_ms}ms"
+    )
+    return installed
+
+
+def _download_delta(dict_tar: dict, wdt_feed) -> bool:
+    if "manifest" not in dict_tar:
+        # Package built before the delta update
+        return False
+    delta = DeltaInstaller(get=_get_stream, wdt_feed=wdt_feed)
+    installed = delta.install(dict_tar, read_manifest())
+    print(
+        f"Delta update: {delta.size_bytes} of {dict_tar['size_bytes']} bytes downloaded"
+    )
+    return installed
+
+
+def download_new_version(dict_tar: dict, wdt_feed = lambda: False) -> bool:
+    """
+    Return True if the new version is installed: The caller has to reboot.
+    Dual core: Runs on core 1 while core 0 keeps logging.
+    """
+    try:
+        with utils_fs.lock:
+            os.remove(TAR_FILENAME)
+    except OSError:
+        pass
+    with utils_fs.lock:
+        _remove_staged_files()
     wdt_feed()
-    _unpack_tarfile()
+    if not _download_delta(dict_tar, wdt_feed=wdt_feed):
+        if not _download_full(dict_tar, wdt_feed=wdt_feed):
+            return False
 
     wdt_feed()
-    _remove_obsolete_files()
+    with utils_fs.lock:
+        _remove_obsolete_files()
 
-    with open(FILENAME_UPDATE_SUCCESS, "w"):
-        pass
+        with open(FILENAME_UPDATE_SUCCESS, "w"):
+            pass
 
-    os.sync()
-    machine.soft_reset()
+        os.sync()
+    return True
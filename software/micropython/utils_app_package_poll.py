@@ -2,19 +2,21 @@ import os
 import json
 import urequests
 import config_secrets
+import utils_fs
 
 FILENAME_UPDATE_SUCCESS = const("update_success.txt")
 
-def _read_manifest() -> dict:
+def read_manifest() -> dict:
     try:
-        with open("config_package_manifest.json", "r") as f:
-            return json.load(f)
+        with utils_fs.lock:
+            with open("config_package_manifest.json", "r") as f:
+                return json.load(f)
     except OSError:
         return None
 
 
 def sw_version() -> str:
-    manifest = _read_manifest()
+    manifest = read_manifest()
     if manifest is None:
         return "?"
     return manifest['commit_sha']
@@ -35,12 +37,13 @@ def new_version_available(tar_version="src", wdt_feed=lambda: False):
     dict_tar = latest_package["dict_tars"][tar_version]
 
     try:
-        os.stat(FILENAME_UPDATE_SUCCESS)
+        with utils_fs.lock:
+            os.stat(FILENAME_UPDATE_SUCCESS)
     except OSError:
         print(f"New download: '{FILENAME_UPDATE_SUCCESS}' does not exist: The last update failed.")
         return dict_tar
         
-    manifest = _read_manifest()
+    manifest = read_manifest()
     if manifest is None:
         print("New download: Failed to read 'config_package_manifest.json'")
         return dict_tar
@@ -52,7 +55,8 @@ def new_version_available(tar_version="src", wdt_feed=lambda: False):
 
     print(f"New download: {latest_package['commit_pretty']}")
     try:
-        os.remove(FILENAME_UPDATE_SUCCESS)
+        with utils_fs.lock:
+            os.remove(FILENAME_UPDATE_SUCCESS)
     except OSError as e:
         print(f"Failed to remove '{FILENAME_UPDATE_SUCCESS}': {e}")
     
@@ -1,4 +1,8 @@
 DIRECTORY_LOGS = "/logs"
+DIRECTORY_SPOOL = "/spool"
+# See 'utils_log_ring.py'
+FILENAME_LOGRING = "/logring.txt"
+FILENAME_LOGRING_UPLOAD = "/logring_upload.txt"
 LOGFILE_DELIMITER = "\t"
 
 DURATION_S_MS = const(1000)
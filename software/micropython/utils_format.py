@@ -0,0 +1,62 @@
+"""
+Format numbers into a preallocated bytearray: No str is allocated.
+Small ints do not allocate in micropython, floats do (one per arithmetic step).
+"""
+
+_MINUS = const(45)  # "-"
+_DOT = const(46)  # "."
+_ZERO = const(48)  # "0"
+
+_SCALE = (1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+
+def format_int(buf, pos: int, n: int) -> int:
+    """
+    Write the decimal digits of 'n' to 'buf' at 'pos'.
+    Return the position after the last digit.
+    """
+    if n < 0:
+        buf[pos] = _MINUS
+        pos += 1
+        n = -n
+    # Count the digits
+    digits = 1
+    rest = n // 10
+    while rest > 0:
+        digits += 1
+        rest //= 10
+    end = pos + digits
+    i = end
+    while True:
+        i -= 1
+        buf[i] = _ZERO + n % 10
+        n //= 10
+        if i == pos:
+            return end
+
+
+def format_fixed(buf, pos: int, value: float, decimals: int) -> int:
+    """
+    Like "{value:0.<decimals>f}", but rounds half away from zero.
+    Return the position after the last digit.
+    """
+    scale = _SCALE[decimals]
+    if value < 0:
+        n = int(-value * scale + 0.5)
+        if n > 0:
+            buf[pos] = _MINUS
+            pos += 1
+    else:
+        n = int(value * scale + 0.5)
+    if decimals == 0:
+        return format_int(buf, pos, n)
+    pos = format_int(buf, pos, n // scale)
+    buf[pos] = _DOT
+    pos += 1
+    fraction = n % scale
+    i = pos + decimals
+    while i > pos:
+        i -= 1
+        buf[i] = _ZERO + fraction % 10
+        fraction //= 10
+    return pos + decimals
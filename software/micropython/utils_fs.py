@@ -0,0 +1,37 @@
+"""
+Dual core: Core 0 writes the logfile, core 1 the spool, the logring upload
+and the app package update. LittleFS is not thread safe:
+Every filesystem call must hold 'lock'.
+
+The lock is not reentrant. Hold it only for the filesystem call itself,
+never while waiting for the network or feeding the watchdog.
+Lock order: `Logfile.lock` or `LogRing.lock` before 'lock'.
+"""
+import os
+import _thread
+
+lock = _thread.allocate_lock()
+
+
+def exists(filename: str) -> bool:
+    """
+    Takes 'lock': The caller must not hold it.
+    """
+    try:
+        with lock:
+            os.stat(filename)
+        return True
+    except OSError:
+        return False
+
+
+def available() -> bool:
+    """
+    For scheduled callbacks like a Timer: They might have interrupted the
+    owner of 'lock' on this core, waiting for it would deadlock.
+    Return True if 'lock' is free now.
+    """
+    if not lock.acquire(False):
+        return False
+    lock.release()
+    return True
@@ -1,3 +1,9 @@
+import math
+
+# 'utils_humidity_table.py' holds about 5 kB of arrays: It is imported by the
+# `*_table()` functions only, the firmware does not use them.
+
+
 def rel_to_abs(T: float, P: float, RH: float) -> float:
     """Returns absolute humidity given relative humidity.
 
@@ -310,5 +316,293 @@ def rel_to_dpt(T: float, P: float, RH: float) -> float:
     return T_d
 
 
+def _t_d_sonntag(e: float) -> float:
+    """Sonntag-1994 eq 10: dew point in C from the vapor pressure e in Pascals."""
+    y = math.log(e / 611.213)
+    return (
+        13.715 * y
+        + 8.4262 * 10**-1 * y**2
+        + 1.9048 * 10**-2 * y**3
+        + 7.8158 * 10**-3 * y**4
+    )
+
+
+def _table_t_d(e: float) -> float:
+    """Sonntag-1994 eq 10 interpolated from `E_D_PA`: dew point in C from
+    the vapor pressure e in Pascals.
+    Returns None if e is outside the table."""
+    from utils_humidity_table import TABLE_T_MIN_C, TABLE_STEP_C, E_D_PA
+
+    if e < E_D_PA[0] or e > E_D_PA[-1]:
+        return None
+    lo = 0
+    hi = len(E_D_PA) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) >> 1
+        if E_D_PA[mid] > e:
+            hi = mid
+        else:
+            lo = mid
+    e_lo = E_D_PA[lo]
+    return TABLE_T_MIN_C + (lo + (e - e_lo) / (E_D_PA[hi] - e_lo)) * TABLE_STEP_C
+
+
+def _table_f_w(t: float, e_w_hpa: float, P_hpa: float) -> float:
+    """Sonntag-1994 eq 22 with the exponential terms from the tables.
+    Falls back to the exact terms if t is outside the table."""
+    from utils_humidity_table import TABLE_T_MIN_C, TABLE_STEP_C, F_W_A, F_W_B
+
+    x = (t - TABLE_T_MIN_C) / TABLE_STEP_C
+    i = int(x)
+    if x < 0.0 or i >= len(F_W_A) - 1:
+        a = 38 + 173 * math.exp(-t / 43)
+        b = 6.39 + 4.28 * math.exp(-t / 107)
+    else:
+        fraction = x - i
+        a = F_W_A[i] + (F_W_A[i + 1] - F_W_A[i]) * fraction
+        b = F_W_B[i] + (F_W_B[i + 1] - F_W_B[i]) * fraction
+    return 1 + (10**-4 * e_w_hpa) / (273 + t) * (
+        (a * (1 - (e_w_hpa / P_hpa))) + (b * ((P_hpa / e_w_hpa) - 1))
+    )
+
+
+def _table_e_w(t: float) -> float:
+    """Returns e_w in Pascals interpolated from `E_W_PA`.
+    Returns None if t is outside the table."""
+    from utils_humidity_table import TABLE_T_MIN_C, TABLE_STEP_C, E_W_PA
+
+    x = (t - TABLE_T_MIN_C) / TABLE_STEP_C
+    i = int(x)
+    if x < 0.0 or i >= len(E_W_PA) - 1:
+        return None
+    return E_W_PA[i] + (E_W_PA[i + 1] - E_W_PA[i]) * (x - i)
+
+
+def rel_to_abs_table(T: float, P: float, RH: float) -> float:
+    """Table driven version of `rel_to_abs()`.
+
+    e_w and the exponential terms of f_w are linearly interpolated from
+    'utils_humidity_table.py' (-20C..130C, step 0.5C).
+    Maximum relative error against `rel_to_abs()`: 3e-4.
+    Outside the table, `rel_to_abs()` is returned.
+
+    The error is verified by 'run_humidity_table.py'.
+    """
+    t = T - 273.15
+    e_w = _table_e_w(t)
+    if e_w is None:
+        return rel_to_abs(T=T, P=P, RH=RH)
+    RH = max(0.1, RH)
+    f_w = _table_f_w(t, e_w / 100, P / 100)
+    e_prime = (RH / 100) * f_w * e_w
+    return (0.62198 * e_prime) / (P - e_prime)
+
+
+def rel_to_dpt_table(T: float, P: float, RH: float) -> float:
+    """Table driven version of `rel_to_dpt()`.
+
+    The dew point is looked up in the inverted Sonntag-1994 eq 10 table
+    instead of evaluating the polynomial and `math.log()` in every iteration.
+    Maximum error against `rel_to_dpt()`: 0.01 K.
+    Outside the table, `rel_to_dpt()` is returned. A dew point
+    below the table is calculated using Sonntag-1994 eq 10.
+
+    The error is verified by 'run_humidity_table.py'.
+    """
+    t = T - 273.15
+    e_w = _table_e_w(t)
+    if e_w is None:
+        return rel_to_dpt(T=T, P=P, RH=RH)
+    RH = max(0.1, RH)
+    e_w_hpa = e_w / 100
+    P_hpa = P / 100
+    e_prime = (RH / 100) * _table_f_w(t, e_w_hpa, P_hpa) * e_w
+
+    # Sonntag-1994 eq 24, initial approximation
+    f_w_td = 1.0016 + 3.15 * 10**-6 * P_hpa - (0.074 / P_hpa)
+    t_d = None
+    for n in range(100):
+        t_d_prev = t_d
+        e = e_prime / f_w_td  # Sonntag-1994 eq 9 and 20
+        t_d = _table_t_d(e)
+        if t_d is None:
+            t_d = _t_d_sonntag(e)
+        if (t_d_prev is not None) and (math.fabs(t_d - t_d_prev) < 0.01):
+            break
+        f_w_td = _table_f_w(t_d, e_w_hpa, P_hpa)
+    return 273.15 + t_d
+
+
+NEWTON_MAX_ITERATIONS = 4
+
+
+class Psychrometrics:
+    """Evaluates one sample (T, P, RH) and shares the intermediate terms.
+
+    `rel_to_dpt()`, `rel_to_abs()` and `rel_to_vol()` each compute the
+    saturation vapor pressure e_w and the enhancement factor f_w.
+    This class computes them once in the constructor; `dpt()`, `abs()`
+    and `vol()` return the same values as the functions above.
+
+    Inputs:
+    --------
+    T : float
+        Absolute temperature in units Kelvin (K).
+    P : float
+        Total pressure in units Pascals (Pa).
+    RH : float
+        Relative humidity in units percent (%).
+    """
+
+    def __init__(self, T: float, P: float, RH: float):
+        assert isinstance(T, float)
+        assert isinstance(P, float)
+        assert isinstance(RH, float)
+
+        self.T = T
+        self.P = P
+        self.RH = RH
+        self.dpt_iterations = 0
+        self.t = T - 273.15  # Celsius from Kelvin
+        self.P_hpa = P / 100  # hectoPascals (hPa) from Pascals (Pa)
+
+        # Sonntag-1994 eq 7; e_w in Pascals
+        ln_e_w = (
+            -6096 * T**-1
+            + 21.2409642
+            - 2.711193 * 10**-2 * T
+            + 1.673952 * 10**-5 * T**2
+            + 2.433502 * math.log(T)
+        )
+        self.e_w = math.exp(ln_e_w)
+        self.e_w_hpa = self.e_w / 100
+
+        # Sonntag-1994 eq 22: these terms do not depend on the temperature
+        # and are reused by the dew point iteration.
+        self._f_w_c = 10**-4 * self.e_w_hpa
+        self._f_w_a = 1 - (self.e_w_hpa / self.P_hpa)
+        self._f_w_b = (self.P_hpa / self.e_w_hpa) - 1
+        self.f_w = self._f_w(self.t)
+
+        # Sonntag-1994 eq 18: saturation vapor pressure in air-water mixture
+        self.e_prime_w = self.f_w * self.e_w
+
+    def _f_w(self, t: float) -> float:
+        """Sonntag-1994 eq 22, enhancement factor for water at t (C)."""
+        return 1 + self._f_w_c / (273 + t) * (
+            ((38 + 173 * math.exp(-t / 43)) * self._f_w_a)
+            + ((6.39 + 4.28 * math.exp(-t / 107)) * self._f_w_b)
+        )
+
+    def _e_prime(self, RH: float) -> float:
+        """Vapor pressure of water in air, in Pascals."""
+        return (RH / 100) * self.e_prime_w
+
+    def abs(self) -> float:
+        """Same as `rel_to_abs()`: [kg water vapor / kg dry air]."""
+        epsilon = 0.62198  # (molar mass of water vapor) / (molar mass of dry air)
+        e_prime = self._e_prime(max(0.1, self.RH))
+        return (epsilon * e_prime) / (self.P - e_prime)
+
+    def vol(self) -> float:
+        """Same as `rel_to_vol()`: [kg water vapor / m^3 moist air]."""
+        R_v = 461.525  # R/M_v; units: [J / (kg*K)]
+        c_1 = 10**5  # [(g/m^3) / ((1/hPa)*(J/(kg*K))*(K/1))]
+        e_prime_hpa = self._e_prime(self.RH) / 100
+        z = 1 - (70 - self.t) * self.P_hpa * 10**-8  # Sonntag-1994 eq 3
+        d_v = (c_1 * e_prime_hpa) / (z * R_v * self.T)
+        return d_v / 1000
+
+    def dpt(self) -> float:
+        """Same as `rel_to_dpt()`: dew point in Kelvin (K)."""
+        e_prime = self._e_prime(max(0.1, self.RH))
+        P_hpa = self.P_hpa
+
+        n = 0
+        t_d = None
+        while True:
+            if n == 0:
+                # Sonntag-1994 eq 24, initial approximation
+                f_w_td = 1.0016 + 3.15 * 10**-6 * P_hpa - (0.074 / P_hpa)
+            else:
+                f_w_td = self._f_w(t_d)
+            t_d_prev = t_d
+
+            # Sonntag-1994 eq 9, 20 and 10
+            y = math.log(e_prime / f_w_td / 611.213)
+            t_d = (
+                13.715 * y
+                + 8.4262 * 10**-1 * y**2
+                + 1.9048 * 10**-2 * y**3
+                + 7.8158 * 10**-3 * y**4
+            )
+
+            if n > 100:
+                break  # good enough
+            if n > 0 and math.fabs(t_d - t_d_prev) < 0.01:
+                break
+            n += 1
+        self.dpt_iterations = n + 1
+        return 273.15 + t_d
+
+    def dpt_newton(self) -> float:
+        """Dew point in Kelvin (K), within 0.001 K of `dpt()`.
+
+        `dpt()` iterates t_d = eq10(e_prime / f_w(t_d)) until it settles
+        which takes between 2 and 6 iterations.
+        Here, Newton's method solves the same equation, seeded by the
+        Magnus formula. It converges in 1 to 3 iterations, mostly 2
+        (see 'run_benchmark_humidity.py'), and never takes more than
+        `NEWTON_MAX_ITERATIONS`.
+        The number of iterations used is stored in `dpt_iterations`.
+        """
+        RH = max(0.1, self.RH)
+        e_prime = self._e_prime(RH)
+        f_w_c = self._f_w_c
+        f_w_a = self._f_w_a
+        f_w_b = self._f_w_b
+
+        # Magnus formula as seed
+        gamma = math.log(RH / 100) + 17.62 * self.t / (243.12 + self.t)
+        t_d = 243.12 * gamma / (17.62 - gamma)
+
+        for n in range(1, NEWTON_MAX_ITERATIONS + 1):
+            # Sonntag-1994 eq 22 and its derivative
+            exp_a = math.exp(-t_d / 43)
+            exp_b = math.exp(-t_d / 107)
+            sum_ab = (38 + 173 * exp_a) * f_w_a + (6.39 + 4.28 * exp_b) * f_w_b
+            f_w_td = 1 + f_w_c / (273 + t_d) * sum_ab
+            d_f_w_td = (
+                f_w_c
+                / (273 + t_d)
+                * (
+                    (-173 / 43 * exp_a) * f_w_a
+                    + (-4.28 / 107 * exp_b) * f_w_b
+                    - sum_ab / (273 + t_d)
+                )
+            )
+
+            # Sonntag-1994 eq 9, 20 and 10 and the derivative of eq 10
+            y = math.log(e_prime / f_w_td / 611.213)
+            h = t_d - (
+                13.715 * y
+                + 8.4262 * 10**-1 * y**2
+                + 1.9048 * 10**-2 * y**3
+                + 7.8158 * 10**-3 * y**4
+            )
+            d_eq10 = (
+                13.715
+                + 2 * 8.4262 * 10**-1 * y
+                + 3 * 1.9048 * 10**-2 * y**2
+                + 4 * 7.8158 * 10**-3 * y**3
+            )
+            step = h / (1 + d_eq10 * d_f_w_td / f_w_td)
+            t_d -= step
+            if math.fabs(step) < 0.001:
+                break
+        self.dpt_iterations = n
+        return 273.15 + t_d
+
+
 if __name__ == "__main__":
     pass
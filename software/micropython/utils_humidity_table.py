@@ -0,0 +1,243 @@
+"""
+Generated by 'run_humidity_table.py'. Do not edit!
+
+Tables for the table driven functions in 'utils_humidity.py'.
+Index i corresponds to TABLE_T_MIN_C + i * TABLE_STEP_C.
+"""
+from array import array
+
+TABLE_T_MIN_C = -20.0
+TABLE_T_MAX_C = 130.0
+TABLE_STEP_C = 0.5
+
+# Sonntag-1994 eq 7; e_w in Pascals
+E_W_PA = array(
+    "f",
+    (
+        126.052956, 131.585617, 137.335327, 143.309494, 149.515808, 155.962112,
+        162.65654, 169.607376, 176.823212, 184.312851, 192.085342, 200.149979,
+        208.516327, 217.194199, 226.19368, 235.525131, 245.199203, 255.226791,
+        265.619141, 276.387756, 287.544434, 299.101288, 311.07077, 323.465668,
+        336.299042, 349.58429, 363.335175, 377.565857, 392.290741, 407.524689,
+        423.282867, 439.580841, 456.43457, 473.860382, 491.875031, 510.495605,
+        529.739685, 549.625183, 570.170532, 591.394531, 613.316467, 635.956055,
+        659.333374, 683.469116, 708.384399, 734.100769, 760.640259, 788.025452,
+        816.279419, 845.425781, 875.488525, 906.492371, 938.462463, 971.4245,
+        1005.40466, 1040.42993, 1076.52759, 1113.72559, 1152.05261, 1191.53772,
+        1232.21082, 1274.10205, 1317.24268, 1361.66431, 1407.39905, 1454.4801,
+        1502.94092, 1552.8158, 1604.13965, 1656.94824, 1711.27783, 1767.16565,
+        1824.64929, 1883.76733, 1944.55896, 2007.06433, 2071.32422, 2137.37988,
+        2205.27393, 2275.04932, 2346.75, 2420.4209, 2496.10693, 2573.85498,
+        2653.71216, 2735.72656, 2819.94678, 2906.4231, 2995.20581, 3086.34644,
+        3179.89771, 3275.91284, 3374.44629, 3475.55298, 3579.28931, 3685.71265,
+        3794.88062, 3906.85254, 4021.68848, 4139.44922, 4260.19775, 4383.99609,
+        4510.90869, 4641.00098, 4774.33936, 4910.99023, 5051.02295, 5194.50635,
+        5341.51123, 5492.10889, 5646.37256, 5804.37598, 5966.19434, 6131.90381,
+        6301.58105, 6475.30566, 6653.15674, 6835.21484, 7021.56299, 7212.28418,
+        7407.4624, 7607.18408, 7811.53613, 8020.60693, 8234.48633, 8453.26367,
+        8677.0332, 8905.8877, 9139.9209, 9379.23047, 9623.91211, 9874.06641,
+        10129.793, 10391.1924, 10658.3682, 10931.4258, 11210.4688, 11495.6055,
+        11786.9443, 12084.5957, 12388.6709, 12699.2812, 13016.543, 13340.5713,
+        13671.4834, 14009.3984, 14354.4365, 14706.7188, 15066.3691, 15433.5137,
+        15808.2764, 16190.7881, 16581.1758, 16979.5723, 17386.1094, 17800.9238,
+        18224.1484, 18655.9219, 19096.3828, 19545.6738, 20003.9375, 20471.3145,
+        20947.9551, 21434.0059, 21929.6133, 22434.9297, 22950.1094, 23475.3066,
+        24010.6758, 24556.373, 25112.5625, 25679.4043, 26257.0586, 26845.6914,
+        27445.4727, 28056.5664, 28679.1465, 29313.3828, 29959.4492, 30617.5234,
+        31287.7812, 31970.4023, 32665.5684, 33373.4609, 34094.2695, 34828.1758,
+        35575.3711, 36336.043, 37110.3906, 37898.6055, 38700.8789, 39517.418,
+        40348.418, 41194.0781, 42054.6133, 42930.2188, 43821.1055, 44727.4883,
+        45649.5742, 46587.5781, 47541.7188, 48512.2109, 49499.2773, 50503.1406,
+        51524.0234, 52562.1523, 53617.7578, 54691.0664, 55782.3086, 56891.7266,
+        58019.5547, 59166.0273, 60331.3867, 61515.8789, 62719.7461, 63943.2344,
+        65186.5977, 66450.0859, 67733.9453, 69038.4375, 70363.8203, 71710.3594,
+        73078.2969, 74467.9219, 75879.4844, 77313.2578, 78769.5156, 80248.5234,
+        81750.5625, 83275.9062, 84824.8359, 86397.6406, 87994.5859, 89615.9766,
+        91262.0859, 92933.2188, 94629.6562, 96351.7031, 98099.6484, 99873.7891,
+        101674.438, 103501.891, 105356.461, 107238.445, 109148.172, 111085.93,
+        113052.055, 115046.859, 117070.664, 119123.781, 121206.547, 123319.289,
+        125462.328, 127635.992, 129840.633, 132076.562, 134344.141, 136643.703,
+        138975.578, 141340.141, 143737.703, 146168.641, 148633.297, 151132.016,
+        153665.188, 156233.125, 158836.234, 161474.859, 164149.359, 166860.109,
+        169607.484, 172391.859, 175213.609, 178073.109, 180970.75, 183906.906,
+        186881.953, 189896.297, 192950.312, 196044.406, 199178.969, 202354.406,
+        205571.094, 208829.453, 212129.891, 215472.812, 218858.625, 222287.734,
+        225760.562, 229277.516, 232839.031, 236445.531, 240097.422, 243795.141,
+        247539.125, 251329.797, 255167.594, 259052.938, 262986.281, 266968.062,
+        270998.75,
+    ),
+)
+
+# Inverse of Sonntag-1994 eq 10: the vapor pressure in Pascals at dew point t
+E_D_PA = array(
+    "f",
+    (
+        121.333427, 126.951393, 132.78714, 138.848007, 145.141495, 151.6754,
+        158.457657, 165.496475, 172.800293, 180.377777, 188.237854, 196.389648,
+        204.842606, 213.606384, 222.690933, 232.106445, 241.863419, 251.972626,
+        262.445099, 273.292236, 284.525665, 296.157349, 308.199554, 320.664917,
+        333.566315, 346.917023, 360.730652, 375.021149, 389.802826, 405.090302,
+        420.898621, 437.243195, 454.139832, 471.604675, 489.654327, 508.305756,
+        527.576355, 547.483887, 568.046692, 589.283325, 611.213013, 633.855225,
+        657.230042, 681.357971, 706.259888, 731.957336, 758.472229, 785.826965,
+        814.044495, 843.148376, 873.162476, 904.111328, 936.02002, 968.914185,
+        1002.82001, 1037.76416, 1073.77393, 1110.87732, 1149.10266, 1188.47925,
+        1229.03674, 1270.8053, 1313.81604, 1358.10059, 1403.69104, 1450.62036,
+        1498.92224, 1548.63074, 1599.78088, 1652.40833, 1706.54944, 1762.24121,
+        1819.52136, 1878.42847, 1939.00183, 2001.28137, 2065.30786, 2131.12305,
+        2198.7688, 2268.28882, 2339.72656, 2413.12695, 2488.5354, 2565.99854,
+        2645.56348, 2727.27832, 2811.19189, 2897.35425, 2985.81567, 3076.62842,
+        3169.84424, 3265.51709, 3363.70117, 3464.45166, 3567.82471, 3673.87769,
+        3782.6687, 3894.25659, 4008.7019, 4126.06543, 4246.40918, 4369.79639,
+        4496.29102, 4625.9585, 4758.86475, 4895.07764, 5034.66504, 5177.69629,
+        5324.24268, 5474.37451, 5628.16553, 5785.68945, 5947.021, 6112.23633,
+        6281.4126, 6454.62891, 6631.96387, 6813.49902, 6999.31592, 7189.49854,
+        7384.13037, 7583.29736, 7787.08643, 7995.58594, 8208.88477, 8427.07422,
+        8650.24512, 8878.49219, 9111.90918, 9350.5918, 9594.63672, 9844.14355,
+        10099.2119, 10359.9424, 10626.4375, 10898.8027, 11177.1416, 11461.5615,
+        11752.1699, 12049.0771, 12352.3945, 12662.2334, 12978.709, 13301.9355,
+        13632.0293, 13969.1104, 14313.2969, 14664.7109, 15023.4746, 15389.7129,
+        15763.5518, 16145.1191, 16534.543, 16931.9531, 17337.4824, 17751.2656,
+        18173.4355, 18604.1328, 19043.4922, 19491.6562, 19948.7656, 20414.9648,
+        20890.3965, 21375.2109, 21869.5547, 22373.5781, 22887.4336, 23411.2734,
+        23945.2539, 24489.5332, 25044.2695, 25609.6211, 26185.7539, 26772.8281,
+        27371.0137, 27980.4766, 28601.3867, 29233.9141, 29878.2344, 30534.5215,
+        31202.9512, 31883.7051, 32576.9609, 33282.9023, 34001.7148, 34733.582,
+        35478.6953, 36237.2461, 37009.4219, 37795.4219, 38595.4375, 39409.6719,
+        40238.3203, 41081.5859, 41939.6758, 42812.793, 43701.1484, 44604.9492,
+        45524.4102, 46459.7461, 47411.1719, 48378.9062, 49363.168, 50364.1836,
+        51382.1758, 52417.3711, 53470, 54540.293, 55628.4844, 56734.8086,
+        57859.5039, 59002.8125, 60164.9766, 61346.2344, 62546.8398, 63767.0391,
+        65007.082, 66267.2266, 67547.7188, 68848.8281, 70170.8125, 71513.9297,
+        72878.4453, 74264.6328, 75672.75, 77103.0859, 78555.9062, 80031.4766,
+        81530.0938, 83052.0312, 84597.5781, 86167.0156, 87760.6328, 89378.7188,
+        91021.5781, 92689.4922, 94382.7656, 96101.7109, 97846.6172, 99617.7969,
+        101415.555, 103240.203, 105092.062, 106971.438, 108878.664, 110814.047,
+        112777.922, 114770.602, 116792.438, 118843.742, 120924.859, 123036.125,
+        125177.875, 127350.461, 129554.219, 131789.5, 134056.656, 136356.047,
+        138688.016, 141052.938, 143451.156, 145883.062, 148348.984, 150849.328,
+        153384.453, 155954.734, 158560.547, 161202.281, 163880.312, 166595.031,
+        169346.844, 172136.109, 174963.25, 177828.672, 180732.75, 183675.906,
+        186658.531, 189681.062, 192743.891, 195847.453, 198992.156, 202178.422,
+        205406.672, 208677.344, 211990.875, 215347.688, 218748.219, 222192.922,
+        225682.234, 229216.594, 232796.469, 236422.312, 240094.562, 243813.688,
+        247580.156, 251394.438, 255257, 259168.297, 263128.844, 267139.062,
+        271199.5,
+    ),
+)
+
+# Sonntag-1994 eq 22: 38 + 173 * exp(-t / 43)
+F_W_A = array(
+    "f",
+    (
+        313.45047, 310.266113, 307.118561, 304.007416, 300.93222, 297.892578,
+        294.888062, 291.918304, 288.982849, 286.08136, 283.213379, 280.378571,
+        277.576538, 274.806915, 272.069275, 269.363312, 266.688629, 264.044861,
+        261.431641, 258.848663, 256.295532, 253.771896, 251.277451, 248.811844,
+        246.374741, 243.96582, 241.584732, 239.231171, 236.904831, 234.605377,
+        232.332504, 230.085922, 227.865295, 225.670349, 223.500778, 221.356277,
+        219.236572, 217.141373, 215.070404, 213.023376, 211, 209.000015,
+        207.023163, 205.069168, 203.137756, 201.228668, 199.341644, 197.47644,
+        195.632812, 193.810486, 192.009232, 190.22879, 188.468948, 186.729431,
+        185.01004, 183.310516, 181.630646, 179.9702, 178.328949, 176.706665,
+        175.103134, 173.518143, 171.951477, 170.402924, 168.872269, 167.359314,
+        165.863846, 164.385666, 162.924576, 161.480377, 160.052872, 158.641876,
+        157.247192, 155.868622, 154.505997, 153.159119, 151.82782, 150.511902,
+        149.211197, 147.925537, 146.654739, 145.398621, 144.157043, 142.92981,
+        141.716751, 140.517731, 139.332565, 138.161102, 137.003189, 135.858658,
+        134.727356, 133.609131, 132.50383, 131.411316, 130.331436, 129.264023,
+        128.208969, 127.1661, 126.135284, 125.116394, 124.109276, 123.113808,
+        122.129845, 121.157257, 120.195908, 119.245682, 118.306435, 117.378044,
+        116.460388, 115.553345, 114.656784, 113.770592, 112.894638, 112.028816,
+        111.172997, 110.32708, 109.490936, 108.664459, 107.847542, 107.040062,
+        106.24192, 105.453003, 104.67321, 103.902428, 103.140564, 102.387497,
+        101.643143, 100.907394, 100.180145, 99.4613113, 98.7507858, 98.0484695,
+        97.3542786, 96.6681061, 95.9898682, 95.3194733, 94.6568298, 94.0018463,
+        93.3544312, 92.7145004, 92.0819702, 91.4567566, 90.8387604, 90.2279205,
+        89.6241302, 89.0273285, 88.4374237, 87.8543396, 87.2779922, 86.708313,
+        86.1452179, 85.5886307, 85.0384827, 84.4946899, 83.9571838, 83.4258957,
+        82.9007416, 82.3816681, 81.8685913, 81.3614426, 80.8601608, 80.3646774,
+        79.8749161, 79.3908157, 78.9123154, 78.4393463, 77.9718475, 77.5097504,
+        77.0529938, 76.6015167, 76.1552658, 75.7141647, 75.2781677, 74.8472137,
+        74.4212341, 74.0001907, 73.5840073, 73.1726303, 72.7660217, 72.3641052,
+        71.966835, 71.5741577, 71.1860199, 70.8023758, 70.4231567, 70.0483322,
+        69.6778336, 69.3116226, 68.9496384, 68.5918427, 68.2381821, 67.8886185,
+        67.5430832, 67.2015533, 66.8639679, 66.5302811, 66.2004547, 65.8744431,
+        65.5522003, 65.2336807, 64.9188385, 64.6076431, 64.3000488, 63.9960022,
+        63.6954727, 63.3984184, 63.1048012, 62.8145752, 62.5277023, 62.2441483,
+        61.9638748, 61.6868362, 61.4130058, 61.1423378, 60.8747978, 60.6103516,
+        60.3489647, 60.0905991, 59.8352165, 59.5827904, 59.3332825, 59.0866547,
+        58.8428841, 58.6019287, 58.3637581, 58.1283417, 57.8956451, 57.6656418,
+        57.4382935, 57.2135773, 56.9914589, 56.771904, 56.5548935, 56.3403854,
+        56.1283607, 55.9187889, 55.7116356, 55.5068779, 55.3044891, 55.1044388,
+        54.9067039, 54.7112541, 54.5180626, 54.3271027, 54.1383514, 53.9517822,
+        53.7673721, 53.5850906, 53.4049187, 53.2268295, 53.0508003, 52.8768044,
+        52.7048187, 52.5348244, 52.3667946, 52.2007065, 52.0365372, 51.8742676,
+        51.713871, 51.5553322, 51.3986244, 51.2437286, 51.0906258, 50.9392891,
+        50.7897034, 50.6418457, 50.4957008, 50.3512421, 50.2084541, 50.067318,
+        49.9278145, 49.7899208, 49.6536255, 49.5189018, 49.3857346, 49.2541122,
+        49.1240082, 48.9954071, 48.8682938, 48.7426491, 48.6184578, 48.4957047,
+        48.3743668, 48.2544327, 48.1358871, 48.0187111, 47.9028893, 47.7884064,
+        47.6752472, 47.5633965, 47.4528351, 47.3435555, 47.2355385, 47.1287727,
+        47.0232391, 46.9189224, 46.815815, 46.7139015, 46.613163, 46.513588,
+        46.4151688,
+    ),
+)
+
+# Sonntag-1994 eq 22: 6.39 + 4.28 * exp(-t / 107)
+F_W_B = array(
+    "f",
+    (
+        11.5496511, 11.5255966, 11.5016546, 11.4778242, 11.4541044, 11.4304953,
+        11.4069967, 11.3836079, 11.3603277, 11.3371553, 11.3140926, 11.2911358,
+        11.2682867, 11.2455444, 11.222908, 11.2003765, 11.1779509, 11.1556292,
+        11.1334124, 11.1112986, 11.0892878, 11.06738, 11.0455742, 11.0238695,
+        11.0022669, 10.9807644, 10.959362, 10.9380598, 10.9168568, 10.895752,
+        10.8747463, 10.8538389, 10.8330278, 10.812315, 10.7916985, 10.7711773,
+        10.7507524, 10.730423, 10.7101879, 10.6900473, 10.6700001, 10.6500463,
+        10.6301861, 10.6104183, 10.5907431, 10.5711594, 10.5516663, 10.5322647,
+        10.5129538, 10.4937325, 10.4746008, 10.4555588, 10.4366045, 10.4177399,
+        10.398962, 10.3802729, 10.3616695, 10.343154, 10.3247242, 10.3063812,
+        10.2881222, 10.2699499, 10.2518616, 10.2338572, 10.2159376, 10.198101,
+        10.1803474, 10.1626768, 10.1450882, 10.1275826, 10.110158, 10.0928144,
+        10.075552, 10.0583696, 10.0412683, 10.0242462, 10.0073032, 9.99043941,
+        9.97365379, 9.95694733, 9.94031811, 9.92376614, 9.90729141, 9.89089394,
+        9.87457275, 9.85832787, 9.84215832, 9.82606506, 9.8100462, 9.79410172,
+        9.77823162, 9.76243591, 9.74671364, 9.7310648, 9.71548843, 9.69998455,
+        9.6845541, 9.66919422, 9.65390682, 9.63869095, 9.62354565, 9.60847092,
+        9.59346581, 9.57853127, 9.56366634, 9.54887104, 9.5341444, 9.51948643,
+        9.50489712, 9.49037552, 9.47592163, 9.4615345, 9.44721508, 9.43296242,
+        9.41877651, 9.40465641, 9.39060211, 9.37661266, 9.36268902, 9.34883022,
+        9.33503628, 9.32130718, 9.30764103, 9.29403877, 9.28050041, 9.26702499,
+        9.25361252, 9.24026203, 9.22697449, 9.21374798, 9.20058346, 9.18748093,
+        9.17443943, 9.16145802, 9.14853764, 9.13567734, 9.12287712, 9.11013603,
+        9.09745502, 9.08483315, 9.07226944, 9.05976486, 9.04731846, 9.03493023,
+        9.02259922, 9.01032639, 8.99810982, 8.98595142, 8.9738493, 8.96180344,
+        8.94981289, 8.93787956, 8.92600155, 8.91417885, 8.90241051, 8.89069748,
+        8.87903976, 8.86743546, 8.85588551, 8.84438992, 8.83294773, 8.82155895,
+        8.81022263, 8.7989397, 8.78770924, 8.77653122, 8.7654047, 8.75433064,
+        8.74330807, 8.732337, 8.72141743, 8.7105484, 8.69972992, 8.68896198,
+        8.67824459, 8.66757679, 8.65695858, 8.64638996, 8.63587093, 8.62540054,
+        8.61497879, 8.60460567, 8.5942812, 8.58400536, 8.57377625, 8.56359577,
+        8.55346298, 8.54337692, 8.53333759, 8.52334499, 8.51340008, 8.50349998,
+        8.49364758, 8.48383999, 8.47407818, 8.4643631, 8.45469189, 8.44506645,
+        8.43548584, 8.42595005, 8.41645813, 8.40701103, 8.3976078, 8.38824749,
+        8.378932, 8.36965942, 8.36043072, 8.35124397, 8.3421011, 8.33300018,
+        8.32394218, 8.31492615, 8.30595207, 8.29701996, 8.28812981, 8.27928066,
+        8.27047253, 8.2617054, 8.25298023, 8.24429512, 8.23565006, 8.22704601,
+        8.21848106, 8.20995712, 8.20147228, 8.1930275, 8.18462181, 8.17625523,
+        8.16792774, 8.1596384, 8.15138912, 8.14317703, 8.13500404, 8.12686825,
+        8.11877155, 8.11071205, 8.10268974, 8.09470558, 8.08675766, 8.07884789,
+        8.07097435, 8.06313801, 8.05533791, 8.04757404, 8.03984642, 8.03215408,
+        8.02449894, 8.01687908, 8.00929451, 8.00174522, 7.99423122, 7.98675203,
+        7.97930813, 7.97189903, 7.96452379, 7.95718336, 7.94987726, 7.94260502,
+        7.93536711, 7.92816257, 7.92099142, 7.91385412, 7.90674973, 7.89967871,
+        7.89264059, 7.88563538, 7.87866259, 7.8717227, 7.86481476, 7.85793924,
+        7.85109568, 7.84428406, 7.83750439, 7.83075619, 7.82403898, 7.81735373,
+        7.81069946, 7.80407619, 7.79748344, 7.79092216, 7.78439093, 7.77789021,
+        7.77142, 7.76497984, 7.75856972, 7.75218916, 7.74583864, 7.73951769,
+        7.7332263, 7.72696447, 7.72073126, 7.71452761, 7.70835257, 7.70220661,
+        7.69608879, 7.69000006, 7.68393946, 7.67790699, 7.67190266, 7.66592646,
+        7.65997839,
+    ),
+)
@@ -38,9 +38,28 @@ measurements_example = [
 ]
 
 
-def build_payload(measurements, validate=True):
+def format_timestamp(timestamp_ms: int, precision: str) -> str:
+    """
+    Return the timestamp with leading space.
+    precision: "s", "ms" or "ns".
+      Must match the precision configured at the receiver.
+      "ns" is the line protocol default.
+    """
+    if precision == "ms":
+        return f" {timestamp_ms:d}"
+    if precision == "s":
+        return f" {timestamp_ms // 1000:d}"
+    assert precision == "ns", precision
+    return f" {timestamp_ms:d}000000"
+
+
+def build_payload(measurements, validate=True, precision="ns"):
     """
     https://docs.influxdata.com/influxdb/v2/reference/syntax/line-protocol/
+
+    A measurement may contain "timestamp_ms": milliseconds since 1970-01-01 UTC.
+    Without, the server will use the time of reception.
+    precision: See `format_timestamp()`.
     """
     assert isinstance(measurements, (list, tuple))
 
@@ -76,11 +95,50 @@ def build_payload(measurements, validate=True):
 
                     yield f"{field_name}={field_value}"
 
-            yield ",".join(iter_tags()) + " " + ",".join(iter_fields())
+            line = ",".join(iter_tags()) + " " + ",".join(iter_fields())
+            timestamp_ms = measurement.get("timestamp_ms", None)
+            if timestamp_ms is not None:
+                line += format_timestamp(timestamp_ms, precision)
+            yield line
 
     return "\n".join(iter_measurements())
 
 
+class LineProtocolEncoder:
+    """
+    Encodes lines with always the same measurement, tags and field names.
+
+    These are validated and escaped once in the constructor.
+    `encode()` only joins the field values: They are not validated!
+    The values are formatted by `Measurement.value_mqtt` and are valid by design.
+    """
+
+    def __init__(self, measurement: str, tags: dict, field_names: list):
+        assert not measurement.startswith("_"), measurement
+        prefix = [measurement]
+        for tag_name, tag_value in tags.items():
+            assert _RE_VALID_CHARACTERS_NAME.match(tag_name), tag_name
+            assert _RE_VALID_CHARACTERS_VALUE.match(tag_value), tag_value
+            prefix.append(f"{tag_name}={influxdb_escape(tag_value)}")
+        self._prefix = (",".join(prefix) + " ").encode()
+        self._keys = []
+        for field_name in field_names:
+            assert _RE_VALID_CHARACTERS_NAME.match(field_name), field_name
+            self._keys.append(f"{field_name}=".encode())
+
+    def encode(self, values: list) -> bytes:
+        """
+        'values': One bytes per field name, None to skip the field.
+        Return the line without timestamp or None if all fields are skipped.
+        """
+        fields = [
+            key + value for key, value in zip(self._keys, values) if value is not None
+        ]
+        if len(fields) == 0:
+            return None
+        return self._prefix + b",".join(fields)
+
+
 if __name__ == "__main__":
     print(measurements_example)
     print(build_payload(measurements_example))
@@ -1,3 +1,7 @@
+from utils_constants import LOGFILE_DELIMITER
+from utils_format import format_int
+
+
 class LogfileTags:
     SM_STATE = "SM_STATE"
     SENSORS_HEADER = "SENSORS_HEADER"
@@ -8,3 +12,20 @@ class LogfileTags:
     LOG_INFO = "LOG_INFO"
     LOG_DEBUG = "LOG_DEBUG"
 
+
+
+_VALUES_TAG = (
+    LOGFILE_DELIMITER + LogfileTags.SENSORS_VALUES + LOGFILE_DELIMITER
+).encode()
+_values_prefix = bytearray(16 + len(_VALUES_TAG))
+_values_prefix_mv = memoryview(_values_prefix)
+
+
+def values_prefix(now_ms: int) -> memoryview:
+    """
+    "<now_ms>\tSENSORS_VALUES\t": The start of a SENSORS_VALUES line.
+    The returned memoryview is reused: It is only valid until the next call!
+    """
+    end = format_int(_values_prefix, 0, now_ms)
+    _values_prefix[end : end + len(_VALUES_TAG)] = _VALUES_TAG
+    return _values_prefix_mv[: end + len(_VALUES_TAG)]
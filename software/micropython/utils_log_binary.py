@@ -0,0 +1,161 @@
+"""
+Binary logfile for SENSORS_VALUES
+
+Header:
+  MAGIC
+  names, tab separated, terminated by "\\n"
+  units, tab separated, terminated by "\\n"
+  decimals, tab separated, terminated by "\\n": "s" for a string column
+Records:
+  RECORD_STRING: type uint8, column uint8, length uint8, utf-8
+    A string column changed. Written before the RECORD_VALUES.
+  RECORD_VALUES: type uint8, time varint, one varint per numeric column
+    time: zigzag(interval - interval of the previous record)
+      interval: time_ms - time_ms of the previous record.
+      A steady interval takes one byte.
+    value: The value scaled by 10**decimals, as delta to the last valid
+      value of the column: zigzag(delta) + 1.
+      VALUE_INVALID (0): The sensor is broken or the value is NaN or inf.
+    time_ms, interval and values start at 0 in every file.
+    String columns keep the value of their last RECORD_STRING.
+varint: unsigned LEB128, 7 bits per byte, least significant first.
+zigzag: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+A value which did not change takes one byte.
+"""
+
+MAGIC = b"FDLOG2\n"
+RECORD_STRING = 0x53  # "S"
+RECORD_VALUES = 0x56  # "V"
+VALUE_INVALID = 0
+DECIMALS_STRING = "s"
+
+
+def zigzag(n: int) -> int:
+    if n < 0:
+        return -2 * n - 1
+    return 2 * n
+
+
+def unzigzag(n: int) -> int:
+    if n & 1:
+        return -(n + 1) // 2
+    return n // 2
+
+
+def _pack_varint(buf, pos: int, n: int) -> int:
+    """
+    Write 'n' >= 0 to 'buf' at 'pos'. Return the position after it.
+    """
+    while n > 0x7F:
+        buf[pos] = 0x80 | (n & 0x7F)
+        n >>= 7
+        pos += 1
+    buf[pos] = n
+    return pos + 1
+
+
+def unpack_varint(data, pos: int) -> tuple:
+    """
+    Return (n, position after it).
+    Raises IndexError if 'data' ends within the varint.
+    """
+    n = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+# A varint of up to 64 bits. No const(): The host decoder imports this module
+_VARINT_MAX_BYTES = 10
+
+
+class BinaryLogEncoder:
+    """
+    Encodes the records of the binary logfile. The same columns every time.
+    """
+
+    def __init__(self, names: list, units: list, decimals: list):
+        assert len(names) == len(units) == len(decimals)
+        assert len(names) < 256
+        self._header = b"".join(
+            (
+                MAGIC,
+                "\t".join(names).encode(),
+                b"\n",
+                "\t".join(units).encode(),
+                b"\n",
+                "\t".join(
+                    [DECIMALS_STRING if d is None else str(d) for d in decimals]
+                ).encode(),
+                b"\n",
+            )
+        )
+        # None for a string column
+        self._scales = [None if d is None else 10**d for d in decimals]
+        self._strings = [None] * len(names)
+        # The last valid value per column, scaled
+        self._previous = [0] * len(names)
+        self._time_ms = 0
+        self._interval_ms = 0
+        # Worst case of a RECORD_VALUES
+        self._size_values = 1 + _VARINT_MAX_BYTES * (1 + len(names))
+        self._buf = bytearray(self._size_values + 64)
+
+    def header(self) -> bytes:
+        return self._header
+
+    def _grow(self, size: int, pos: int) -> None:
+        # A new buffer: The old one might still be referenced by a memoryview
+        buf = bytearray(size)
+        buf[0:pos] = self._buf[0:pos]
+        self._buf = buf
+
+    def encode(self, time_ms: int, values: list) -> memoryview:
+        """
+        'values': One per column: int, float, str or None if broken.
+        The returned memoryview is only valid until the next call!
+        """
+        pos = 0
+        previous = self._previous
+        for column, (scale, value) in enumerate(zip(self._scales, values)):
+            if scale is not None:
+                continue
+            if (value is not None) and (value != self._strings[column]):
+                self._strings[column] = value
+                data = value.encode()[:255]
+                end = pos + 3 + len(data)
+                if end + self._size_values > len(self._buf):
+                    self._grow(2 * (end + self._size_values), pos)
+                buf = self._buf
+                buf[pos] = RECORD_STRING
+                buf[pos + 1] = column
+                buf[pos + 2] = len(data)
+                buf[pos + 3 : end] = data
+                pos = end
+        buf = self._buf
+        buf[pos] = RECORD_VALUES
+        interval_ms = time_ms - self._time_ms
+        pos = _pack_varint(buf, pos + 1, zigzag(interval_ms - self._interval_ms))
+        self._time_ms = time_ms
+        self._interval_ms = interval_ms
+        for column, (scale, value) in enumerate(zip(self._scales, values)):
+            if scale is None:
+                continue
+            if value is not None:
+                try:
+                    value = round(value * scale)
+                except (ValueError, OverflowError):
+                    # NaN or inf
+                    value = None
+            if value is None:
+                buf[pos] = VALUE_INVALID
+                pos += 1
+                continue
+            pos = _pack_varint(buf, pos, zigzag(value - previous[column]) + 1)
+            previous[column] = value
+        return memoryview(buf)[:pos]
@@ -0,0 +1,129 @@
+import os
+import time
+import _thread
+
+import utils_fs
+from utils_constants import FILENAME_LOGRING, FILENAME_LOGRING_UPLOAD
+from utils_log import LogfileTags, values_prefix
+from utils_logstdout import LogStdout
+from utils_timebase import tb
+
+
+class LogRing(LogStdout):
+    """
+    Like `LogStdout`, but the recent lines (including SENSORS_VALUES)
+    are kept in a preallocated RAM ring of 'size_bytes'.
+
+    The ring is written to FILENAME_LOGRING
+     * on a state change (SM_STATE) or an error (LOG_ERROR)
+     * on `flush()`: Call it before `machine.reset()` and on a late watchdog feed.
+     * by `housekeeping()` if 'persist_ms' passed and lines were added.
+       'persist_ms' 0: Never.
+    No flash is written in between.
+
+    At boot, the FILENAME_LOGRING of the previous boot is printed and renamed to
+    FILENAME_LOGRING_UPLOAD: `utils_wlan.MQTT` publishes and removes it.
+    The first line of the ring might be truncated.
+    """
+
+    def __init__(self, size_bytes: int, persist_ms: int):
+        assert size_bytes > 0
+        self._buf = bytearray(size_bytes)
+        self._mv = memoryview(self._buf)
+        self._pos = 0
+        self._wrapped = False
+        self._persist_ms = persist_ms
+        self._persisted_ms = time.ticks_ms()
+        # Lines were added since the last persist
+        self._dirty = False
+        self.lock = _thread.allocate_lock()
+        # Statistics
+        self.persists = 0
+        if utils_fs.exists(FILENAME_LOGRING):
+            self._dump(FILENAME_LOGRING)
+            os.rename(FILENAME_LOGRING, FILENAME_LOGRING_UPLOAD)
+
+    @staticmethod
+    def _dump(filename: str) -> None:
+        print(f"*** {filename} of the previous boot")
+        with open(filename, "r") as f:
+            while True:
+                line = f.readline()
+                if len(line) == 0:
+                    break
+                print(line, end="")
+        print(f"*** {filename} end")
+
+    def log(self, tag: str, line: str, stdout: bool = False):
+        full_line = super().log(tag, line, stdout=stdout)
+        with self.lock:
+            self._append(full_line.encode())
+            self._append(b"\n")
+            if (tag is LogfileTags.SM_STATE) or (tag is LogfileTags.LOG_ERROR):
+                self._persist()
+        return full_line
+
+    def log_values(self, sensors, measurements=None):
+        # Formatted into reused buffers: No line is allocated
+        line = sensors.format_values(measurements)
+        with self.lock:
+            self._append(values_prefix(tb.now_ms))
+            self._append(line)
+            self._append(b"\n")
+
+    def _append(self, data: bytes) -> None:
+        size = len(self._buf)
+        if len(data) > size:
+            data = data[-size:]
+        end = self._pos + len(data)
+        if end <= size:
+            self._mv[self._pos : end] = data
+        else:
+            first = size - self._pos
+            self._mv[self._pos :] = data[:first]
+            self._mv[: end - size] = data[first:]
+            self._wrapped = True
+        self._pos = end % size
+        if end == size:
+            self._wrapped = True
+        self._dirty = True
+
+    def _persist(self) -> None:
+        try:
+            with utils_fs.lock:
+                with open(FILENAME_LOGRING, "wb") as f:
+                    if self._wrapped:
+                        f.write(self._mv[self._pos :])
+                    f.write(self._mv[: self._pos])
+        except OSError as e:
+            print(f"ERROR: LogRing persist failed: {e}")
+            return
+        self._persisted_ms = time.ticks_ms()
+        self._dirty = False
+        self.persists += 1
+
+    def flush(self, blocking: bool = True) -> bool:
+        """
+        blocking=False: From a scheduled callback, see `utils_fs.available()`.
+          Skipped if a lock is taken.
+        Return True if persisted.
+        """
+        if not self.lock.acquire(blocking):
+            return False
+        try:
+            if not (blocking or utils_fs.available()):
+                return False
+            self._persist()
+        finally:
+            self.lock.release()
+        return True
+
+    def housekeeping(self):
+        if self._persist_ms == 0:
+            return
+        with self.lock:
+            if not self._dirty:
+                return
+            if time.ticks_diff(time.ticks_ms(), self._persisted_ms) < self._persist_ms:
+                return
+            self._persist()
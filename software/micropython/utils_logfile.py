@@ -1,36 +1,261 @@
 import os
+import time
 import _thread
 
+import utils_fs
 from utils_constants import DIRECTORY_LOGS, LOGFILE_DELIMITER
 
-from utils_log import LogfileTags
+from utils_log import LogfileTags, values_prefix
+from utils_log_binary import BinaryLogEncoder
 from utils_timebase import tb
 
+LOGFILE_PREFIX = "logdata_"
+LOGFILE_SUFFIXES = (".txt", ".bin")
+# The first segment of an empty directory
+LOGFILE_FIRST = const(10)
+
+
+def _filename(n: int, suffix: str) -> str:
+    return f"{LOGFILE_PREFIX}{n}{suffix}"
+
+
+class BufferedFile:
+    """
+    Writes are collected in a RAM buffer and written to flash as one chunk.
+    Every filesystem call holds `utils_fs.lock`.
+    """
+
+    def __init__(self, flush_bytes: int):
+        assert flush_bytes > 0
+        self.f = None
+        self._buf = bytearray(flush_bytes)
+        self._mv = memoryview(self._buf)
+        self._fill = 0
+        # Statistics
+        self.flushes = 0
+        self.written_bytes = 0
+
+    def open(self, filename: str) -> None:
+        """
+        Close the current file and continue in 'filename'.
+        """
+        self.close()
+        with utils_fs.lock:
+            self.f = open(filename, "wb")
+
+    def close(self) -> None:
+        if self.f is None:
+            return
+        self.flush()
+        with utils_fs.lock:
+            self.f.close()
+        self.f = None
+
+    def write(self, data) -> None:
+        size = len(data)
+        if self._fill + size > len(self._buf):
+            self.flush()
+            if size > len(self._buf):
+                with utils_fs.lock:
+                    self.f.write(data)
+                    self.f.flush()
+                self.written_bytes += size
+                self.flushes += 1
+                return
+        self._mv[self._fill : self._fill + size] = data
+        self._fill += size
+
+    def flush(self) -> None:
+        if self._fill == 0:
+            return
+        with utils_fs.lock:
+            self.f.write(self._mv[: self._fill])
+            self.f.flush()
+        self.written_bytes += self._fill
+        self._fill = 0
+        self.flushes += 1
+
+
 class Logfile:
-    def __init__(self):
-        self.filename: str = None
+    """
+    Lines are collected in a RAM buffer and written to flash as one chunk.
+    On LittleFS every flush commits the metadata and copies the last,
+    partially written block: Flushing every line wears the flash.
+
+    Flush policy:
+     * the buffer holds 'flush_bytes'
+     * 'flush_ms' passed since the last flush
+     * a state change (SM_STATE) or an error (LOG_ERROR)
+     * an explicit `flush()`, for example before a reset
+
+    binary: SENSORS_VALUES are written to 'logdata_<n>.bin',
+      see 'utils_log_binary.py'. All other lines to 'logdata_<n>.txt'.
+
+    Rotation: The files 'logdata_<n>.*' are a segment.
+    A new segment is started when the current one exceeds 'segment_bytes'.
+    The oldest segment is removed if
+     * all segments exceed 'budget_bytes' or
+     * there are more than 'segments_max' or
+     * the filesystem has less than 'floor_bytes' free, 0: disabled.
+    Rotation and removal are done by `housekeeping()`: The main loop calls it
+    at an idle point before it sleeps. `log()` only writes and flushes.
+    `os.statvfs()` traverses the filesystem: It is only called on rotation.
+    A call to `housekeeping()` removes at most one segment.
+    """
+
+    def __init__(
+        self,
+        flush_bytes: int,
+        flush_ms: int,
+        budget_bytes: int,
+        segment_bytes: int,
+        segments_max: int,
+        floor_bytes: int,
+        binary: bool = False,
+    ):
+        assert budget_bytes > segment_bytes > 0
+        assert segments_max > 1
+        self._budget_bytes = budget_bytes
+        self._segment_bytes = segment_bytes
+        self._segments_max = segments_max
+        self._floor_bytes = floor_bytes
         try:
             os.mkdir(f"{DIRECTORY_LOGS}")
         except OSError:
             # The directory might already exit.
             pass
-        files = os.listdir(DIRECTORY_LOGS)
-        for i in range(1000):
-            filename = f"logdata_{i+10}.txt"
-            if not filename in files:
-                self.filename = filename
-                self.f = open(f"{DIRECTORY_LOGS}/{filename}", "w")
-                break
-        else:
-            raise Exception("Failed to create file!")
+        # The closed segments [n, size_bytes]: oldest first
+        sizes = {}
+        for name in os.listdir(DIRECTORY_LOGS):
+            for suffix in LOGFILE_SUFFIXES:
+                if name.startswith(LOGFILE_PREFIX) and name.endswith(suffix):
+                    n = name[len(LOGFILE_PREFIX) : -len(suffix)]
+                    if not n.isdigit():
+                        # Not a segment, for example a copy 'logdata_10 (1).txt'
+                        continue
+                    n = int(n)
+                    size = os.stat(f"{DIRECTORY_LOGS}/{name}")[6]
+                    sizes[n] = sizes.get(n, 0) + size
+        self._segments = sorted([[n, size] for n, size in sizes.items()])
+        self._closed_bytes = sum(sizes.values())
+        self._n = LOGFILE_FIRST - 1
+        if len(self._segments) > 0:
+            self._n = self._segments[-1][0]
+        self._files = [BufferedFile(flush_bytes)]
+        self._text = self._files[0]
+        self._binary = None
+        if binary:
+            self._binary = BufferedFile(flush_bytes)
+            self._files.append(self._binary)
+        self._encoder: BinaryLogEncoder = None
         self.lock = _thread.allocate_lock()
+        self._flush_ms = flush_ms
+        self._flushed_ms = time.ticks_ms()
+        # Bytes to remove to get above 'floor_bytes'
+        self._floor_missing_bytes = 0
+        self._segment_start_bytes = 0
+        # Statistics
+        self.removed_segments = 0
+        # Boot: Make room before the first segment is opened
+        self._update_floor()
+        while self._remove_oldest_if_required():
+            pass
+        self._open_segment()
+
+    @property
+    def filename(self) -> str:
+        return _filename(self._n, LOGFILE_SUFFIXES[0])
+
+    @property
+    def flushes(self) -> int:
+        return sum([f.flushes for f in self._files])
+
+    @property
+    def written_bytes(self) -> int:
+        return sum([f.written_bytes for f in self._files])
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        All segments including the current one.
+        """
+        return self._closed_bytes + self.written_bytes - self._segment_start_bytes
+
+    def _open_segment(self) -> None:
+        self._n += 1
+        for f, suffix in zip(self._files, LOGFILE_SUFFIXES):
+            f.open(f"{DIRECTORY_LOGS}/{_filename(self._n, suffix)}")
+        self._segment_start_bytes = self.written_bytes
+        # The new segment needs a new header
+        self._encoder = None
+        self._update_floor()
+
+    def _update_floor(self) -> None:
+        if self._floor_bytes == 0:
+            return
+        (
+            f_bsize,
+            _f_frsize,
+            _f_blocks,
+            _f_bfree,
+            f_bavail,
+            _f_files,
+            _f_ffree,
+            _f_favail,
+            _f_flag,
+            _f_namemax,
+        ) = self._statvfs()
+        # Room for this segment to grow
+        self._floor_missing_bytes = (
+            self._floor_bytes + self._segment_bytes - f_bavail * f_bsize
+        )
+
+    @staticmethod
+    def _statvfs() -> tuple:
+        with utils_fs.lock:
+            return os.statvfs(DIRECTORY_LOGS)
+
+    def _rotate(self) -> None:
+        segment_bytes = self.written_bytes - self._segment_start_bytes
+        self._segments.append([self._n, segment_bytes])
+        self._closed_bytes += segment_bytes
+        self._open_segment()
+
+    def _remove_oldest_if_required(self) -> bool:
+        """
+        Remove the oldest segment if required. Return True if removed.
+        """
+        if len(self._segments) == 0:
+            return False
+        if not (
+            (self.size_bytes > self._budget_bytes)
+            or (len(self._segments) + 1 > self._segments_max)
+            or (self._floor_missing_bytes > 0)
+        ):
+            return False
+        n, size_bytes = self._segments.pop(0)
+        for suffix in LOGFILE_SUFFIXES:
+            try:
+                with utils_fs.lock:
+                    os.remove(f"{DIRECTORY_LOGS}/{_filename(n, suffix)}")
+            except OSError:
+                # The binary file might not exist
+                pass
+        self._closed_bytes -= size_bytes
+        self._floor_missing_bytes -= size_bytes
+        self.removed_segments += 1
+        return True
 
     def rm_other_files(self):
-        for filename in os.listdir(DIRECTORY_LOGS):
-            if filename != self.filename:
-                filename_full = f"{DIRECTORY_LOGS}/{filename}"
-                print("rm", filename_full)
-                os.unlink(filename_full)
+        filenames = [_filename(self._n, suffix) for suffix in LOGFILE_SUFFIXES]
+        with utils_fs.lock:
+            for filename in os.listdir(DIRECTORY_LOGS):
+                if filename not in filenames:
+                    filename_full = f"{DIRECTORY_LOGS}/{filename}"
+                    print("rm", filename_full)
+                    os.unlink(filename_full)
+        self._segments = []
+        self._closed_bytes = 0
 
     def log(self, tag: str, line: str, stdout: bool = False):
         full_line = LOGFILE_DELIMITER.join(
@@ -53,10 +278,71 @@ class Logfile:
             print(full_line)
 
         with self.lock:
-            self.f.write(full_line)
-            self.f.write("\n")
-            self.f.flush()
+            self._text.write(full_line.encode())
+            self._text.write(b"\n")
+            self._flush_by_policy(tag)
+
+    def log_values(self, sensors, measurements=None):
+        """
+        Log SENSORS_VALUES of 'measurements'.
+        binary: 'measurements' must be the same for every call.
+        """
+        if self._binary is None:
+            # Formatted into reused buffers: No line is allocated
+            line = sensors.format_values(measurements)
+            with self.lock:
+                self._text.write(values_prefix(tb.now_ms))
+                self._text.write(line)
+                self._text.write(b"\n")
+                self._flush_by_policy(LogfileTags.SENSORS_VALUES)
+            return
 
-    def flush(self):
         with self.lock:
-            self.f.flush()
+            if self._encoder is None:
+                names, units, decimals = sensors.get_log_schema(measurements)
+                self._encoder = BinaryLogEncoder(names, units, decimals)
+                self._binary.write(self._encoder.header())
+            self._binary.write(
+                self._encoder.encode(tb.now_ms, sensors.get_log_values(measurements))
+            )
+            self._flush_by_policy(LogfileTags.SENSORS_VALUES)
+
+    def _flush_by_policy(self, tag: str) -> None:
+        if (
+            (tag is LogfileTags.SM_STATE)
+            or (tag is LogfileTags.LOG_ERROR)
+            or (time.ticks_diff(time.ticks_ms(), self._flushed_ms) >= self._flush_ms)
+        ):
+            self._flush()
+
+    def housekeeping(self) -> None:
+        """
+        Rotate or remove the oldest segment if required.
+        Call it at an idle point: It may take several ms on flash.
+        """
+        with self.lock:
+            if self.written_bytes - self._segment_start_bytes >= self._segment_bytes:
+                self._rotate()
+                return
+            self._remove_oldest_if_required()
+
+    def _flush(self) -> None:
+        for f in self._files:
+            f.flush()
+        self._flushed_ms = time.ticks_ms()
+
+    def flush(self, blocking: bool = True) -> bool:
+        """
+        blocking=False: From a scheduled callback, see `utils_fs.available()`.
+          Skipped if a lock is taken.
+        Return True if flushed.
+        """
+        if not self.lock.acquire(blocking):
+            return False
+        try:
+            if not (blocking or utils_fs.available()):
+                return False
+            self._flush()
+        finally:
+            self.lock.release()
+        return True
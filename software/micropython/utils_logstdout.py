@@ -1,3 +1,4 @@
+import config
 from utils_log import LogfileTags
 from utils_constants import LOGFILE_DELIMITER
 from utils_timebase import tb
@@ -22,8 +23,35 @@ class LogStdout:
 
         if write_to_stdout():
             print(full_line)
+        return full_line
 
-    def flush(self):
+    def log_values(self, sensors, measurements=None):
+        # SENSORS_VALUES are never written to stdout: Nothing to format
         pass
 
-logfile = LogStdout(timebase=tb)
+    def flush(self, blocking: bool = True) -> bool:
+        return True
+
+    def housekeeping(self):
+        pass
+
+if config.LOGFILE_ENABLED:
+    from utils_logfile import Logfile
+
+    logfile = Logfile(
+        flush_bytes=config.LOGFILE_FLUSH_BYTES,
+        flush_ms=config.LOGFILE_FLUSH_MS,
+        budget_bytes=config.LOGFILE_BUDGET_BYTES,
+        segment_bytes=config.LOGFILE_SEGMENT_BYTES,
+        segments_max=config.LOGFILE_SEGMENTS_MAX,
+        floor_bytes=config.LOGFILE_FLOOR_BYTES,
+        binary=config.LOGFILE_BINARY,
+    )
+elif config.LOGRING_BYTES > 0:
+    from utils_log_ring import LogRing
+
+    logfile = LogRing(
+        size_bytes=config.LOGRING_BYTES, persist_ms=config.LOGRING_PERSIST_MS
+    )
+else:
+    logfile = LogStdout()
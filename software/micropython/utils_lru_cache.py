@@ -0,0 +1,37 @@
+class LruCache:
+    """
+    A small cache which drops the least recently used entry when full.
+    'hits' and 'misses' count the calls to `get()`.
+    """
+
+    def __init__(self, size: int):
+        assert size > 0
+        self._size = size
+        self._keys = []
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the cached value or None.
+        """
+        value = self._values.get(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self._keys[-1] != key:
+            # Mark as most recently used
+            self._keys.remove(key)
+            self._keys.append(key)
+        return value
+
+    def put(self, key, value) -> None:
+        assert value is not None
+        if key in self._values:
+            self._keys.remove(key)
+        elif len(self._keys) >= self._size:
+            del self._values[self._keys.pop(0)]
+        self._keys.append(key)
+        self._values[key] = value
@@ -1,17 +1,48 @@
+import gc
 import time
 from machine import Pin, I2C
 import lib_sht31
 import onewire
+import config
 from ds18x20 import DS18X20
 
-from utils_humidity import rel_to_dpt, rel_to_abs
+from utils_humidity_cache import humidity_cache, humidity_dew_abs
+from utils_sample_frame import SampleFrame
 from utils_log import LogfileTags
 from utils_wdt import wdt
 from utils_timebase import tb
 from utils_constants import LOGFILE_DELIMITER
+from utils_format import format_int, format_fixed
 from utils_logstdout import logfile
 
+# `Measurement._text()` formats into this buffer
+_scratch = bytearray(32)
+_scratch_mv = memoryview(_scratch)
+_DELIMITER = ord(LOGFILE_DELIMITER)
+
 class Measurement:
+    __slots__ = (
+        "_sensor",
+        "_tag",
+        "tag",
+        "_unit",
+        "_format",
+        "_mqtt",
+        "_mqtt_string",
+        "_while_broken",
+        "_deadband",
+        "_published_value",
+        "_published_text",
+        "_formatted_value",
+        "_formatted_text",
+        "_formatted_mqtt",
+        "_value",
+        "_frame",
+        "_slot",
+        "_int",
+        "decimals",
+    )
+
     def __init__(
         self,
         sensor: "SensorBase",
@@ -20,48 +51,210 @@ class Measurement:
         format: str,
         mqtt=True,
         mqtt_string=False,
+        while_broken=False,
+        deadband=None,
     ):
+        """
+        while_broken: The value is valid even if the sensor is broken.
+          For example the error counters.
+        deadband: config.MQTT_DELTA: The value is published if it moved
+          at least 'deadband' since it was published the last time.
+          None: Published whenever the formatted value changed.
+        """
         self._sensor = sensor
         self._tag = tag
+        # Composed by `SensorBase.__init__()`: The sensor tag is not known yet
+        self.tag = None
         self._unit = unit
         self._format: str = format
         self._mqtt = mqtt
         self._mqtt_string = mqtt_string
-        self.value: float = None
+        self._while_broken = while_broken
+        self._deadband = deadband
+        self._published_value = None
+        self._published_text = None
+        # `_text()` formats only if the value changed
+        self._formatted_value = None
+        self._formatted_text = None
+        self._formatted_mqtt = None
+        # Strings, and numbers till `attach()`: Stored in '_value'
+        self._value = None
+        self._frame = None
+        self._slot = None
+        self._int = ":d}" in format
+        # Binary logfile: The value is stored as int scaled by 10**decimals.
+        # None: Stored as string.
+        self.decimals = None
+        if self._int:
+            self.decimals = 0
+        elif format.endswith("f}") and ("." in format):
+            self.decimals = int(format[format.rindex(".") + 1 : -2])
+
+    def attach(self, frame, slot: int) -> None:
+        """
+        From now on, the value is stored in 'frame' at 'slot'.
+        """
+        self._frame = frame
+        self._slot = slot
+        if self._value is not None:
+            frame.set(slot, self._value)
 
     @property
-    def mqtt(self) -> bool:
-        return self._mqtt and not self._sensor._broken
+    def value(self):
+        # Methods of this class read the frame directly: No property call
+        if self._slot is None:
+            return self._value
+        return self._frame.values[self._slot]
+
+    @value.setter
+    def value(self, value) -> None:
+        slot = self._slot
+        if slot is None:
+            self._value = value
+            return
+        # Inlined `SampleFrame.set()`: This is called for every value every cycle
+        frame = self._frame
+        frame.values[slot] = value
+        frame.valid[slot >> 3] |= 1 << (slot & 7)
+
+    def history(self, age: int):
+        """
+        Return the value 'age' cycles ago or None if not available.
+        """
+        if self._slot is None:
+            return None
+        return self._frame.history(self._slot, age)
+
+    def invalidate(self) -> None:
+        """
+        The sensor broke: The value is not valid anymore.
+        """
+        if self._while_broken:
+            return
+        if self._slot is not None:
+            self._frame.invalidate(self._slot)
 
     @property
-    def tag(self) -> str:
-        return f"{self._sensor.tag}{self._tag}"
+    def _broken(self) -> bool:
+        if self._slot is None:
+            return self._sensor._broken and not self._while_broken
+        return not self._frame.is_valid(self._slot)
 
     @property
-    def value_text(self):
-        if self._sensor._broken:
-            return "-"
+    def mqtt(self) -> bool:
+        return self._mqtt and not self._broken
+
+    def _text(self) -> bytes:
+        """
+        Numbers are formatted into '_scratch' by `utils_format`, not by `str.format()`.
+        Only if the value changed, a new bytes object is allocated.
+        """
+        if self._slot is None:
+            value = self._value
+        else:
+            value = self._frame.values[self._slot]
+        if (self._formatted_text is None) or (value != self._formatted_value):
+            if self._int:
+                end = format_int(_scratch, 0, value)
+                self._formatted_text = bytes(_scratch_mv[:end])
+            elif self.decimals is not None:
+                end = format_fixed(_scratch, 0, value, self.decimals)
+                self._formatted_text = bytes(_scratch_mv[:end])
+            else:
+                self._formatted_text = self._format.format(
+                    value=value, unit=self._unit
+                ).encode()
+            if self._mqtt_string:
+                self._formatted_mqtt = b'"' + self._formatted_text + b'"'
+            self._formatted_value = value
+        return self._formatted_text
+
+    @property
+    def value_text(self) -> bytes:
+        if self._broken:
+            return b"-"
         try:
-            return self._format.format(value=self.value, unit=self._unit)
+            return self._text()
         except Exception as ex:
             print(f"ERROR: {self.tag}: {ex}")
+            return b"?"
 
     @property
-    def value_mqtt(self):
-        assert not self._sensor._broken
+    def value_mqtt(self) -> bytes:
+        assert not self._broken
         try:
+            text = self._text()
             if self._mqtt_string:
-                return f'"{self.value}"'
-            return self._format.format(value=self.value, unit=self._unit)
+                return self._formatted_mqtt
+            return text
         except Exception as ex:
             print(f"ERROR: {self.tag}: {ex}")
 
+    @property
+    def value_log(self):
+        """
+        The value for `utils_log_binary.BinaryLogEncoder`: None if broken.
+        """
+        if self._broken:
+            return None
+        if self._slot is None:
+            return str(self._value)
+        return self._frame.values[self._slot]
+
+    @property
+    def value_valid(self):
+        """
+        The value or None if the sensor is broken or never measured:
+        The frame holds 0 in the slot of such a value.
+        """
+        if self._broken:
+            return None
+        return self.value
+
+    def value_mqtt_delta(self, full: bool):
+        """
+        Return `value_mqtt` or None if it did not move beyond the deadband
+        since `published()`.
+        full: Always return `value_mqtt`.
+        """
+        text = self.value_mqtt
+        if not full:
+            if (self._deadband is None) or (self._published_value is None):
+                if text == self._published_text:
+                    return None
+            elif (
+                abs(self._frame.values[self._slot] - self._published_value)
+                < self._deadband
+            ):
+                return None
+        return text
+
+    def published(self, text: bytes) -> None:
+        """
+        'text' returned by `value_mqtt_delta()` has been published.
+        """
+        self._published_text = text
+        if self._deadband is not None:
+            # The value might have changed since: Use the published one.
+            self._published_value = float(text.decode())
+
+
+# A broken sensor is probed again after this time
+REPROBE_MS = const(60_000)
+
 
 class SensorBase:
+    # Conversion time between `measure1()` and `measure3()`
+    MEASURE_MS = const(0)
+
     def __init__(self, tag: str, measurements: list):
         self.tag = tag
         self._measurements = measurements
+        for m in measurements:
+            m.tag = f"{tag}{m._tag}"
         self._broken = False
+        self._broken_ms = 0
+        self.io_errors = 0
 
     def measure1(self):
         pass
@@ -72,23 +265,73 @@ class SensorBase:
     def measure3(self):
         pass
 
+    def probe(self) -> bool:
+        """
+        Reinitialize a broken sensor.
+        Return True if the sensor works again.
+        """
+        return False
+
     def io_error(self, ex):
         self._broken = True
+        self._broken_ms = time.ticks_ms()
+        self.io_errors += 1
+        for m in self._measurements:
+            m.invalidate()
         logfile.log(
             LogfileTags.LOG_ERROR, f"{self.__class__.__name__} '{self.tag}': {ex}"
         )
 
+    def reprobe(self) -> None:
+        """
+        Called every cycle for a broken sensor.
+        Every REPROBE_MS, `probe()` is called to recover the sensor.
+        """
+        assert self._broken
+        if time.ticks_diff(time.ticks_ms(), self._broken_ms) < REPROBE_MS:
+            return
+        try:
+            if not self.probe():
+                self._broken_ms = time.ticks_ms()
+                return
+        except Exception as ex:
+            self.io_error(ex=ex)
+            return
+        self._broken = False
+        logfile.log(
+            LogfileTags.LOG_INFO,
+            f"{self.__class__.__name__} '{self.tag}': recovered",
+            stdout=True,
+        )
+
 
-ABSOLUTER_NULLPUNKT_C = -273.15
-UMGEBUNGSDRUCK_P = 100000.0
+# Retries if reading a SHT31 failed before the sensor is marked as broken
+SHT31_RETRIES_PER_CYCLE = const(2)
 
 
 class SensorSHT31(SensorBase):
+    # In periodic mode, the SHT31 measures on its own
+    MEASURE_MS = lib_sht31.MEASURE_MS if config.SHT31_MODE == "single_shot" else 0
+
     def __init__(self, tag: str, addr: int, i2c: I2C):
-        self.measurement_C = Measurement(self, "_C", "C", "{value:0.2f}")
-        self.measurement_H = Measurement(self, "_rH", "H", "{value:0.1f}")
-        self.measurement_dew_C = Measurement(self, "_dew_C", "C", "{value:0.1f}")
-        self.measurement_abs_g_kg = Measurement(self, "_abs_g_kg", "g_kg", "{value:0.2f}")
+        self.measurement_C = Measurement(
+            self, "_C", "C", "{value:0.2f}", deadband=0.1
+        )
+        self.measurement_H = Measurement(
+            self, "_rH", "H", "{value:0.1f}", deadband=0.5
+        )
+        self.measurement_dew_C = Measurement(
+            self, "_dew_C", "C", "{value:0.1f}", deadband=0.2
+        )
+        self.measurement_abs_g_kg = Measurement(
+            self, "_abs_g_kg", "g_kg", "{value:0.2f}", deadband=0.05
+        )
+        self.measurement_io_errors = Measurement(
+            self, "_io_errors", "", "{value:d}", while_broken=True
+        )
+        self.measurement_retries = Measurement(
+            self, "_retries", "", "{value:d}", while_broken=True
+        )
         SensorBase.__init__(
             self,
             tag=tag,
@@ -97,28 +340,114 @@ class SensorSHT31(SensorBase):
                 self.measurement_H,
                 self.measurement_dew_C,
                 self.measurement_abs_g_kg,
+                self.measurement_io_errors,
+                self.measurement_retries,
             ],
         )
+        self.retries = 0
+        self.measurement_io_errors.value = self.io_errors
+        self.measurement_retries.value = self.retries
+        self._single_shot = config.SHT31_MODE == "single_shot"
+        # Periodic mode: The result of `probe()`, used by the next `measure3()`
+        self._raw_probed = None
+        self._sht31 = lib_sht31.SHT31(i2c, addr=addr)
         try:
-            self._sht31 = lib_sht31.SHT31(i2c, addr=addr)
+            self.probe()
         except Exception as ex:
             self.io_error(ex=ex)
 
-    def measure2(self):
-        C, rH = self._sht31.get_temp_humi()
-        self.measurement_C.value = C
-        self.measurement_H.value = rH
-        dpt_K = rel_to_dpt(T=C - ABSOLUTER_NULLPUNKT_C, P=UMGEBUNGSDRUCK_P, RH=rH)
-        self.measurement_dew_C.value = dpt_K + ABSOLUTER_NULLPUNKT_C
-        abs_g_kg = 1000.0 * rel_to_abs(T=C - ABSOLUTER_NULLPUNKT_C, P=UMGEBUNGSDRUCK_P, RH=rH)
-        self.measurement_abs_g_kg.value = abs_g_kg
+    def _start(self) -> None:
+        """
+        Start the configured mode. The SHT31 is idle: See `_read_blocking()`.
+        """
+        if config.SHT31_MODE == "periodic":
+            self._sht31.start_periodic(mps=config.SHT31_PERIODIC_MPS)
+        elif config.SHT31_MODE == "art":
+            self._sht31.start_art()
+        else:
+            assert self._single_shot, config.SHT31_MODE
+
+    def probe(self) -> bool:
+        raw = self._read_blocking()
+        if not self._single_shot:
+            # The periodic mode just restarted: Its first measurement
+            # is not ready before `measure3()` of this cycle.
+            self._raw_probed = raw
+        return True
+
+    def _read_blocking(self):
+        """
+        Stop periodic mode, do a blocking single shot measurement
+        and restart the configured mode.
+        Returns the raw temperature and humidity.
+        """
+        # A single shot is refused in periodic mode: The configured mode
+        # or the mode from before a soft reset
+        self._sht31.stop_periodic()
+        self._sht31.trigger()
+        time.sleep_ms(lib_sht31.MEASURE_MS)
+        raw = self._sht31.fetch()
+        self._start()
+        return raw
+
+    def _read(self):
+        """
+        Returns the raw temperature and humidity.
+        If reading fails (I2C error, CRC error), the measurement is
+        repeated up to SHT31_RETRIES_PER_CYCLE times.
+        """
+        raw = self._raw_probed
+        if raw is not None:
+            self._raw_probed = None
+            return raw
+        try:
+            if self._single_shot:
+                return self._sht31.fetch()
+            return self._sht31.fetch_periodic()
+        except (OSError, lib_sht31.CRCError) as ex:
+            error = ex
+        for retry in range(1, SHT31_RETRIES_PER_CYCLE + 1):
+            self.retries += 1
+            self.measurement_retries.value = self.retries
+            logfile.log(
+                LogfileTags.LOG_WARNING,
+                f"{self.__class__.__name__} '{self.tag}': retry {retry}: {error}",
+            )
+            try:
+                return self._read_blocking()
+            except (OSError, lib_sht31.CRCError) as ex:
+                error = ex
+        raise error
+
+    def io_error(self, ex):
+        SensorBase.io_error(self, ex=ex)
+        self.measurement_io_errors.value = self.io_errors
+
+    def measure1(self):
+        if self._single_shot:
+            # Start the conversion: All SHT31 convert in parallel and
+            # during the conversion wait in `Sensors.measure()`.
+            self._sht31.trigger()
+
+    def measure3(self):
+        raw_t, raw_h = self._read()
+        (
+            self.measurement_C.value,
+            self.measurement_H.value,
+        ) = self._sht31.convert_temp_humi(raw_t, raw_h)
+        (
+            self.measurement_dew_C.value,
+            self.measurement_abs_g_kg.value,
+        ) = humidity_dew_abs(raw_t, raw_h)
 
 class SensorDS18(SensorBase):
     # DS18x: mandatory pause to collect results, datasheet max 750 ms
     MEASURE_MS = const(750 + 150)
 
     def __init__(self, tag: str, pin: Pin):
-        self.measurement_C = Measurement(self, "_C", "C", "{value:0.2f}")
+        self.measurement_C = Measurement(
+            self, "_C", "C", "{value:0.2f}", deadband=0.1
+        )
         SensorBase.__init__(self, tag=tag, measurements=[self.measurement_C])
 
         try:
@@ -183,28 +512,166 @@ class SensorStatemachine(SensorBase):
         self.measurement_string.value = self._sm.state_name
 
 
+class SensorTelemetry(SensorBase):
+    """
+    dual_core: Monitors the queue from core 0 to core 1.
+      'latency_ms' is written by core 1: The time from `put()` till published.
+      Single core publishes synchronously: These measurements do not exist.
+    Store and forward: Monitors the spool on flash.
+    'payload_bytes': The size of the last MQTT payload.
+    """
+
+    def __init__(self, dual_core: bool):
+        self._ring = None
+        self._mqtt = None
+        self.latency_ms = 0
+        self.measurement_spool_bytes = Measurement(
+            self, "_spool_bytes", "", "{value:d}", deadband=10_000
+        )
+        self.measurement_spool_evicted_bytes = Measurement(
+            self, "_spool_evicted_bytes", "", "{value:d}"
+        )
+        self.measurement_payload_bytes = Measurement(
+            self, "_payload_bytes", "", "{value:d}", deadband=100
+        )
+        measurements = [
+            self.measurement_spool_bytes,
+            self.measurement_spool_evicted_bytes,
+            self.measurement_payload_bytes,
+        ]
+        if dual_core:
+            self.measurement_drops = Measurement(self, "_drops", "", "{value:d}")
+            self.measurement_queued = Measurement(self, "_queued", "", "{value:d}")
+            self.measurement_latency_ms = Measurement(
+                self, "_latency_ms", "ms", "{value:d}", deadband=1000
+            )
+            measurements = [
+                self.measurement_drops,
+                self.measurement_queued,
+                self.measurement_latency_ms,
+            ] + measurements
+        SensorBase.__init__(self, tag="telemetry", measurements=measurements)
+
+    def set_ring(self, ring):
+        self._ring = ring
+
+    def set_mqtt(self, mqtt):
+        self._mqtt = mqtt
+
+    def measure2(self):
+        spool = None
+        self.measurement_payload_bytes.value = 0
+        if self._mqtt is not None:
+            spool = self._mqtt.spool
+            self.measurement_payload_bytes.value = self._mqtt.payload_bytes
+        if spool is None:
+            self.measurement_spool_bytes.value = 0
+            self.measurement_spool_evicted_bytes.value = 0
+        else:
+            self.measurement_spool_bytes.value = spool.size_bytes
+            self.measurement_spool_evicted_bytes.value = spool.evicted_bytes
+
+        if self._ring is None:
+            # Single core or core 1 not started yet
+            return
+        self.measurement_drops.value = self._ring.drops
+        self.measurement_queued.value = self._ring.queued
+        self.measurement_latency_ms.value = self.latency_ms
+
+
 class SensorUptime(SensorBase):
     def __init__(self):
-        self.measurement = Measurement(self, "_h", "h", "{value:0.3f}")
-        SensorBase.__init__(self, tag="uptime", measurements=[self.measurement])
+        self.measurement = Measurement(self, "_h", "h", "{value:0.3f}", deadband=0.1)
+        self.measurement_busy_ms = Measurement(
+            self, "_busy_ms", "ms", "{value:d}", deadband=1000
+        )
+        self.measurement_cache_hits = Measurement(
+            self, "_cache_hits", "", "{value:d}", deadband=100
+        )
+        self.measurement_cache_misses = Measurement(
+            self, "_cache_misses", "", "{value:d}", deadband=100
+        )
+        self.measurement_alloc_bytes = Measurement(
+            self, "_alloc_bytes", "", "{value:d}", deadband=1000
+        )
+        # See `collect_garbage()`
+        self._alloc_after_collect = gc.mem_alloc()
+        self._alloc_cycle = 0
+        SensorBase.__init__(
+            self,
+            tag="uptime",
+            measurements=[
+                self.measurement,
+                self.measurement_busy_ms,
+                self.measurement_cache_hits,
+                self.measurement_cache_misses,
+                self.measurement_alloc_bytes,
+            ],
+        )
 
     def measure2(self):
         self.measurement.value = tb.now_ms / 3_600_000.0
+        self.measurement_busy_ms.value = tb.busy_ms
+        self.measurement_cache_hits.value = humidity_cache.hits
+        self.measurement_cache_misses.value = humidity_cache.misses
+        self.measurement_alloc_bytes.value = self._alloc_cycle
+
+    def collect_garbage(self) -> None:
+        """
+        Replaces `gc.collect()` in the main loop:
+        Measures the bytes allocated during the last cycle.
+        """
+        self._alloc_cycle = gc.mem_alloc() - self._alloc_after_collect
+        gc.collect()
+        self._alloc_after_collect = gc.mem_alloc()
 
 
 class Sensors:
-    def __init__(self, sensors: list):
+    def __init__(self, sensors: list, log_measurements: list = None):
+        """
+        log_measurements: Logged in addition to all measurements:
+          `get_log_values()` reuses a list for it.
+        """
         self._sensors = sensors
         self._measurements = []
         for s in self._sensors:
             for m in s._measurements:
                 self._measurements.append(m)
+        self._mqtt_measurements = [m for m in self._measurements if m._mqtt]
+        # Floats and ints in separate frames. Strings stay in the Measurement.
+        floats = [m for m in self._measurements if not (m._mqtt_string or m._int)]
+        ints = [m for m in self._measurements if m._int]
+        self.frame = SampleFrame(size=len(floats), history=config.SAMPLE_HISTORY)
+        self.frame_int = SampleFrame(
+            size=len(ints), history=config.SAMPLE_HISTORY, typecode="i"
+        )
+        for slot, m in enumerate(floats):
+            m.attach(self.frame, slot)
+        for slot, m in enumerate(ints):
+            m.attach(self.frame_int, slot)
+        # config.MQTT_DELTA: Time of the last full frame
+        self._full_frame_ms = None
+        # Reused by `format_values()`
+        self._line = bytearray(16 * len(self._measurements))
+        self._line_mv = memoryview(self._line)
+        # Reused by `get_log_values()`: [(measurements, values)].
+        # Compared by identity: The lists are referenced and can not be recycled.
+        self._log_values = [(self._measurements, [None] * len(self._measurements))]
+        if log_measurements is not None:
+            self._log_values.append((log_measurements, [None] * len(log_measurements)))
+        # Reused by `get_mqtt_values()`
+        self._mqtt_values = [None] * len(self._mqtt_measurements)
 
     def measure(self):
         start_ms = time.ticks_ms()
 
         wdt.feed()
 
+        for s in self._sensors:
+            if s._broken:
+                s.reprobe()
+
+        measure_ms = 0
         for s in self._sensors:
             if not s._broken:
                 try:
@@ -212,6 +679,7 @@ class Sensors:
                 except Exception as ex:
                     s.io_error(ex=ex)
                     continue
+                measure_ms = max(measure_ms, s.MEASURE_MS)
 
         wdt.feed()
 
@@ -223,8 +691,9 @@ class Sensors:
                     s.io_error(ex=ex)
                     continue
 
+        # Wait for the slowest conversion started in `measure1()`
         duration_ms = time.ticks_diff(time.ticks_ms(), start_ms)
-        sleep_ms = SensorDS18.MEASURE_MS - duration_ms
+        sleep_ms = measure_ms - duration_ms
         if sleep_ms > 0:
             time.sleep_ms(sleep_ms)
 
@@ -238,15 +707,117 @@ class Sensors:
                     s.io_error(ex=ex)
                     continue
 
+        self.frame.snapshot()
+        self.frame_int.snapshot()
+
     def get_header(self, measurements=None) -> str:
         if measurements is None:
             measurements = self._measurements
         return LOGFILE_DELIMITER.join([m.tag for m in measurements])
 
     def get_values(self, measurements=None) -> str:
+        return str(self.format_values(measurements), "ascii")
+
+    def format_values(self, measurements=None) -> memoryview:
+        """
+        The values separated by LOGFILE_DELIMITER.
+        The returned memoryview is reused: It is only valid until the next call!
+        """
+        if measurements is None:
+            measurements = self._measurements
+        buf = self._line
+        pos = 0
+        for m in measurements:
+            text = m.value_text
+            end = pos + len(text)
+            if end >= len(buf):
+                # Grow: Happens only in the first cycles
+                self._line = bytearray(2 * end)
+                self._line[:pos] = buf[:pos]
+                self._line_mv = memoryview(self._line)
+                buf = self._line
+            buf[pos:end] = text
+            buf[end] = _DELIMITER
+            pos = end + 1
+        return self._line_mv[: max(0, pos - 1)]
+
+    def get_log_schema(self, measurements=None) -> tuple:
+        """
+        Return (names, units, decimals) for `utils_log_binary.BinaryLogEncoder`.
+        """
+        if measurements is None:
+            measurements = self._measurements
+        return (
+            [m.tag for m in measurements],
+            [m._unit for m in measurements],
+            [m.decimals for m in measurements],
+        )
+
+    def get_log_values(self, measurements=None) -> list:
+        """
+        The values for `utils_log_binary.BinaryLogEncoder`.
+        The returned list is reused: It is only valid until the next call!
+        """
         if measurements is None:
             measurements = self._measurements
-        return LOGFILE_DELIMITER.join([m.value_text for m in measurements])
+        values = None
+        for reused_measurements, reused_values in self._log_values:
+            if reused_measurements is measurements:
+                values = reused_values
+                break
+        if values is None:
+            # Not passed to the constructor
+            values = [None] * len(measurements)
+        i = 0
+        for m in measurements:
+            values[i] = m.value_log
+            i += 1
+        return values
 
     def get_mqtt_fields(self) -> dict:
-        return {m.tag: m.value_mqtt for m in self._measurements if m.mqtt}
+        return {m.tag: m.value_mqtt.decode() for m in self._measurements if m.mqtt}
+
+    def get_mqtt_tags(self) -> list:
+        """
+        The field names for `utils_influxdb.LineProtocolEncoder`.
+        """
+        return [m.tag for m in self._mqtt_measurements]
+
+    def get_mqtt_values(self) -> list:
+        """
+        The field values for `utils_influxdb.LineProtocolEncoder`.
+        None if the sensor is broken.
+        config.MQTT_DELTA: None if the value did not move beyond its deadband.
+          Every config.MQTT_FULL_FRAME_MS all values are returned.
+        The returned list is reused: It is only valid until the next call!
+        """
+        full = True
+        if config.MQTT_DELTA:
+            now_ms = time.ticks_ms()
+            if self._full_frame_ms is not None:
+                duration_ms = time.ticks_diff(now_ms, self._full_frame_ms)
+                full = duration_ms >= config.MQTT_FULL_FRAME_MS
+            if full:
+                self._full_frame_ms = now_ms
+        values = self._mqtt_values
+        i = 0
+        for m in self._mqtt_measurements:
+            values[i] = m.value_mqtt_delta(full) if m.mqtt else None
+            i += 1
+        return values
+
+    def mqtt_published(self, values: list) -> None:
+        """
+        config.MQTT_DELTA: 'values' of `get_mqtt_values()` have been published
+        or queued for publishing: The deadbands start from these values.
+        Not called if the publish failed: The changes are returned again.
+        Dual core: Called by core 1 with a copy of 'values'.
+        """
+        if not config.MQTT_DELTA:
+            return
+        i = 0
+        for m in self._mqtt_measurements:
+            text = values[i]
+            if text is not None:
+                m.published(text)
+            i += 1
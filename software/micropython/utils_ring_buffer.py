@@ -0,0 +1,57 @@
+class RingBuffer:
+    """
+    A fixed size queue from one producer to one consumer, for example
+    from core 0 to core 1. No lock is required:
+    Only the producer writes 'head', only the consumer writes 'tail'
+    and 'drops'. Every slot holds the tuple (sequence, item).
+
+    If the consumer is too slow, `put()` overwrites the oldest item.
+    The consumer detects this by the sequence number and counts it in 'drops'.
+    """
+
+    def __init__(self, size: int):
+        assert size > 0
+        self._size = size
+        self._slots = [(-1, None)] * size
+        # Sequence number of the next `put()`
+        self._head = 0
+        # Sequence number of the next `get()`
+        self._tail = 0
+        self.drops = 0
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of items waiting for `get()`.
+        """
+        return min(self._head - self._tail, self._size)
+
+    def put(self, item) -> None:
+        """
+        Called by the producer only. Never blocks.
+        """
+        head = self._head
+        # A single reference is written: atomic for the consumer.
+        self._slots[head % self._size] = (head, item)
+        self._head = head + 1
+
+    def get(self):
+        """
+        Called by the consumer only.
+        Return the oldest item or None if empty.
+        """
+        while True:
+            head = self._head
+            if head - self._tail > self._size:
+                # The producer overwrote the oldest items
+                self.drops += head - self._size - self._tail
+                self._tail = head - self._size
+            if self._tail == head:
+                return None
+            sequence, item = self._slots[self._tail % self._size]
+            if sequence == self._tail:
+                self._tail += 1
+                return item
+            # Overwritten between reading 'head' and reading the slot
+            self.drops += 1
+            self._tail += 1
@@ -0,0 +1,59 @@
+from array import array
+
+
+class SampleFrame:
+    """
+    The values of numeric measurements in one array, indexed by slot.
+    typecode "f" for floats, "i" for ints: A float has a 24 bit mantissa,
+    a counter would lose precision above 2**24.
+    A bitmap marks the valid values: A value becomes valid when written
+    and invalid if its sensor breaks.
+
+    `snapshot()` copies the frame into a ring of the previous 'history' frames.
+    No allocation besides the slice objects.
+    """
+
+    def __init__(self, size: int, history: int, typecode: str = "f"):
+        assert history > 0
+        self._size = size
+        self._history = history
+        self.values = array(typecode, [0] * size)
+        self.valid = bytearray((size + 7) // 8)
+        self._history_values = array(typecode, [0] * (size * history))
+        self._history_valid = bytearray(len(self.valid) * history)
+        # Number of snapshots taken
+        self.snapshots = 0
+
+    def set(self, slot: int, value) -> None:
+        self.values[slot] = value
+        self.valid[slot >> 3] |= 1 << (slot & 7)
+
+    def invalidate(self, slot: int) -> None:
+        self.valid[slot >> 3] &= ~(1 << (slot & 7))
+
+    def is_valid(self, slot: int) -> bool:
+        return bool(self.valid[slot >> 3] & (1 << (slot & 7)))
+
+    def snapshot(self) -> None:
+        """
+        Copy the current frame into the history ring.
+        """
+        i = self.snapshots % self._history
+        start = i * self._size
+        self._history_values[start : start + self._size] = self.values
+        start = i * len(self.valid)
+        self._history_valid[start : start + len(self.valid)] = self.valid
+        self.snapshots += 1
+
+    def history(self, slot: int, age: int):
+        """
+        Return the value of the snapshot 'age' (1: the last snapshot)
+        or None if not available or not valid.
+        """
+        if not (0 < age <= min(self.snapshots, self._history)):
+            return None
+        i = (self.snapshots - age) % self._history
+        start = i * len(self.valid)
+        if not self._history_valid[start + (slot >> 3)] & (1 << (slot & 7)):
+            return None
+        return self._history_values[i * self._size + slot]
@@ -0,0 +1,126 @@
+import os
+
+import utils_fs
+from utils_constants import DIRECTORY_SPOOL
+
+SPOOL_PREFIX = "spool_"
+SPOOL_SUFFIX = ".txt"
+
+
+def _filename(n: int) -> str:
+    return f"{DIRECTORY_SPOOL}/{SPOOL_PREFIX}{n}{SPOOL_SUFFIX}"
+
+
+class Spool:
+    """
+    Store and forward of line protocol records on flash.
+
+    Records are appended to segment files 'spool_<n>.txt', one record per line.
+    A new segment is started when the current one exceeds 'segment_bytes'.
+    If all segments exceed 'budget_bytes', the oldest segment is evicted.
+
+    Replay: `read_batch()` returns the next lines of the oldest segment.
+    They are removed by `commit_batch()` after they have been published.
+    Dual core: Runs on core 1, every filesystem call holds `utils_fs.lock`.
+    A reboot during replay will replay the oldest segment again: InfluxDB
+    overwrites a record with the same timestamp.
+    """
+
+    def __init__(self, budget_bytes: int, segment_bytes: int):
+        assert budget_bytes > segment_bytes > 0
+        self._budget_bytes = budget_bytes
+        self._segment_bytes = segment_bytes
+        try:
+            os.mkdir(DIRECTORY_SPOOL)
+        except OSError:
+            # The directory might already exit.
+            pass
+        # [n, size_bytes]: oldest segment first
+        self._segments = []
+        for entry in os.ilistdir(DIRECTORY_SPOOL):
+            name = entry[0]
+            if name.startswith(SPOOL_PREFIX) and name.endswith(SPOOL_SUFFIX):
+                n = int(name[len(SPOOL_PREFIX) : -len(SPOOL_SUFFIX)])
+                self._segments.append([n, os.stat(_filename(n))[6]])
+        self._segments.sort()
+        # Bytes of the oldest segment which have been replayed
+        self._offset = 0
+        # 'size_bytes' and 'evicted_bytes' are ints updated on core 1:
+        # `SensorTelemetry` reads them from core 0, '_segments' might change meanwhile
+        self.size_bytes = sum([size for _n, size in self._segments])
+        self._batch_bytes = 0
+        self._batch_lines = 0
+        self.stored_lines = 0
+        self.replayed_lines = 0
+        self.evicted_bytes = 0
+
+    @property
+    def empty(self) -> bool:
+        return self.size_bytes == 0
+
+    def append(self, line: bytes) -> None:
+        data = line + b"\n"
+        if (len(self._segments) == 0) or (
+            self._segments[-1][1] + len(data) > self._segment_bytes
+        ):
+            n = self._segments[-1][0] + 1 if len(self._segments) > 0 else 0
+            self._segments.append([n, 0])
+        segment = self._segments[-1]
+        with utils_fs.lock:
+            with open(_filename(segment[0]), "ab") as f:
+                f.write(data)
+        segment[1] += len(data)
+        self.size_bytes += len(data)
+        self.stored_lines += 1
+        self._evict()
+
+    def _remove_oldest(self) -> None:
+        n, size = self._segments.pop(0)
+        with utils_fs.lock:
+            os.remove(_filename(n))
+        self.size_bytes -= max(0, size - self._offset)
+        self._offset = 0
+        self._batch_bytes = 0
+        self._batch_lines = 0
+
+    def _evict(self) -> None:
+        while (self.size_bytes > self._budget_bytes) and (len(self._segments) > 1):
+            size_bytes = self._segments[0][1] - self._offset
+            print(f"WARNING: Spool budget exceeded, evicted {size_bytes} bytes")
+            self.evicted_bytes += size_bytes
+            self._remove_oldest()
+
+    def read_batch(self, max_lines: int) -> bytes:
+        """
+        Return the next lines from the oldest segment or None if empty.
+        """
+        if self.empty:
+            return None
+        with utils_fs.lock:
+            with open(_filename(self._segments[0][0]), "rb") as f:
+                f.seek(self._offset)
+                lines = []
+                for _ in range(max_lines):
+                    line = f.readline()
+                    if len(line) == 0:
+                        break
+                    lines.append(line)
+        if len(lines) == 0:
+            # The segment is shorter than expected
+            self._remove_oldest()
+            return None
+        self._batch_bytes = sum([len(line) for line in lines])
+        self._batch_lines = len(lines)
+        return b"".join(lines).rstrip(b"\n")
+
+    def commit_batch(self) -> None:
+        """
+        The lines returned by `read_batch()` have been published.
+        """
+        self._offset += self._batch_bytes
+        self.size_bytes -= self._batch_bytes
+        self.replayed_lines += self._batch_lines
+        self._batch_bytes = 0
+        self._batch_lines = 0
+        if self._offset >= self._segments[0][1]:
+            self._remove_oldest()
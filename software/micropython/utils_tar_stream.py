@@ -0,0 +1,179 @@
+import os
+import hashlib
+import binascii
+
+import utils_fs
+
+# A file is written to '<name>.new' and renamed when the whole tar is verified.
+STAGING_SUFFIX = ".new"
+# The deflate window of the '.tar.gz' package: 2**GZIP_WBITS bytes of RAM.
+# Must match 'app_packager.GZIP_WBITS'.
+GZIP_WBITS = 10
+_BLOCKSIZE = 512
+_TYPE_REGULAR = (0, ord("0"))
+_TYPE_DIRECTORY = ord("5")
+
+
+def _roundup(val: int, align: int) -> int:
+    return (val + align - 1) & ~(align - 1)
+
+
+class TarStreamInstaller:
+    """
+    Installs a tar file while it is downloaded: No copy of the tar on flash,
+    the RAM used is 'chunk_size'.
+
+    `stage()` parses the tar headers from 'stream' and writes every file to
+    '<name>.new' while the SHA-256 of the stream is updated.
+    The files might be in new directories: They are created right away.
+    `commit()` renames the staged files, `abort()` removes them
+    and the directories created.
+    Every filesystem call holds `utils_fs.lock`, the download does not.
+    """
+
+    def __init__(self, stream, wdt_feed=lambda: False, chunk_size=2048):
+        assert chunk_size >= _BLOCKSIZE
+        self._stream = stream
+        self._wdt_feed = wdt_feed
+        self._hash = hashlib.sha256()
+        self._buf = bytearray(chunk_size)
+        self._mv = memoryview(self._buf)
+        # The names of the staged files
+        self.staged = []
+        # The directories created by `stage()`, parents first
+        self.directories = []
+        self.size_bytes = 0
+
+    @property
+    def sha256(self) -> str:
+        return binascii.hexlify(self._hash.digest()).decode("ascii")
+
+    def _read(self, size: int) -> memoryview:
+        """
+        Read exactly 'size' bytes. The returned memoryview is only valid until the next call!
+        """
+        mv = self._mv[:size]
+        pos = 0
+        while pos < size:
+            n = self._stream.readinto(mv[pos:])
+            if not n:
+                raise EOFError(f"tar truncated after {self.size_bytes + pos} bytes")
+            pos += n
+        self._hash.update(mv)
+        self.size_bytes += size
+        self._wdt_feed()
+        return mv
+
+    def _skip(self, size: int) -> None:
+        while size > 0:
+            size -= len(self._read(min(size, len(self._buf))))
+
+    def _drain(self) -> None:
+        """
+        The end of the archive is padding: It is part of the SHA-256.
+        """
+        while True:
+            n = self._stream.readinto(self._mv)
+            if not n:
+                return
+            self._hash.update(self._mv[:n])
+            self.size_bytes += n
+            self._wdt_feed()
+
+    def stage(self) -> None:
+        while True:
+            header = self._read(_BLOCKSIZE)
+            if header[0] == 0:
+                # Empty block means end of archive
+                self._drain()
+                return
+            name = bytes(header[0:100]).rstrip(b"\0").decode()
+            size = int(bytes(header[124:136]).rstrip(b"\0 ").decode() or "0", 8)
+            typeflag = header[156]
+            if (typeflag == _TYPE_DIRECTORY) or name.endswith("/"):
+                name = name.rstrip("/")
+                try:
+                    with utils_fs.lock:
+                        os.mkdir(name)
+                    self.directories.append(name)
+                except OSError:
+                    # The directory might already exit.
+                    pass
+                self._skip(_roundup(size, _BLOCKSIZE))
+                continue
+            if typeflag not in _TYPE_REGULAR:
+                # For example pax headers
+                print(f"  skip {name}: type {typeflag}")
+                self._skip(_roundup(size, _BLOCKSIZE))
+                continue
+            print(f"  stage {name}: {size} bytes")
+            self.staged.append(name)
+            with utils_fs.lock:
+                f = open(name + STAGING_SUFFIX, "wb")
+            try:
+                remaining = size
+                while remaining > 0:
+                    chunk = self._read(min(remaining, len(self._buf)))
+                    with utils_fs.lock:
+                        f.write(chunk)
+                    remaining -= len(chunk)
+            finally:
+                with utils_fs.lock:
+                    f.close()
+            self._skip(_roundup(size, _BLOCKSIZE) - size)
+
+    def commit(self) -> None:
+        with utils_fs.lock:
+            for name in self.staged:
+                os.rename(name + STAGING_SUFFIX, name)
+
+    def abort(self) -> None:
+        with utils_fs.lock:
+            for name in self.staged:
+                try:
+                    os.remove(name + STAGING_SUFFIX)
+                except OSError:
+                    pass
+            for name in reversed(self.directories):
+                try:
+                    os.rmdir(name)
+                except OSError:
+                    # Not empty: A file which is not part of the tar
+                    pass
+
+
+def decompress(stream):
+    """
+    Return a stream which decompresses the gzip 'stream' while it is read.
+    'deflate' since micropython 1.21, 'zlib.DecompIO' before.
+    """
+    try:
+        import deflate
+
+        return deflate.DeflateIO(stream, deflate.GZIP, GZIP_WBITS)
+    except ImportError:
+        import zlib
+
+        return zlib.DecompIO(stream, 16 + GZIP_WBITS)
+
+
+def install(stream, sha256_expected: str, wdt_feed=lambda: False) -> bool:
+    """
+    Install the tar from 'stream'.
+    Return True if the SHA-256 matched and the files have been replaced.
+    For a '.tar.gz', pass `decompress(stream)`: 'sha256_expected' is the one of the tar.
+    """
+    installer = TarStreamInstaller(stream, wdt_feed=wdt_feed)
+    try:
+        installer.stage()
+    except (OSError, EOFError, ValueError) as e:
+        print(f"ERROR: tar failed: {e}")
+        installer.abort()
+        return False
+    sha256 = installer.sha256
+    if sha256 != sha256_expected:
+        print(f"ERROR: tar {sha256=} {sha256_expected=}!")
+        installer.abort()
+        return False
+    installer.commit()
+    return True
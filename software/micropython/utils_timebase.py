@@ -3,6 +3,11 @@ import time
 import config
 from utils_wdt import wdt, WDT_SLEEP_MS
 
+# Seconds from 1970-01-01 to the epoch of `time.time()`
+UNIX_EPOCH_OFFSET_S = 946_684_800 if time.gmtime(0)[0] == 2000 else 0
+# `reanchor()` moves the anchor after this time: ticks_ms wraps after 2**29 ms
+EPOCH_REANCHOR_MS = const(60 * 60 * 1000)
+
 
 class Timebase:
     def __init__(self, interval_ms: int):
@@ -10,12 +15,72 @@ class Timebase:
         self.start_ms = time.ticks_ms()
         self.measure_next_ms = time.ticks_add(time.ticks_ms(), self._interval_ms)
         self.sleep_done_ms = 0
+        # Time from the end of the last sleep to the begin of this sleep
+        self.busy_ms = 0
+        # None till NTP succeeded: (epoch in ms, ticks_ms) of the same moment.
+        # Dual core: Core 1 sets it, core 0 reads it.
+        # Replaced as one tuple: A reader never sees half an update.
+        self._sync = None
 
     @property
     def now_ms(self) -> int:
         return time.ticks_diff(time.ticks_ms(), self.start_ms)
 
+    @property
+    def epoch_valid(self) -> bool:
+        return self._sync is not None
+
+    @property
+    def epoch_ms(self) -> int:
+        """
+        Return milliseconds since 1970-01-01 UTC or None if NTP did not succeed yet.
+        """
+        sync = self._sync
+        if sync is None:
+            return None
+        sync_epoch_ms, sync_ticks_ms = sync
+        return sync_epoch_ms + time.ticks_diff(time.ticks_ms(), sync_ticks_ms)
+
+    def reanchor(self) -> None:
+        """
+        Move the anchor before the ticks wrap around.
+        Called by the writer of the anchor only: Core 1 in dual core,
+        it might just have set a new anchor by `set_epoch_from_ntp()`.
+        """
+        sync = self._sync
+        if sync is None:
+            return
+        sync_epoch_ms, sync_ticks_ms = sync
+        ticks_ms = time.ticks_ms()
+        duration_ms = time.ticks_diff(ticks_ms, sync_ticks_ms)
+        if duration_ms > EPOCH_REANCHOR_MS:
+            self._sync = (sync_epoch_ms + duration_ms, ticks_ms)
+
+    def set_epoch_from_ntp(self) -> bool:
+        """
+        Set the RTC and the epoch of the ticks using NTP.
+        Requires a network connection.
+        Return True on success.
+        """
+        import ntptime
+
+        try:
+            ntptime.settime()
+        except OSError as e:
+            print(f"ERROR: ntptime.settime() failed: {e}")
+            return False
+        self._sync = (1000 * (time.time() + UNIX_EPOCH_OFFSET_S), time.ticks_ms())
+        return True
+
     def sleep(self):
+        for sleep_ms in self._sleep_steps():
+            time.sleep_ms(sleep_ms)
+
+    def _sleep_steps(self):
+        """
+        Generator: yields the time in ms to wait till the next measurement.
+        """
+        self.busy_ms = self.now_ms - self.sleep_done_ms
         self.measure_next_ms = time.ticks_add(self.measure_next_ms, self._interval_ms)
 
         while True:
@@ -28,7 +93,7 @@ class Timebase:
             # if (sleep_ms < 0) or (sleep_ms > self.interval_ms):
             #     print(f"WARNING: sleep_ms={sleep_ms}")
             wdt.feed()
-            time.sleep_ms(sleep_ms)
+            yield sleep_ms
 
         self.sleep_done_ms = self.now_ms
         wdt.feed()
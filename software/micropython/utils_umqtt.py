@@ -18,6 +18,7 @@ class MQTTClient:
         keepalive=0,
         ssl=False,
         ssl_params={},
+        socket_timeout=None,
     ):
         if port == 0:
             port = 8883 if ssl else 1883
@@ -27,6 +28,8 @@ class MQTTClient:
         self.port = port
         self.ssl = ssl
         self.ssl_params = ssl_params
+        # None: blocking socket. Else: seconds until a read/write raises OSError
+        self.socket_timeout = socket_timeout
         self.pid = 0
         self.cb = None
         self.user = user
@@ -64,6 +67,7 @@ class MQTTClient:
 
     def connect(self, clean_session=True):
         self.sock = socket.socket()
+        self.sock.settimeout(self.socket_timeout)
         addr = socket.getaddrinfo(self.server, self.port)[0][-1]
         self.sock.connect(addr)
         if self.ssl:
@@ -177,7 +181,7 @@ class MQTTClient:
     # messages processed internally.
     def wait_msg(self):
         res = self.sock.read(1)
-        self.sock.setblocking(True)
+        self.sock.settimeout(self.socket_timeout)
         if res is None:
             return None
         if res == b"":
@@ -16,6 +16,16 @@ class Wdt:
         self._wdt = None
         self._monitor_last_wdt_ms: int = time.ticks_ms()
         self.is_enabled = False
+        self._late_cb = None
+
+    def register_late_cb(self, late_cb) -> None:
+        """
+        'late_cb(duration_ms: int)' is called by `feed()` if the previous
+        feed is more than WDT_WARNING_MS ago: The next hang might reset the board.
+        `feed()` might be called while its caller holds a lock, for example
+        `utils_fs.lock`: 'late_cb' must not wait for a lock, see `main.wdt_late()`.
+        """
+        self._late_cb = late_cb
 
     def enable(self) -> None:
         assert self._wdt is None
@@ -27,16 +37,22 @@ class Wdt:
         machine.mem32[0x40058000] = machine.mem32[0x40058000] & ~(1 << 30)
 
     def feed(self):
+        """
+        Might call 'late_cb', see `register_late_cb()`.
+        """
         now_ms = time.ticks_ms()
         duration_since_last_feed_ms = time.ticks_diff(now_ms, self._monitor_last_wdt_ms)
         self._monitor_last_wdt_ms = now_ms
+        # Feed first: 'late_cb' might write to flash
+        if self._wdt is not None:
+            self._wdt.feed()
         if duration_since_last_feed_ms > WDT_WARNING_MS:
             # log.log(msg, level=INFO)
             print(
                 f"WARNING: wdt.feed(): {duration_since_last_feed_ms:d} ms elapsed, timeout {WDT_TIMEOUT_MAX_MS} ms"
             )
-        if self._wdt is not None:
-            self._wdt.feed()
+            if self._late_cb is not None:
+                self._late_cb(duration_since_last_feed_ms)
 
 
 wdt = Wdt()
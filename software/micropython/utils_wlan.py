@@ -1,10 +1,16 @@
+import os
 import time
 import rp2
 import network
 from utils_umqtt import MQTTClient
 
+import config
 import config_secrets
+import utils_fs
 import utils_influxdb
+from utils_spool import Spool
+from utils_timebase import tb
+from utils_constants import FILENAME_LOGRING_UPLOAD
 
 # https://github.com/micropython/micropython/issues/11977
 country = const("CH")
@@ -13,6 +19,8 @@ network.country(country)
 
 
 WLAN_CONNECT_TIME_OUT_MS = const(10000)
+# A stalled broker must not block the caller forever
+MQTT_SOCKET_TIMEOUT_S = const(2)
 
 
 class WLAN:
@@ -160,19 +168,58 @@ class WLAN:
 
 # CLIENT_ID = ubinascii.hexlify(machine.unique_id())
 PUBLISH_TOPIC = b"forward2influxdb"
+# The logring of the previous boot is published in chunks to this subtopic
+LOGRING_SUBTOPIC = "logring"
+LOGRING_CHUNK_BYTES = const(1024)
 INITIAL_VALUE = b"dummy"
 
 
+def annotation(title: str, text: str, severity="INFO"):
+    """
+    Return (fields, tags) to be passed to `MQTT.publish()`.
+    """
+    fields = {
+        "title": f'"{title}: {text}"',
+        "text": f'"{text}"',
+    }
+    tags = {
+        "severity": severity,
+        "event": "annotation",
+    }
+    return fields, tags
+
+
 class MQTT:
     def __init__(self, wlan: WLAN):
         self.client = None
         self.wlan = wlan
         self._callbacks = {}
         self.wlan_connection_counter = -1
+        self.spool = None
+        if config.SPOOL_BUDGET_BYTES > 0:
+            self.spool = Spool(
+                budget_bytes=config.SPOOL_BUDGET_BYTES,
+                segment_bytes=config.SPOOL_SEGMENT_BYTES,
+            )
+        # Timestamp of the last sample stored in the spool
+        self._spool_last_ms = 0
+        # MQTT batching: [(line, timestamp_ms, is_sample)]
+        self._batch = []
+        self._batch_start_ms = 0
+        # See `set_field_names()`
+        self._encoder = None
+        # Size of the last payload published
+        self.payload_bytes = 0
+        # The logring of the previous boot: Bytes published so far
+        self._logring_offset = 0
+        self._logring_done = False
+
+    @staticmethod
+    def _topic(subtopic: str) -> bytes:
+        return f"filament_dryer/{utils_influxdb.influxdb_escape(config_secrets.MQTT_CLIENT_ID)}/{subtopic}".encode()
 
     def register_callback(self, subtopic: str, cb):
-        topic = f"filament_dryer/{utils_influxdb.influxdb_escape(config_secrets.MQTT_CLIENT_ID)}/{subtopic}".encode()
-        self._callbacks[topic] = cb
+        self._callbacks[self._topic(subtopic)] = cb
 
     def _callback(self, topic: bytes, msg: bytes):
         if msg == INITIAL_VALUE:
@@ -194,6 +241,8 @@ class MQTT:
         )
         self.client = None
         self.wlan_connection_counter = self.wlan.connection_counter
+        self.wlan._wdt_feed()
+        tb.set_epoch_from_ntp()
 
         if self.client is None:
             self.wlan._wdt_feed()
@@ -203,6 +252,7 @@ class MQTT:
                 user=config_secrets.MQTT_BROKER_USER,
                 password=config_secrets.MQTT_BROKER_PW,
                 keepalive=30,
+                socket_timeout=MQTT_SOCKET_TIMEOUT_S,
             )
         if self.client.sock is not None:
             # We are already connected
@@ -231,13 +281,73 @@ class MQTT:
         print(f"DEBUG: MQTT connected to {config_secrets.MQTT_BROKER}")
         return True
 
-    def publish(self, fields: dict, tags: dict) -> bool:
+    def _upload_logring_chunk(self) -> None:
         """
-        return True if published.
+        Publish the next chunk of the logring of the previous boot,
+        see 'utils_log_ring.py'. One chunk per successful publish:
+        The caller is never stalled by the whole file.
+        QoS 1: The file is only removed when all chunks are acknowledged.
         """
-        if not self.connect():
-            return False
+        if self._logring_done:
+            return
+        try:
+            with utils_fs.lock:
+                with open(FILENAME_LOGRING_UPLOAD, "rb") as f:
+                    f.seek(self._logring_offset)
+                    chunk = f.read(LOGRING_CHUNK_BYTES)
+        except OSError:
+            # Nothing to upload
+            self._logring_done = True
+            return
+        if len(chunk) == 0:
+            with utils_fs.lock:
+                os.remove(FILENAME_LOGRING_UPLOAD)
+            self._logring_done = True
+            print(f"DEBUG: MQTT published {FILENAME_LOGRING_UPLOAD}")
+            return
+        try:
+            self.wlan._wdt_feed()
+            self.client.publish(self._topic(LOGRING_SUBTOPIC), chunk, qos=1)
+        except OSError as e:
+            print(f"ERROR: MQTT logring publish() failed: {e}")
+            self.wlan.power_off()
+            return
+        self._logring_offset += len(chunk)
+
+    def set_field_names(self, field_names: list) -> None:
+        """
+        Create the encoder used by `publish_values()`.
+        """
+        self._encoder = utils_influxdb.LineProtocolEncoder(
+            measurement=utils_influxdb.influxdb_escape(config_secrets.MQTT_CLIENT_ID),
+            tags=config_secrets.MQTT_TAGS,
+            field_names=field_names,
+        )
+
+    def publish_values(self, values: list, timestamp_ms: int = None) -> bool:
+        """
+        Publish a sample: One value per field name of `set_field_names()`.
+        timestamp_ms: When the sample was taken. None: now.
+        return True if published or queued for publishing.
+        Else the sample is stored in the spool.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = tb.epoch_ms
+        line = self._encoder.encode(values)
+        if line is None:
+            # config.MQTT_DELTA: Nothing changed
+            return True
+        return self._publish_line(line, timestamp_ms, is_sample=True)
 
+    def publish(self, fields: dict, tags: dict, timestamp_ms: int = None) -> bool:
+        """
+        timestamp_ms: When the event happened. None: now.
+        return True if published or queued for publishing.
+        Else the sample is stored in the spool.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = tb.epoch_ms
+        is_sample = len(tags) == 0
         tags.update(config_secrets.MQTT_TAGS)
         measurements = [
             {
@@ -248,16 +358,71 @@ class MQTT:
                 "tags": tags,
             },
         ]
-        payload = utils_influxdb.build_payload(measurements)
+        line = utils_influxdb.build_payload(measurements).encode()
+        return self._publish_line(line, timestamp_ms, is_sample)
+
+    def _publish_line(self, line: bytes, timestamp_ms: int, is_sample: bool) -> bool:
+        """
+        line: A line without timestamp.
+        """
+        if (config.MQTT_BATCH_SAMPLES <= 1) or (timestamp_ms is None):
+            return self._publish_batch(
+                [(line, timestamp_ms, is_sample)], stamp=config.MQTT_TIMESTAMPS
+            )
+
+        now_ms = time.ticks_ms()
+        if len(self._batch) == 0:
+            self._batch_start_ms = now_ms
+        self._batch.append((line, timestamp_ms, is_sample))
+        if len(self._batch) < config.MQTT_BATCH_SAMPLES:
+            if time.ticks_diff(now_ms, self._batch_start_ms) < config.MQTT_BATCH_MS:
+                return True
+        batch = self._batch
+        self._batch = []
+        return self._publish_batch(batch, stamp=True)
+
+    @staticmethod
+    def _stamped(line, timestamp_ms: int):
+        """
+        Return the line with timestamp if 'timestamp_ms' is not None.
+        """
+        if timestamp_ms is None:
+            return line
+        return line + utils_influxdb.format_timestamp(
+            timestamp_ms, config.INFLUXDB_TIMESTAMP_PRECISION
+        ).encode()
+
+    def _publish_batch(self, batch: list, stamp: bool) -> bool:
+        """
+        Publish all lines of the batch in one payload.
+        stamp: True to add the timestamps.
+        return True if published.
+        """
+        if not self.connect():
+            self._spool_store(batch)
+            return False
+
+        if len(batch) == 1:
+            line, timestamp_ms, _ = batch[0]
+            payload = self._stamped(line, timestamp_ms if stamp else None)
+        else:
+            payload = b"\n".join(
+                [
+                    self._stamped(line, timestamp_ms if stamp else None)
+                    for line, timestamp_ms, _ in batch
+                ]
+            )
         if False:
             print(f"{config_secrets.MQTT_BROKER}: {PUBLISH_TOPIC}")
-            print(payload)
+            print(bytes(payload))
+        self.payload_bytes = len(payload)
         try:
             self.wlan._wdt_feed()
             self.client.publish(PUBLISH_TOPIC, payload)
         except OSError as e:
             print(f"ERROR: MQTT publish() failed: {e}")
             self.wlan.power_off()
+            self._spool_store(batch)
             return False
         try:
             self.wlan._wdt_feed()
@@ -266,18 +431,50 @@ class MQTT:
             print(f"ERROR: MQTT check_msg() failed: {e}")
             self.wlan.power_off()
             return False
+        self._spool_replay()
+        self._upload_logring_chunk()
         return True
 
+    def _spool_store(self, batch: list):
+        if self.spool is None:
+            return
+        for line, timestamp_ms, is_sample in batch:
+            if timestamp_ms is None:
+                # Without a timestamp, the record would be useless
+                continue
+            if is_sample:
+                if timestamp_ms - self._spool_last_ms < config.SPOOL_INTERVAL_MS:
+                    continue
+                self._spool_last_ms = timestamp_ms
+            try:
+                self.spool.append(self._stamped(line, timestamp_ms))
+            except OSError as e:
+                print(f"ERROR: Spool append() failed: {e}")
+                return
+
+    def _spool_replay(self):
+        """
+        Replay a bounded number of batches from the spool.
+        QoS 1: A batch is only removed from the spool when the broker acknowledged it.
+        """
+        if self.spool is None:
+            return
+        for _ in range(config.SPOOL_REPLAY_PUBLISHES):
+            payload = self.spool.read_batch(max_lines=config.SPOOL_REPLAY_LINES)
+            if payload is None:
+                return
+            try:
+                self.wlan._wdt_feed()
+                self.client.publish(PUBLISH_TOPIC, payload, qos=1)
+            except OSError as e:
+                print(f"ERROR: MQTT replay publish() failed: {e}")
+                self.wlan.power_off()
+                return
+            self.spool.commit_batch()
+
     def publish_annotation(self, title: str, text: str, severity="INFO") -> bool:
         """
         return True if published.
         """
-        fields = {
-            "title": f'"{title}: {text}"',
-            "text": f'"{text}"',
-        }
-        tags = {
-            "severity": severity,
-            "event": "annotation",
-        }
+        fields, tags = annotation(title=title, text=text, severity=severity)
         return self.publish(fields=fields, tags=tags)
@@ -0,0 +1,143 @@
+"""
+Runs the humidity conversions of 'micropython/utils_humidity.py' on the PC.
+
+Compares the cost per sample and the numeric agreement of `Psychrometrics`
+against the functions `rel_to_dpt()`, `rel_to_abs()` and `rel_to_vol()`.
+"""
+import pathlib
+import sys
+import timeit
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_humidity  # noqa: E402
+
+ABSOLUTER_NULLPUNKT_C = -273.15
+UMGEBUNGSDRUCK_P = 100000.0
+
+# SHT31 range: -40..125 C, 0..100 %rH
+SAMPLES = [
+    (C - ABSOLUTER_NULLPUNKT_C, UMGEBUNGSDRUCK_P, rH)
+    for C in [float(c) for c in range(-40, 126, 5)]
+    for rH in [0.0, 1.0, 5.0, 20.0, 50.0, 80.0, 100.0]
+]
+
+
+def functions(T: float, P: float, RH: float):
+    return (
+        utils_humidity.rel_to_dpt(T=T, P=P, RH=RH),
+        utils_humidity.rel_to_abs(T=T, P=P, RH=RH),
+        utils_humidity.rel_to_vol(T=T, P=P, RH=RH),
+    )
+
+
+def psychrometrics(T: float, P: float, RH: float):
+    p = utils_humidity.Psychrometrics(T=T, P=P, RH=RH)
+    return p.dpt(), p.abs(), p.vol()
+
+
+def functions_measure2(T: float, P: float, RH: float):
+    return (
+        utils_humidity.rel_to_dpt(T=T, P=P, RH=RH),
+        utils_humidity.rel_to_abs(T=T, P=P, RH=RH),
+    )
+
+
+def psychrometrics_measure2(T: float, P: float, RH: float):
+    p = utils_humidity.Psychrometrics(T=T, P=P, RH=RH)
+    return p.dpt(), p.abs()
+
+
+def table_measure2(T: float, P: float, RH: float):
+    return (
+        utils_humidity.rel_to_dpt_table(T=T, P=P, RH=RH),
+        utils_humidity.rel_to_abs_table(T=T, P=P, RH=RH),
+    )
+
+
+def psychrometrics_newton_measure2(T: float, P: float, RH: float):
+    p = utils_humidity.Psychrometrics(T=T, P=P, RH=RH)
+    return p.dpt_newton(), p.abs()
+
+
+def verify_dpt_newton() -> None:
+    """
+    Sweeps the SHT31 range and compares `dpt_newton()` with `rel_to_dpt()`.
+    """
+    histogram_newton = {}
+    histogram_fixpoint = {}
+    max_diff_K = 0.0
+    for i_C in range(-400, 1251, 5):
+        T = i_C / 10.0 - ABSOLUTER_NULLPUNKT_C
+        for i_rH in range(0, 1001, 5):
+            RH = i_rH / 10.0
+            p = utils_humidity.Psychrometrics(T=T, P=UMGEBUNGSDRUCK_P, RH=RH)
+            if p.e_prime_w * RH / 100 > UMGEBUNGSDRUCK_P / 2:
+                # Not a physical state at this pressure
+                continue
+            dpt_K = p.dpt_newton()
+            histogram_newton[p.dpt_iterations] = (
+                histogram_newton.get(p.dpt_iterations, 0) + 1
+            )
+            max_diff_K = max(
+                max_diff_K,
+                abs(dpt_K - utils_humidity.rel_to_dpt(T=T, P=UMGEBUNGSDRUCK_P, RH=RH)),
+            )
+            p.dpt()
+            histogram_fixpoint[p.dpt_iterations] = (
+                histogram_fixpoint.get(p.dpt_iterations, 0) + 1
+            )
+
+    print("dpt_newton() against rel_to_dpt() from -40C to 125C:")
+    print(f"  max abs difference {max_diff_K:0.4f} K")
+    print(f"  iterations dpt():        {sorted(histogram_fixpoint.items())}")
+    print(f"  iterations dpt_newton(): {sorted(histogram_newton.items())}")
+    assert max_diff_K < 0.01, max_diff_K
+    assert max(histogram_newton) <= utils_humidity.NEWTON_MAX_ITERATIONS
+
+
+def bench(label: str, f) -> float:
+    def run():
+        for T, P, RH in SAMPLES:
+            f(T, P, RH)
+
+    repeat = 20
+    duration_s = min(timeit.repeat(run, number=1, repeat=repeat))
+    us_per_sample = duration_s / len(SAMPLES) * 1e6
+    print(f"  {label:<30s} {us_per_sample:8.2f} us/sample")
+    return us_per_sample
+
+
+def main():
+    max_diff = [0.0, 0.0, 0.0]
+    for T, P, RH in SAMPLES:
+        for i, (a, b) in enumerate(zip(functions(T, P, RH), psychrometrics(T, P, RH))):
+            max_diff[i] = max(max_diff[i], abs(a - b))
+    print(f"Agreement over {len(SAMPLES)} samples (max abs difference):")
+    print(f"  dew point  {max_diff[0]:g} K")
+    print(f"  abs        {max_diff[1]:g} kg/kg")
+    print(f"  vol        {max_diff[2]:g} kg/m^3")
+    assert max_diff[0] < 1e-9, max_diff
+    assert max_diff[1] < 1e-12, max_diff
+    assert max_diff[2] < 1e-12, max_diff
+
+    print("Cost per sample (dew point, abs, vol):")
+    us_functions = bench("rel_to_dpt/abs/vol()", functions)
+    us_psychrometrics = bench("Psychrometrics", psychrometrics)
+    print(f"  speedup {us_functions/us_psychrometrics:0.2f}x")
+
+    print("Cost per sample as in 'SensorSHT31.measure2()' (dew point, abs):")
+    us_functions = bench("rel_to_dpt/abs()", functions_measure2)
+    us_psychrometrics = bench("Psychrometrics", psychrometrics_measure2)
+    print(f"  speedup {us_functions/us_psychrometrics:0.2f}x")
+    us_table = bench("rel_to_dpt/abs_table()", table_measure2)
+    print(f"  speedup {us_functions/us_table:0.2f}x")
+    us_newton = bench("Psychrometrics dpt_newton()", psychrometrics_newton_measure2)
+    print(f"  speedup {us_functions/us_newton:0.2f}x")
+
+    verify_dpt_newton()
+
+
+if __name__ == "__main__":
+    main()
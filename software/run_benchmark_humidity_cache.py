@@ -0,0 +1,120 @@
+"""
+Runs the humidity cache of 'micropython/utils_humidity_cache.py' on the PC.
+
+Simulates noisy SHT31 readings and reports the hit rate of
+`humidity_cache` and the error of `humidity_dew_abs()` against
+an uncached calculation: Keyed on the raw counts and on the
+quantized counts of the firmware.
+
+SHT31 datasheet, repeatability 'high': 0.04 C, 0.08 %rH.
+"""
+import builtins
+import pathlib
+import random
+import sys
+import types
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+builtins.const = lambda x: x
+# 'lib_sht31' imports I2C
+sys.modules["machine"] = types.SimpleNamespace(I2C=object)
+
+import lib_sht31  # noqa: E402
+import utils_humidity_cache  # noqa: E402
+from utils_humidity import Psychrometrics  # noqa: E402
+from utils_lru_cache import LruCache  # noqa: E402
+
+NOISE_C = 0.04
+NOISE_RH = 0.08
+SAMPLES = 2000
+CACHE_SIZE = utils_humidity_cache.humidity_cache._size
+# (label, C, rH, drift C per sample)
+SCENARIOS = (
+    ("room 25C 50%rH", 25.0, 50.0, 0.0),
+    ("box 45C 15%rH", 45.0, 15.0, 0.0),
+    ("heating 25..65C", 25.0, 30.0, 40.0 / SAMPLES),
+)
+# Deadbands of the SHT31 measurements
+DEADBAND_DEW_C = 0.2
+DEADBAND_ABS_G_KG = 0.05
+
+
+def raw_counts(C: float, rH: float) -> tuple:
+    return (
+        min(65535, max(0, round((C + 45.0) / 175.0 * 65535))),
+        min(65535, max(0, round(rH / 100.0 * 65535))),
+    )
+
+
+def dew_abs(raw_t: int, raw_h: int) -> tuple:
+    C, rH = lib_sht31.SHT31.convert_temp_humi(raw_t, raw_h)
+    p = Psychrometrics(
+        T=C - utils_humidity_cache.ABSOLUTER_NULLPUNKT_C,
+        P=utils_humidity_cache.UMGEBUNGSDRUCK_P,
+        RH=rH,
+    )
+    return p.dpt_newton() + utils_humidity_cache.ABSOLUTER_NULLPUNKT_C, 1000.0 * p.abs()
+
+
+def readings(C: float, rH: float, drift_C: float):
+    rnd = random.Random(42)
+    for i in range(SAMPLES):
+        # The absolute humidity stays constant while heating: rH drops
+        C_i = C + i * drift_C
+        rH_i = rH * 2.0 ** (-(C_i - C) / 10.0)
+        yield raw_counts(
+            rnd.gauss(C_i, NOISE_C),
+            rnd.gauss(rH_i, NOISE_RH),
+        )
+
+
+def raw_key_hit_rate(samples: list) -> float:
+    """
+    The cache of before: Keyed on the raw counts.
+    """
+    cache = LruCache(size=CACHE_SIZE)
+    for raw in samples:
+        if cache.get(raw) is None:
+            cache.put(raw, dew_abs(*raw))
+    return cache.hits / len(samples)
+
+
+def run(label: str, samples: list) -> None:
+    cache = utils_humidity_cache.humidity_cache
+    cache.__init__(size=CACHE_SIZE)
+    max_diff_dew_C = max_diff_abs_g_kg = 0.0
+    for raw in samples:
+        dew_C, abs_g_kg = utils_humidity_cache.humidity_dew_abs(*raw)
+        exact_dew_C, exact_abs_g_kg = dew_abs(*raw)
+        max_diff_dew_C = max(max_diff_dew_C, abs(dew_C - exact_dew_C))
+        max_diff_abs_g_kg = max(max_diff_abs_g_kg, abs(abs_g_kg - exact_abs_g_kg))
+    hit_rate = cache.hits / len(samples)
+    print(
+        f"  {label:<18s} hit rate raw {raw_key_hit_rate(samples):5.1%},"
+        f" quantized {hit_rate:5.1%},"
+        f" max error dew {max_diff_dew_C:0.4f} C, abs {max_diff_abs_g_kg:0.4f} g/kg"
+    )
+    assert max_diff_dew_C < DEADBAND_DEW_C / 2, max_diff_dew_C
+    assert max_diff_abs_g_kg < DEADBAND_ABS_G_KG / 2, max_diff_abs_g_kg
+
+
+def main():
+    print(
+        f"Shift T {utils_humidity_cache.HUMIDITY_CACHE_SHIFT_T},"
+        f" shift rH {utils_humidity_cache.HUMIDITY_CACHE_SHIFT_H},"
+        f" {CACHE_SIZE} entries,"
+        f" noise {NOISE_C} C, {NOISE_RH} %rH, {SAMPLES} samples"
+    )
+    sensors = []
+    for label, C, rH, drift_C in SCENARIOS:
+        samples = list(readings(C, rH, drift_C))
+        sensors.append(samples)
+        run(label, samples)
+    # The firmware reads the three SHT31 in turn, they share the cache
+    run("3 SHT31 in turn", [raw for cycle in zip(*sensors) for raw in cycle])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Recomputes dew point and absolute humidity of all logfiles in
+'dryer_experiments' and compares 'utils_humidity_numpy.py' with the
+scalar functions of 'micropython/utils_humidity.py'.
+"""
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+DIRECTORY_EXPERIMENTS = DIRECTORY_OF_THIS_FILE.parent / "dryer_experiments"
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_humidity  # noqa: E402
+import utils_humidity_numpy  # noqa: E402
+
+ABSOLUTER_NULLPUNKT_C = -273.15
+UMGEBUNGSDRUCK_P = 100000.0
+
+# Labels used in the logfiles of 'dryer_experiments'
+LOCATIONS = ("silicagel", "board", "ext")
+
+
+def read_samples():
+    """
+    Returns (lines, T, RH) with T in Kelvin of all SHT31 in all logfiles.
+    """
+    lines = 0
+    list_C = []
+    list_rH = []
+    for filename in sorted(DIRECTORY_EXPERIMENTS.rglob("*.txt")):
+        header = None
+        for line in filename.read_text().splitlines():
+            lines += 1
+            cols = line.split("\t")
+            if len(cols) < 2:
+                continue
+            if cols[1] == "SENSORS_HEADER":
+                header = {label: i for i, label in enumerate(cols)}
+                continue
+            if cols[1] != "SENSORS_VALUES" or header is None:
+                continue
+            if len(cols) != len(header):
+                continue
+            for location in LOCATIONS:
+                list_C.append(float(cols[header[location + "_C"]]))
+                list_rH.append(float(cols[header[location + "_rH"]]))
+    T = np.array(list_C) - ABSOLUTER_NULLPUNKT_C
+    RH = np.array(list_rH)
+    return lines, T, RH
+
+
+def scalar(T: np.ndarray, RH: np.ndarray):
+    dpt = np.empty_like(T)
+    abs = np.empty_like(T)
+    vol = np.empty_like(T)
+    for i, (_T, _RH) in enumerate(zip(T.tolist(), RH.tolist())):
+        dpt[i] = utils_humidity.rel_to_dpt(T=_T, P=UMGEBUNGSDRUCK_P, RH=_RH)
+        abs[i] = utils_humidity.rel_to_abs(T=_T, P=UMGEBUNGSDRUCK_P, RH=_RH)
+        vol[i] = utils_humidity.rel_to_vol(T=_T, P=UMGEBUNGSDRUCK_P, RH=_RH)
+    return dpt, abs, vol
+
+
+def vectorized(T: np.ndarray, RH: np.ndarray):
+    return (
+        utils_humidity_numpy.rel_to_dpt(T=T, P=UMGEBUNGSDRUCK_P, RH=RH),
+        utils_humidity_numpy.rel_to_abs(T=T, P=UMGEBUNGSDRUCK_P, RH=RH),
+        utils_humidity_numpy.rel_to_vol(T=T, P=UMGEBUNGSDRUCK_P, RH=RH),
+    )
+
+
+def main():
+    lines, T, RH = read_samples()
+    print(f"Read {lines} lines, {len(T)} SHT31 samples from {DIRECTORY_EXPERIMENTS}")
+
+    start_s = time.perf_counter()
+    results_scalar = scalar(T, RH)
+    duration_scalar_s = time.perf_counter() - start_s
+
+    start_s = time.perf_counter()
+    results_vectorized = vectorized(T, RH)
+    duration_vectorized_s = time.perf_counter() - start_s
+
+    print(f"  scalar:     {duration_scalar_s:0.3f}s")
+    print(f"  vectorized: {duration_vectorized_s:0.3f}s")
+    print(f"  speedup {duration_scalar_s/duration_vectorized_s:0.1f}x")
+
+    for label, a, b in zip(("dpt", "abs", "vol"), results_scalar, results_vectorized):
+        max_diff = np.max(np.abs(a - b) / np.abs(a))
+        print(f"  {label}: max relative difference {max_diff:0.1e}")
+        assert max_diff < 1e-12, (label, max_diff)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares `utils_influxdb.LineProtocolEncoder` with `utils_influxdb.build_payload()`
+of 'micropython/utils_influxdb.py' on the PC.
+
+The fields are the same as published by the firmware every 10s.
+The encoder gets bytes like `Sensors.get_mqtt_values()` returns them.
+`build_payload()` gets strings like `Sensors.get_mqtt_fields()` returns them.
+"""
+import pathlib
+import sys
+import timeit
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_influxdb  # noqa: E402
+from run_benchmark_mqtt_batch import sample_fields  # noqa: E402
+
+MEASUREMENT = "filament_dryer_1"
+TAGS = {"setup": "dryer", "room": "B15"}
+
+
+def bench(label: str, f) -> float:
+    number = 1000
+    duration_s = min(timeit.repeat(f, number=number, repeat=10))
+    us_per_line = duration_s / number * 1e6
+    print(f"  {label:<36s} {us_per_line:8.2f} us/line")
+    return us_per_line
+
+
+def main():
+    fields = sample_fields()
+    field_names = list(fields)
+    values = [value.encode() for value in fields.values()]
+    encoder = utils_influxdb.LineProtocolEncoder(
+        measurement=MEASUREMENT, tags=TAGS, field_names=field_names
+    )
+
+    def f_build_payload():
+        measurements = [{"measurement": MEASUREMENT, "fields": fields, "tags": TAGS}]
+        return utils_influxdb.build_payload(measurements).encode()
+
+    def f_build_payload_no_validate():
+        measurements = [{"measurement": MEASUREMENT, "fields": fields, "tags": TAGS}]
+        return utils_influxdb.build_payload(measurements, validate=False).encode()
+
+    def f_encoder():
+        return encoder.encode(values)
+
+    line = f_build_payload()
+    assert f_encoder() == line, (f_encoder(), line)
+    print(f"Identical lines of {len(line)} bytes, {len(fields)} fields")
+
+    # config.MQTT_DELTA: Fields which did not change are None
+    values_delta = [value if i % 3 == 0 else None for i, value in enumerate(values)]
+    fields_delta = {
+        name: value for i, (name, value) in enumerate(fields.items()) if i % 3 == 0
+    }
+    measurements = [{"measurement": MEASUREMENT, "fields": fields_delta, "tags": TAGS}]
+    line_delta = utils_influxdb.build_payload(measurements).encode()
+    assert encoder.encode(values_delta) == line_delta, encoder.encode(values_delta)
+    assert encoder.encode([None] * len(values)) is None
+
+    print("Cost per line:")
+    us_build_payload = bench("build_payload()", f_build_payload)
+    us_no_validate = bench("build_payload(validate=False)", f_build_payload_no_validate)
+    us_encoder = bench("LineProtocolEncoder.encode()", f_encoder)
+    print(f"  speedup {us_build_payload/us_encoder:0.2f}x against build_payload()")
+    print(
+        f"  speedup {us_no_validate/us_encoder:0.2f}x against build_payload(validate=False)"
+    )
+
+
+if __name__ == "__main__":
+    main()
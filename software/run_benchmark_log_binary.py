@@ -0,0 +1,134 @@
+"""
+Compares the text and the binary SENSORS_VALUES logfile on the PC:
+'micropython/utils_log_binary.py' and 'utils_log_binary_decoder.py'.
+
+Every binary record is decoded again and compared with the text line.
+NaN and inf are encoded like a broken sensor.
+"""
+import pathlib
+import random
+import sys
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_log_binary  # noqa: E402
+import utils_log_binary_decoder  # noqa: E402
+
+DURATION_H_MS = 3_600_000
+MB = 1_000_000
+STATES = ("dryfan", "drywait", "regenerate", "cooldown")
+
+# (name, unit, format, start, step)
+COLUMNS_STDOUT = (
+    # `Sensoren.stdout_measurements`
+    ("statemachine", "", "{value}", None, None),
+    ("heater_Power", "%", "{value:0.0f}", 100.0, 0.0),
+    ("ambient_rH", "H", "{value:0.1f}", 45.0, 0.3),
+    ("heater_rH", "H", "{value:0.1f}", 8.0, 0.3),
+    ("filament_rH", "H", "{value:0.1f}", 20.0, 0.3),
+)
+COLUMNS_SHT31 = tuple(
+    column
+    for tag in ("ambient", "heater", "filament")
+    for column in (
+        (f"{tag}_C", "C", "{value:0.2f}", 40.0, 0.05),
+        (f"{tag}_rH", "H", "{value:0.1f}", 30.0, 0.3),
+        (f"{tag}_dew_C", "C", "{value:0.1f}", 10.0, 0.1),
+        (f"{tag}_abs_g_kg", "g_kg", "{value:0.2f}", 6.0, 0.02),
+        (f"{tag}_io_errors", "", "{value:d}", 0, 0),
+    )
+)
+COLUMNS_ALL = (
+    COLUMNS_STDOUT[:2]
+    + COLUMNS_SHT31
+    # A counter beyond int16
+    + (("uptime_busy_ms", "ms", "{value:d}", 40_000, 300),)
+)
+
+CONFIGURATIONS = (
+    # label, interval, columns
+    ("stdout_measurements", 2_000, COLUMNS_STDOUT),
+    ("stdout_measurements", 10_000, COLUMNS_STDOUT),
+    ("all sht31", 10_000, COLUMNS_ALL),
+)
+
+
+def decimals(format: str) -> int:
+    # Same as `Measurement.__init__()`
+    if ":d}" in format:
+        return 0
+    if format.endswith("f}") and ("." in format):
+        return int(format[format.rindex(".") + 1 : -2])
+    return None
+
+
+def simulate_hour(interval_ms: int, columns: tuple):
+    """
+    Returns (text_bytes, binary_bytes) for one hour.
+    """
+    rnd = random.Random(42)
+    encoder = utils_log_binary.BinaryLogEncoder(
+        names=[c[0] for c in columns],
+        units=[c[1] for c in columns],
+        decimals=[decimals(c[2]) for c in columns],
+    )
+    binary = bytearray(encoder.header())
+    text = bytearray()
+    lines = []
+    values = [c[3] for c in columns]
+    state = STATES[0]
+    for now_ms in range(0, DURATION_H_MS, interval_ms):
+        if rnd.random() < 0.01:
+            state = rnd.choice(STATES)
+        for i, (_name, _unit, format, _start, step) in enumerate(columns):
+            if step is None:
+                values[i] = state
+            elif isinstance(step, float):
+                values[i] += rnd.uniform(-step, step)
+            else:
+                values[i] += rnd.randint(0, step)
+        texts = [c[2].format(value=v) for c, v in zip(columns, values)]
+        line = "\t".join([str(now_ms), "SENSORS_VALUES", *texts])
+        text.extend(line.encode() + b"\n")
+        lines.append(line)
+        binary.extend(encoder.encode(now_ms, values))
+
+    _header, rows = utils_log_binary_decoder.decode(bytes(binary))
+    rows = [row for row in rows if row[1] == "SENSORS_VALUES"]
+    assert len(rows) == len(lines)
+    for row, line in zip(rows, lines):
+        assert "\t".join(row) == line, (row, line)
+    return len(text), len(binary)
+
+
+def verify_not_finite() -> None:
+    encoder = utils_log_binary.BinaryLogEncoder(
+        names=["a", "b"], units=["C", "C"], decimals=[1, 1]
+    )
+    binary = bytearray(encoder.header())
+    for value in (1.5, float("nan"), float("inf"), float("-inf"), None, 2.5):
+        binary.extend(encoder.encode(0, [value, 3.0]))
+    _header, rows = utils_log_binary_decoder.decode(bytes(binary))
+    rows = [row for row in rows if row[1] == "SENSORS_VALUES"]
+    column_a = [row[2] for row in rows]
+    invalid = utils_log_binary_decoder.TEXT_INVALID
+    assert column_a == ["1.5", invalid, invalid, invalid, invalid, "2.5"], column_a
+    assert all(row[3] == "3.0" for row in rows), rows
+
+
+def main():
+    verify_not_finite()
+    print("Per hour:")
+    print(
+        f"  {'columns':<20s} {'interval':>8s} {'text':>8s} {'binary':>8s} {'text h/MB':>10s} {'binary h/MB':>11s} {'ratio':>6s}"
+    )
+    for label, interval_ms, columns in CONFIGURATIONS:
+        text_bytes, binary_bytes = simulate_hour(interval_ms, columns)
+        print(
+            f"  {label:<20s} {interval_ms/1000:7.0f}s {text_bytes:8d} {binary_bytes:8d} {MB/text_bytes:10.1f} {MB/binary_bytes:11.1f} {text_bytes/binary_bytes:6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
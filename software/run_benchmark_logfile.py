@@ -0,0 +1,286 @@
+"""
+Compares the flush policies of `utils_logfile.Logfile` of
+'micropython/utils_logfile.py' on the PC and verifies the rotation.
+
+ * "flush per line": The previous behavior, every line is written and flushed.
+ * "buffered": Flushed when LOGFILE_FLUSH_BYTES are buffered, after
+   LOGFILE_FLUSH_MS, on a state change and on an error.
+
+The Logfile writes into a model of LittleFS on the flash of the Pico (see `LittleFsModel`).
+The latency of `Logfile.log()` is the time measured on the PC plus the
+modeled flash time of the writes triggered by this call.
+
+Rotation: A device rebooting every 20 minutes for a week on a small filesystem.
+`Logfile.housekeeping()` is called after every line, like the main loop does.
+Stray files like 'logdata_x.txt' are not taken as segments.
+"""
+import builtins
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import types
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+# The Logfile runs on a simulated clock
+_clock_ms = 0
+builtins.const = lambda value: value
+time.ticks_ms = lambda: _clock_ms
+time.ticks_diff = lambda a, b: a - b
+sys.modules["utils_timebase"] = types.SimpleNamespace(
+    tb=types.SimpleNamespace(now_ms=0)
+)
+
+import utils_logfile  # noqa: E402
+from utils_log import LogfileTags  # noqa: E402
+
+DURATION_H_MS = 3_600_000
+# The 'README_findings.md' of 2023-09-09: 842_681 bytes in 5.22h at 2s
+LINE_BYTES = 90
+STATE_CHANGE_MS = 20 * 60_000
+
+# LittleFS as configured by micropython for the rp2
+BLOCK_BYTES = 4096
+PROG_BYTES = 32
+# A metadata commit: ctz struct, size, crc
+METADATA_COMMIT_BYTES = 64
+# Winbond W25Q16JV, typical values
+FLASH_ERASE_MS = 45.0  # per 4k sector
+FLASH_PAGE_PROG_MS = 0.4  # per 256 bytes
+
+# Rotation
+ROTATION_BOOTS = 7 * 24 * 3
+ROTATION_BOOT_MS = 20 * 60_000
+ROTATION_FILESYSTEM_BYTES = 848_000  # Pico W
+ROTATION_OTHER_BYTES = 300_000  # Firmware and spool
+ROTATION_CONFIG = dict(
+    budget_bytes=400_000,
+    segment_bytes=50_000,
+    segments_max=10,
+    floor_bytes=150_000,
+)
+# Without rotation
+NO_ROTATION_CONFIG = dict(
+    budget_bytes=1_000_000_000,
+    segment_bytes=1_000_000_000 - 1,
+    segments_max=1_000_000,
+    floor_bytes=0,
+)
+
+CONFIGURATIONS = (
+    # label, measure interval, flush_bytes, flush_ms
+    ("flush per line", 2_000, 4096, 0),
+    ("buffered", 2_000, 4096, 5 * 60_000),
+    ("flush per line", 10_000, 4096, 0),
+    ("buffered", 10_000, 4096, 5 * 60_000),
+)
+
+
+def _round_up(size: int, unit: int) -> int:
+    return (size + unit - 1) // unit * unit
+
+
+class LittleFsModel:
+    """
+    Counts the bytes programmed and the blocks erased when appending to a file.
+
+    Appending after a sync in the middle of a block: LittleFS copies the
+    partially written block into a new, erased block (lfs_ctz_extend).
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.synced = True
+        self.programmed_bytes = 0
+        self.erased_blocks = 0
+        self.flash_ms = 0.0
+
+    def _program(self, size: int) -> None:
+        self.programmed_bytes += size
+        self.flash_ms += size / 256 * FLASH_PAGE_PROG_MS
+
+    def _erase(self) -> None:
+        self.erased_blocks += 1
+        self.flash_ms += FLASH_ERASE_MS
+
+    def write(self, data) -> None:
+        size = len(data)
+        offset = self.size % BLOCK_BYTES
+        if self.synced and offset > 0:
+            # Copy the partially written block
+            self._erase()
+            self._program(offset)
+        self.synced = False
+        # New blocks
+        for _ in range((offset + size) // BLOCK_BYTES):
+            self._erase()
+        self._program(size)
+        self.size += size
+
+    def flush(self) -> None:
+        # Padding of the last program unit and the metadata commit
+        self._program(_round_up(self.size, PROG_BYTES) - self.size)
+        self._program(METADATA_COMMIT_BYTES)
+        self.synced = True
+
+
+def simulate_hour(directory: str, interval_ms: int, flush_bytes: int, flush_ms: int):
+    """
+    Returns (lines, flushes, fs, latencies_ms) for one hour.
+    """
+    global _clock_ms
+    _clock_ms = 0
+    utils_logfile.DIRECTORY_LOGS = directory
+    logfile = utils_logfile.Logfile(
+        flush_bytes=flush_bytes, flush_ms=flush_ms, **NO_ROTATION_CONFIG
+    )
+    logfile._text.f.close()
+    fs = LittleFsModel()
+    logfile._text.f = fs
+
+    line = "x" * (LINE_BYTES - len("1234567\tSENSORS_VALUES\t"))
+    lines = 0
+    latencies_ms = []
+    for _clock_ms in range(0, DURATION_H_MS, interval_ms):
+        tag = LogfileTags.SENSORS_VALUES
+        if _clock_ms % STATE_CHANGE_MS == 0:
+            tag = LogfileTags.SM_STATE
+        flash_ms = fs.flash_ms
+        start_s = time.perf_counter()
+        logfile.log(tag, line)
+        duration_ms = (time.perf_counter() - start_s) * 1000.0
+        latencies_ms.append(duration_ms + fs.flash_ms - flash_ms)
+        lines += 1
+    logfile.flush()
+    return lines, logfile.flushes, fs, latencies_ms
+
+
+class SmallFilesystem:
+    """
+    `os` for `utils_logfile`: `statvfs()` as if 'directory' was on a small filesystem.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def __getattr__(self, name: str):
+        return getattr(os, name)
+
+    def statvfs(self, _path: str):
+        used_bytes = ROTATION_OTHER_BYTES + sum(
+            entry.stat().st_size for entry in os.scandir(self._directory)
+        )
+        bsize = 4096
+        bavail = max(0, ROTATION_FILESYSTEM_BYTES - used_bytes) // bsize
+        return (bsize, bsize, ROTATION_FILESYSTEM_BYTES // bsize, bavail, bavail, 0, 0, 0, 0, 255)
+
+
+def simulate_rotation(directory: str, config: dict, interval_ms: int):
+    """
+    Returns (max_files, max_bytes, min_free_bytes, removed_segments, max_log_ms, max_housekeeping_ms)
+    """
+    global _clock_ms
+    fs = SmallFilesystem(directory)
+    utils_logfile.os = fs
+    utils_logfile.DIRECTORY_LOGS = directory
+    line = "x" * (LINE_BYTES - len("1234567\tSENSORS_VALUES\t"))
+    max_files = 0
+    max_bytes = 0
+    min_free_bytes = ROTATION_FILESYSTEM_BYTES
+    removed_segments = 0
+    max_log_ms = 0.0
+    max_housekeeping_ms = 0.0
+    try:
+        for _boot in range(ROTATION_BOOTS):
+            logfile = utils_logfile.Logfile(
+                flush_bytes=4096, flush_ms=5 * 60_000, **config
+            )
+            for _clock_ms in range(0, ROTATION_BOOT_MS, interval_ms):
+                start_s = time.perf_counter()
+                logfile.log(LogfileTags.SENSORS_VALUES, line)
+                max_log_ms = max(max_log_ms, (time.perf_counter() - start_s) * 1000.0)
+                # The main loop before it sleeps
+                start_s = time.perf_counter()
+                logfile.housekeeping()
+                max_housekeeping_ms = max(
+                    max_housekeeping_ms, (time.perf_counter() - start_s) * 1000.0
+                )
+            # Reboot without flush: The buffer is lost
+            removed_segments += logfile.removed_segments
+            for f in logfile._files:
+                f.f.close()
+            entries = list(os.scandir(directory))
+            max_files = max(max_files, len(entries))
+            max_bytes = max(max_bytes, sum(e.stat().st_size for e in entries))
+            fsinfo = fs.statvfs(directory)
+            min_free_bytes = min(min_free_bytes, fsinfo[0] * fsinfo[4])
+    finally:
+        utils_logfile.os = os
+    return (
+        max_files,
+        max_bytes,
+        min_free_bytes,
+        removed_segments,
+        max_log_ms,
+        max_housekeeping_ms,
+    )
+
+
+def verify_stray_files() -> None:
+    """
+    Files in the log directory which are not segments are ignored.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        utils_logfile.DIRECTORY_LOGS = directory
+        for name in ("logdata_x.txt", "logdata_.bin", "logdata_12.txt", "notes.txt"):
+            pathlib.Path(directory, name).write_text("x")
+        logfile = utils_logfile.Logfile(
+            flush_bytes=4096, flush_ms=60_000, **ROTATION_CONFIG
+        )
+        assert logfile._segments == [[12, 1]], logfile._segments
+        for f in logfile._files:
+            f.f.close()
+
+
+def main():
+    verify_stray_files()
+    print("Per hour:")
+    print(
+        f"  {'policy':<15s} {'interval':>8s} {'lines':>6s} {'flushes':>7s} {'programmed':>10s} {'erased':>6s} {'mean ms':>8s} {'max ms':>8s}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for label, interval_ms, flush_bytes, flush_ms in CONFIGURATIONS:
+            lines, flushes, fs, latencies_ms = simulate_hour(
+                directory, interval_ms, flush_bytes, flush_ms
+            )
+            mean_ms = sum(latencies_ms) / len(latencies_ms)
+            print(
+                f"  {label:<15s} {interval_ms/1000:7.0f}s {lines:6d} {flushes:7d} {fs.programmed_bytes:10d} {fs.erased_blocks:6d} {mean_ms:8.3f} {max(latencies_ms):8.3f}"
+            )
+
+    print(
+        f"Rotation: {ROTATION_BOOTS} boots, {ROTATION_BOOT_MS//60_000} minutes each, logging every 2s:"
+    )
+    print(
+        f"  {'rotation':<8s} {'files':>5s} {'bytes':>9s} {'free':>9s} {'removed':>7s} {'max log() ms':>12s} {'max housekeeping() ms':>21s}"
+    )
+    for label, config in (("off", NO_ROTATION_CONFIG), ("on", ROTATION_CONFIG)):
+        with tempfile.TemporaryDirectory() as directory:
+            (
+                max_files,
+                max_bytes,
+                min_free_bytes,
+                removed,
+                max_log_ms,
+                max_housekeeping_ms,
+            ) = simulate_rotation(directory, config, interval_ms=2_000)
+        print(
+            f"  {label:<8s} {max_files:5d} {max_bytes:9d} {min_free_bytes:9d} {removed:7d} {max_log_ms:12.3f} {max_housekeeping_ms:21.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
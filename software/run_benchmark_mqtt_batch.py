@@ -0,0 +1,159 @@
+"""
+Estimates bytes on air and MQTT publish calls per hour
+for the MQTT batching of 'micropython/utils_wlan.py'.
+
+`MQTT_BATCH_SAMPLES = 1` is the current behavior: one publish per sample.
+The payload is built by 'micropython/utils_influxdb.py', the framing
+overhead is modeled below.
+"""
+import math
+import pathlib
+import sys
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_influxdb  # noqa: E402
+
+MEASURE_INTERVAL_MS = 10_000
+DURATION_H_MS = 3_600_000
+PUBLISH_TOPIC = b"forward2influxdb"
+TIMESTAMP_MS = 1_700_000_000_000
+
+# Framing overhead
+TCP_MSS_BYTES = 1460
+TCP_IP_HEADER_BYTES = 40  # IPv4 20 + TCP 20
+WLAN_FRAME_BYTES = 54  # MAC header 24 + QoS 2 + LLC/SNAP 8 + CCMP 16 + FCS 4
+# Every publish is answered by a TCP ACK from the broker
+BROKER_ACK_BYTES = TCP_IP_HEADER_BYTES + WLAN_FRAME_BYTES
+
+# (MQTT_BATCH_SAMPLES, MQTT_BATCH_MS, INFLUXDB_TIMESTAMP_PRECISION)
+CONFIGURATIONS = (
+    (1, 60_000, "ns"),
+    (3, 60_000, "ns"),
+    (6, 60_000, "ns"),
+    (6, 60_000, "s"),
+    (30, 300_000, "ns"),
+)
+
+
+def sample_fields() -> dict:
+    """
+    Fields as returned by `Sensors.get_mqtt_fields()` of the current firmware.
+    """
+    fields = {
+        "uptime_h": "12.345",
+        "uptime_busy_ms": "412",
+        "uptime_cache_hits": "1234",
+        "uptime_cache_misses": "567",
+        "statemachine": '"dryfan"',
+        "telemetry_drops": "0",
+        "telemetry_queued": "0",
+        "telemetry_latency_ms": "0",
+        "telemetry_spool_bytes": "0",
+        "telemetry_spool_evicted_bytes": "0",
+        "telemetry_payload_bytes": "679",
+        "button": "0",
+        "led_green": "1",
+        "led_red": "0",
+        "led_white": "0",
+        "heater_C": "65.43",
+        "heater_Power": "100",
+        "filament_Fan": "1",
+        "ambient_Fan": "0",
+    }
+    for tag in ("ambient", "heater", "filament"):
+        fields[f"{tag}_C"] = "23.45"
+        fields[f"{tag}_rH"] = "45.6"
+        fields[f"{tag}_dew_C"] = "10.9"
+        fields[f"{tag}_abs_g_kg"] = "8.12"
+        fields[f"{tag}_io_errors"] = "0"
+        fields[f"{tag}_retries"] = "0"
+    return fields
+
+
+def measurement(timestamp_ms) -> dict:
+    m = {
+        "measurement": "filament_dryer_1",
+        "fields": sample_fields(),
+        "tags": {"setup": "dryer", "room": "B15"},
+    }
+    if timestamp_ms is not None:
+        m["timestamp_ms"] = timestamp_ms
+    return m
+
+
+def mqtt_publish_bytes(payload: bytes) -> int:
+    """
+    MQTT PUBLISH QoS 0: fixed header, remaining length, topic, payload
+    """
+    remaining = 2 + len(PUBLISH_TOPIC) + len(payload)
+    len_remaining = 1
+    while remaining >= 128 ** len_remaining:
+        len_remaining += 1
+    return 1 + len_remaining + remaining
+
+
+def on_air_bytes(mqtt_bytes: int) -> int:
+    segments = math.ceil(mqtt_bytes / TCP_MSS_BYTES)
+    return (
+        mqtt_bytes
+        + segments * (TCP_IP_HEADER_BYTES + WLAN_FRAME_BYTES)
+        + BROKER_ACK_BYTES
+    )
+
+
+def simulate_hour(batch_samples: int, batch_ms: int, precision: str):
+    """
+    Returns (publishes, payload_bytes, on_air_bytes) for one hour.
+    """
+    publishes = 0
+    payload_bytes = 0
+    air_bytes = 0
+    batch = []
+    batch_start_ms = 0
+
+    def flush():
+        nonlocal publishes, payload_bytes, air_bytes
+        payload = utils_influxdb.build_payload(batch, precision=precision).encode()
+        publishes += 1
+        payload_bytes += len(payload)
+        air_bytes += on_air_bytes(mqtt_publish_bytes(payload))
+        batch.clear()
+
+    for now_ms in range(0, DURATION_H_MS, MEASURE_INTERVAL_MS):
+        if batch_samples <= 1:
+            # Current behavior: no timestamp
+            batch.append(measurement(None))
+            flush()
+            continue
+        if len(batch) == 0:
+            batch_start_ms = now_ms
+        batch.append(measurement(TIMESTAMP_MS + now_ms))
+        if len(batch) < batch_samples and now_ms - batch_start_ms < batch_ms:
+            continue
+        flush()
+    if len(batch) > 0:
+        flush()
+    return publishes, payload_bytes, air_bytes
+
+
+def main():
+    print(f"Sample every {MEASURE_INTERVAL_MS} ms, per hour:")
+    print(
+        f"  {'MQTT_BATCH_SAMPLES':>18s} {'MQTT_BATCH_MS':>13s} {'precision':>9s} {'publishes':>9s} {'payload':>9s} {'on air':>9s} {'ratio':>6s}"
+    )
+    reference_bytes = None
+    for batch_samples, batch_ms, precision in CONFIGURATIONS:
+        publishes, payload_bytes, air_bytes = simulate_hour(
+            batch_samples, batch_ms, precision
+        )
+        if reference_bytes is None:
+            reference_bytes = air_bytes
+        print(
+            f"  {batch_samples:18d} {batch_ms:13d} {precision:>9s} {publishes:9d} {payload_bytes:9d} {air_bytes:9d} {air_bytes/reference_bytes:6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
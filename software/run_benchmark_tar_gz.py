@@ -0,0 +1,76 @@
+"""
+Compares the plain tar and the '.tar.gz' of the app package,
+installed by 'micropython/utils_tar_stream.py' on the PC.
+
+The package is built and compressed from the files in 'micropython' like
+'app_packager/app_packager.py' does.
+The local HTTP server is throttled to BYTES_PER_S to resemble the WLAN of the pico.
+The '.tar.gz' is decompressed by `utils_tar_stream.decompress()`,
+see `run_test_tar_stream.DeflateIO`.
+"""
+import hashlib
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import urllib.request
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_tar_stream  # noqa: E402
+from run_test_tar_stream import Server, build_tar, build_tar_gz, listing  # noqa: E402
+from run_test_app_package_delta import package_files  # noqa: E402
+
+# Assumption: urequests on the pico w
+BYTES_PER_S = 100_000
+
+
+def run_case(label, server, directory, path, sha256, compressed) -> float:
+    for filename in directory.iterdir():
+        filename.unlink()
+    start_s = time.perf_counter()
+    with urllib.request.urlopen(server.url + path) as response:
+        stream = utils_tar_stream.decompress(response) if compressed else response
+        installed = utils_tar_stream.install(stream, sha256_expected=sha256)
+    duration_s = time.perf_counter() - start_s
+    assert installed, label
+    print(f"{label}: {len(server.files[path])} bytes downloaded in {duration_s:0.2f}s")
+    return duration_s
+
+
+def main():
+    files = package_files()
+    tar = build_tar(files)
+    tar_gz = build_tar_gz(tar)
+    sha256 = hashlib.sha256(tar).hexdigest()
+    print(
+        f"{len(files)} files: tar {len(tar)} bytes, tar.gz {len(tar_gz)} bytes (window {2**utils_tar_stream.GZIP_WBITS} bytes): {len(tar)/len(tar_gz):0.1f}x"
+    )
+    server = Server(
+        {"/package.tar": tar, "/package.tar.gz": tar_gz}, bytes_per_s=BYTES_PER_S
+    )
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        os.chdir(directory)
+        try:
+            duration_tar_s = run_case(
+                "tar", server, directory, "/package.tar", sha256, compressed=False
+            )
+            files_tar = listing(directory)
+            duration_gz_s = run_case(
+                "tar.gz", server, directory, "/package.tar.gz", sha256, compressed=True
+            )
+            assert listing(directory) == files_tar
+        finally:
+            os.chdir(cwd)
+            server.close()
+    print(
+        f"At {BYTES_PER_S} bytes/s: the update takes {duration_gz_s/duration_tar_s*100:0.0f}% of the time"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import pathlib
 from typing import List, Tuple
 import matplotlib.pyplot as plt
 
+import utils_log_binary_decoder
+
 DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
 
 
@@ -62,12 +64,15 @@ COL_SENSORS_HEADERS = "SENSORS_HEADER"
 
 class LogReader:
     def __init__(self, filename: pathlib.Path):
-        with open(filename, newline="") as csvfile:
-            reader = csv.reader(csvfile, delimiter="\t", quotechar="|")
-            header = next(reader)
-            self._rows = list(reader)
-
-            assert header[1] == COL_SENSORS_HEADERS
+        if filename.suffix == ".bin":
+            header, self._rows = utils_log_binary_decoder.read(filename)
+        else:
+            with open(filename, newline="") as csvfile:
+                reader = csv.reader(csvfile, delimiter="\t", quotechar="|")
+                header = next(reader)
+                self._rows = list(reader)
+
+        assert header[1] == COL_SENSORS_HEADERS
 
         skip_columns = 2
         self._dict_header = {
@@ -0,0 +1,160 @@
+"""
+Generates 'micropython/utils_humidity_table.py' and verifies the table
+driven functions of 'micropython/utils_humidity.py' against the exact ones.
+
+Run this script whenever the range or the step of the table is changed.
+"""
+import math
+import pathlib
+import struct
+import sys
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+DIRECTORY_MICROPYTHON = DIRECTORY_OF_THIS_FILE / "micropython"
+FILENAME_TABLE = DIRECTORY_MICROPYTHON / "utils_humidity_table.py"
+
+# Operating range of the dryers
+TABLE_T_MIN_C = -20.0
+TABLE_T_MAX_C = 130.0
+TABLE_STEP_C = 0.5
+
+# Verified by `verify()` below. Documented in 'utils_humidity.py'.
+MAX_ERROR_ABS_RELATIVE = 3e-4
+MAX_ERROR_DPT_K = 0.01
+
+ABSOLUTER_NULLPUNKT_C = -273.15
+UMGEBUNGSDRUCK_P = 100000.0
+
+
+def float32(value: float) -> float:
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def e_w(T: float) -> float:
+    """Sonntag-1994 eq 7; e_w in Pascals"""
+    ln_e_w = (
+        -6096 * T**-1
+        + 21.2409642
+        - 2.711193 * 10**-2 * T
+        + 1.673952 * 10**-5 * T**2
+        + 2.433502 * math.log(T)
+    )
+    return math.exp(ln_e_w)
+
+
+def t_d(e: float) -> float:
+    """Sonntag-1994 eq 10: dew point in C from the vapor pressure e in Pascals"""
+    y = math.log(e / 611.213)
+    return (
+        13.715 * y
+        + 8.4262 * 10**-1 * y**2
+        + 1.9048 * 10**-2 * y**3
+        + 7.8158 * 10**-3 * y**4
+    )
+
+
+def t_d_inverse(t: float) -> float:
+    """Returns e in Pascals with t_d(e) == t, solved by bisection"""
+    ln_e_lo, ln_e_hi = math.log(1.0), math.log(1e6)
+    for _ in range(100):
+        ln_e = (ln_e_lo + ln_e_hi) / 2.0
+        if t_d(math.exp(ln_e)) > t:
+            ln_e_hi = ln_e
+        else:
+            ln_e_lo = ln_e
+    return math.exp(ln_e)
+
+
+def f_w_a(t: float) -> float:
+    """Sonntag-1994 eq 22, first temperature dependent term"""
+    return 38 + 173 * math.exp(-t / 43)
+
+
+def f_w_b(t: float) -> float:
+    """Sonntag-1994 eq 22, second temperature dependent term"""
+    return 6.39 + 4.28 * math.exp(-t / 107)
+
+
+def format_array(name: str, values) -> str:
+    lines = [f'{name} = array(\n    "f",\n    (']
+    for i in range(0, len(values), 6):
+        lines.append("        " + " ".join(f"{v:.9g}," for v in values[i : i + 6]))
+    lines.append("    ),\n)\n")
+    return "\n".join(lines)
+
+
+def generate() -> None:
+    n = round((TABLE_T_MAX_C - TABLE_T_MIN_C) / TABLE_STEP_C) + 1
+    list_t = [TABLE_T_MIN_C + i * TABLE_STEP_C for i in range(n)]
+
+    def table(f) -> list:
+        return [float32(f(t)) for t in list_t]
+
+    text = f'''"""
+Generated by 'run_humidity_table.py'. Do not edit!
+
+Tables for the table driven functions in 'utils_humidity.py'.
+Index i corresponds to TABLE_T_MIN_C + i * TABLE_STEP_C.
+"""
+from array import array
+
+TABLE_T_MIN_C = {TABLE_T_MIN_C!r}
+TABLE_T_MAX_C = {TABLE_T_MAX_C!r}
+TABLE_STEP_C = {TABLE_STEP_C!r}
+
+# Sonntag-1994 eq 7; e_w in Pascals
+{format_array("E_W_PA", table(lambda t: e_w(t - ABSOLUTER_NULLPUNKT_C)))}
+# Inverse of Sonntag-1994 eq 10: the vapor pressure in Pascals at dew point t
+{format_array("E_D_PA", table(t_d_inverse))}
+# Sonntag-1994 eq 22: 38 + 173 * exp(-t / 43)
+{format_array("F_W_A", table(f_w_a))}
+# Sonntag-1994 eq 22: 6.39 + 4.28 * exp(-t / 107)
+{format_array("F_W_B", table(f_w_b))}'''
+    FILENAME_TABLE.write_text(text)
+    print(f"Written {n} entries per table to {FILENAME_TABLE}")
+
+
+def verify() -> None:
+    sys.path.insert(0, str(DIRECTORY_MICROPYTHON))
+    import utils_humidity
+
+    max_error_abs_relative = 0.0
+    max_error_dpt_K = 0.0
+    count = 0
+    for i_t in range(int(TABLE_T_MIN_C * 10), int(TABLE_T_MAX_C * 10) + 1, 3):
+        T = i_t / 10.0 - ABSOLUTER_NULLPUNKT_C
+        for i_rh in range(1, 1001, 7):
+            RH = i_rh / 10.0
+            if utils_humidity.Psychrometrics(
+                T=T, P=UMGEBUNGSDRUCK_P, RH=RH
+            ).e_prime_w * RH / 100 > UMGEBUNGSDRUCK_P / 2:
+                # Not a physical state at this pressure
+                continue
+            abs_exact = utils_humidity.rel_to_abs(T=T, P=UMGEBUNGSDRUCK_P, RH=RH)
+            abs_table = utils_humidity.rel_to_abs_table(
+                T=T, P=UMGEBUNGSDRUCK_P, RH=RH
+            )
+            max_error_abs_relative = max(
+                max_error_abs_relative, abs(abs_table / abs_exact - 1.0)
+            )
+            dpt_exact = utils_humidity.rel_to_dpt(T=T, P=UMGEBUNGSDRUCK_P, RH=RH)
+            dpt_table = utils_humidity.rel_to_dpt_table(
+                T=T, P=UMGEBUNGSDRUCK_P, RH=RH
+            )
+            max_error_dpt_K = max(max_error_dpt_K, abs(dpt_table - dpt_exact))
+            count += 1
+
+    print(f"Verified {count} samples from {TABLE_T_MIN_C}C to {TABLE_T_MAX_C}C:")
+    print(
+        f"  rel_to_abs_table(): max relative error {max_error_abs_relative:0.2e} (limit {MAX_ERROR_ABS_RELATIVE:0.0e})"
+    )
+    print(
+        f"  rel_to_dpt_table(): max error {max_error_dpt_K:0.4f} K (limit {MAX_ERROR_DPT_K} K)"
+    )
+    assert max_error_abs_relative < MAX_ERROR_ABS_RELATIVE
+    assert max_error_dpt_K < MAX_ERROR_DPT_K
+
+
+if __name__ == "__main__":
+    generate()
+    verify()
@@ -0,0 +1,128 @@
+"""
+Runs `utils_app_package_delta.DeltaInstaller` of
+'micropython/utils_app_package_delta.py' on the PC.
+
+The package is built from the files in 'micropython' like
+'app_packager/app_packager.py' does and served by a local HTTP server.
+The new version changes one file and adds one.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import urllib.request
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_app_package_delta  # noqa: E402
+from run_test_tar_stream import Server, build_tar, listing  # noqa: E402
+
+FILENAME_MANIFEST = utils_app_package_delta.FILENAME_MANIFEST
+LINK_BLOBS = "src/blobs"
+
+
+def package_files() -> dict:
+    return {
+        filename.name: filename.read_bytes()
+        for filename in sorted((DIRECTORY_OF_THIS_FILE / "micropython").glob("*.py"))
+    }
+
+
+def build_package(files: dict, commit_sha: str, with_sha256=True):
+    """
+    Returns (files including the manifest, dict_tar, {path: data} to serve).
+    """
+    dict_manifest = dict(files=list(files), commit_sha=commit_sha)
+    if with_sha256:
+        dict_manifest["sha256"] = {
+            name: hashlib.sha256(data).hexdigest() for name, data in files.items()
+        }
+    manifest = json.dumps(dict_manifest, indent=4).encode()
+    files = dict(files)
+    files[FILENAME_MANIFEST] = manifest
+    tar = build_tar(files)
+    dict_tar = dict(
+        link=f"src/{commit_sha}.tar",
+        sha256=hashlib.sha256(tar).hexdigest(),
+        size_bytes=len(tar),
+        manifest=f"src/{commit_sha}.json",
+        manifest_sha256=hashlib.sha256(manifest).hexdigest(),
+        blobs=LINK_BLOBS,
+    )
+    served = {
+        f"/{dict_tar['link']}": tar,
+        f"/{dict_tar['manifest']}": manifest,
+    }
+    for name, data in files.items():
+        if name != FILENAME_MANIFEST:
+            served[f"/{LINK_BLOBS}/{hashlib.sha256(data).hexdigest()}"] = data
+    return files, dict_tar, served
+
+
+def run_case(label, server, directory, files_old, dict_tar) -> tuple:
+    for filename in directory.iterdir():
+        filename.unlink()
+    for name, data in files_old.items():
+        (directory / name).write_bytes(data)
+    server.requests.clear()
+
+    def get(link: str):
+        return urllib.request.urlopen(f"{server.url}/{link}")
+
+    installer = utils_app_package_delta.DeltaInstaller(get=get)
+    with open(FILENAME_MANIFEST) as f:
+        manifest_local = json.load(f)
+    installed = installer.install(dict_tar, manifest_local)
+    print(
+        f"{label}: installed={installed}, {len(server.requests)} requests, {installer.size_bytes} of {dict_tar['size_bytes']} bytes"
+    )
+    return installed, listing(directory)
+
+
+def main():
+    files_v1 = package_files()
+    files_v2 = dict(files_v1)
+    files_v2["utils_wlan.py"] += b"# changed\n"
+    files_v2["utils_new.py"] = b"x = 1\n"
+
+    files_old, _dict_tar, served_old = build_package(files_v1, "v1")
+    files_new, dict_tar, served_new = build_package(files_v2, "v2")
+    server = Server({**served_old, **served_new})
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        os.chdir(directory)
+        try:
+            installed, files = run_case("delta", server, directory, files_old, dict_tar)
+            assert installed
+            assert files == files_new, set(files) ^ set(files_new)
+            assert len(server.requests) == 3, server.requests
+
+            # A corrupt blob: Nothing changes
+            path = f"/{LINK_BLOBS}/{hashlib.sha256(files_v2['utils_new.py']).hexdigest()}"
+            server.files[path] = b"x = 2\n"
+            installed, files = run_case(
+                "corrupt blob", server, directory, files_old, dict_tar
+            )
+            assert not installed
+            assert files == files_old, set(files) ^ set(files_old)
+            server.files[path] = files_v2["utils_new.py"]
+
+            # A local manifest without sha256: A full update is required
+            files_legacy, _, _ = build_package(files_v1, "v1", with_sha256=False)
+            installed, files = run_case(
+                "legacy manifest", server, directory, files_legacy, dict_tar
+            )
+            assert not installed
+            assert files == files_legacy, set(files) ^ set(files_legacy)
+        finally:
+            os.chdir(cwd)
+            server.close()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Runs `mod_hardware.Heater` with `mod_sensoren.Sensoren` of 'micropython/' on the PC.
+
+The heater must not heat while its board temperature is not known:
+The SHT31 'heater' never measured or broke. `SampleFrame` holds 0 in the
+slot of such a measurement, 0 C would pass HEATER_BOARD_MAX_C.
+
+The hardware is replaced by the fakes below. The SHT31 'heater'
+(I2C bus 1, address 0x44) answers according to 'heater_sht31_C'.
+"""
+import builtins
+import gc
+import pathlib
+import sys
+import time
+import types
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+HEATER_BUS = 1
+HEATER_ADDR = 0x44
+PIN_HEATER = "GPIO7"
+
+# None: The SHT31 'heater' does not answer
+heater_sht31_C = None
+pins = {}
+
+
+def module(name: str, **attributes) -> types.ModuleType:
+    m = types.ModuleType(name)
+    m.__dict__.update(attributes)
+    sys.modules[name] = m
+    return m
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+
+    def __init__(self, id, mode=None, pull=None, value=None):
+        self.id = id
+        self._value = int(value or 0)
+        pins[id] = self
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = int(value)
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def toggle(self):
+        self._value ^= 1
+
+    def irq(self, handler):
+        pass
+
+
+class I2C:
+    def __init__(self, id, scl, sda, freq):
+        self.id = id
+
+    def _heater(self, addr) -> bool:
+        return (self.id, addr) == (HEATER_BUS, HEATER_ADDR)
+
+    def writeto(self, addr, buf):
+        if self._heater(addr) and heater_sht31_C is None:
+            raise OSError(5, "EIO")
+
+    def readfrom(self, addr, count):
+        import lib_sht31
+
+        C = heater_sht31_C if self._heater(addr) else 25.0
+        if C is None:
+            raise OSError(5, "EIO")
+        raw_t = round((C + 45.0) / 175.0 * 65535)
+        # 50%rH
+        raw = bytearray((raw_t >> 8, raw_t & 0xFF, 0, 0x80, 0x00, 0))
+        raw[2] = lib_sht31._crc8(raw, 0)
+        raw[5] = lib_sht31._crc8(raw, 3)
+        return raw
+
+    def readfrom_mem(self, addr, memaddr, count, addrsize=8):
+        return self.readfrom(addr, count)
+
+
+def fake_modules():
+    builtins.const = lambda x: x
+    # Names only used in annotations: micropython does not evaluate them
+    builtins.Heater = builtins.Hardware = object
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_ms = lambda ms: None
+    gc.mem_alloc = lambda: 0
+    gc.mem_free = lambda: 200_000
+    module(
+        "machine",
+        Pin=Pin,
+        I2C=I2C,
+        WDT=object,
+        mem32={0x40058000: 0},
+        unique_id=lambda: b"harness!",
+    )
+    module("onewire", OneWire=object)
+    module("ds18x20", DS18X20=object)
+
+
+def heating(hardware, sensoren) -> bool:
+    sensoren.measure()
+    hardware.heater.set_power(True)
+    hardware.heater.set_board_C(board_C=sensoren.heater_board_C)
+    return bool(pins[PIN_HEATER].value())
+
+
+def main():
+    global heater_sht31_C
+
+    fake_modules()
+    import config
+
+    # Nothing is written to the filesystem
+    config.LOGFILE_ENABLED = False
+    config.LOGRING_BYTES = 0
+
+    import utils_measurement
+    from mod_hardware import Hardware
+    from mod_sensoren import Sensoren
+
+    # `reprobe()` on every cycle
+    utils_measurement.REPROBE_MS = 0
+
+    hardware = Hardware()
+    sensoren = Sensoren(hardware)
+
+    print("SHT31 'heater' never measured")
+    assert not heating(hardware, sensoren)
+    assert sensoren.heater_board_C is None
+    assert sensoren.heater_C == 0.0
+
+    print("SHT31 'heater' at 60C")
+    heater_sht31_C = 60.0
+    assert heating(hardware, sensoren)
+    assert abs(sensoren.heater_board_C - 60.0) < 0.01
+
+    print("SHT31 'heater' above HEATER_BOARD_MAX_C")
+    heater_sht31_C = config.HEATER_BOARD_MAX_C + 1.0
+    assert not heating(hardware, sensoren)
+
+    print("SHT31 'heater' broke")
+    heater_sht31_C = 60.0
+    assert heating(hardware, sensoren)
+    heater_sht31_C = None
+    assert not heating(hardware, sensoren)
+    assert sensoren.heater_board_C is None
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Runs 'micropython/main.py' on the PC against a stalled network:
+The MQTT broker accepts the TCP connection and never answers,
+NTP and the app package poll time out.
+
+The hardware is replaced by the fakes below, the SHT31 always
+returns the same measurement. Every mode runs in its own process:
+  dual_core: `config.ENABLE_DUAL_CORE`, core 0 runs `main_core0()`,
+    core 1 runs `main_core1()`
+  single_core: The sequential loop `main_core2()`
+
+`Heater.set_board_C()` writes the heater pin once per cycle.
+dual_core: Asserts that core 0 keeps this period while core 1 stalls.
+single_core: Asserts that the loop survives the stalls and reports the
+longest gap: See the comment of `config.ENABLE_DUAL_CORE`.
+"""
+import builtins
+import binascii
+import gc
+import os
+import pathlib
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+DIRECTORY_MICROPYTHON = DIRECTORY_OF_THIS_FILE / "micropython"
+
+MODES = ("dual_core", "single_core")
+MEASURE_INTERVAL_MS = 500
+# Core 0 may be late by this time
+TOLERANCE_MS = 250
+# Like `utils_wlan.MQTT_SOCKET_TIMEOUT_S`
+STALL_S = 2.0
+RUN_S = 10.0
+# single_core: Stalls within one cycle: NTP, MQTT and the app package poll.
+# The spool is disabled below: No replays.
+SINGLE_CORE_STALLS = 3
+PIN_HEATER = "GPIO7"
+PIN_BUTTON = "GPIO22"
+
+
+class StopHarness(BaseException):
+    """
+    Raised by the heater pin after RUN_S: Leaves main.py.
+    """
+
+
+class Harness:
+    def __init__(self):
+        self.start_s = time.monotonic()
+        # time.monotonic() of every write to the heater pin
+        self.heater_writes_s = []
+        # Seconds the network stalled a caller
+        self.stalled_s = 0.0
+        self.broker_connections = 0
+        self.thread_errors = []
+
+    def stall(self, what: str):
+        print(f"HARNESS: {what} stalls for {STALL_S}s")
+        time.sleep(STALL_S)
+        self.stalled_s += STALL_S
+        raise OSError(110, f"ETIMEDOUT: {what}")
+
+    def heater_written(self):
+        now_s = time.monotonic()
+        self.heater_writes_s.append(now_s)
+        if now_s - self.start_s > RUN_S:
+            raise StopHarness()
+
+
+harness = Harness()
+
+
+class StalledBroker:
+    """
+    Accepts TCP connections, never reads nor answers.
+    """
+
+    def __init__(self):
+        self._socket = socket.socket()
+        # Small buffers: A publish stalls soon
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(5)
+        self.address = self._socket.getsockname()
+        self._connections = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            connection, _ = self._socket.accept()
+            self._connections.append(connection)
+            harness.broker_connections += 1
+
+
+class Ssid(bytes):
+    """
+    micropython formats bytes with ":s".
+    """
+
+    def __format__(self, format_spec):
+        return str(self)
+
+
+def module(name: str, **attributes) -> types.ModuleType:
+    m = types.ModuleType(name)
+    m.__dict__.update(attributes)
+    sys.modules[name] = m
+    return m
+
+
+def fake_machine():
+    class Pin:
+        IN = 0
+        OUT = 1
+        PULL_UP = 1
+
+        def __init__(self, id, mode=None, pull=None, value=None):
+            self.id = id
+            # The button is not pressed: The watchdog is enabled
+            self._value = 1 if id == PIN_BUTTON else int(value or 0)
+
+        def value(self, value=None):
+            if value is None:
+                return self._value
+            self._value = int(value)
+            if self.id == PIN_HEATER:
+                harness.heater_written()
+
+        def on(self):
+            self.value(1)
+
+        def off(self):
+            self.value(0)
+
+        def toggle(self):
+            self._value ^= 1
+
+        def irq(self, handler):
+            pass
+
+    class I2C:
+        def __init__(self, id, scl, sda, freq):
+            pass
+
+        def writeto(self, addr, buf):
+            pass
+
+        def readfrom(self, addr, count):
+            import lib_sht31
+
+            # 25C, 50%rH
+            raw = bytearray((0x66, 0x66, 0, 0x80, 0x00, 0))
+            raw[2] = lib_sht31._crc8(raw, 0)
+            raw[5] = lib_sht31._crc8(raw, 3)
+            return raw
+
+        def readfrom_mem(self, addr, memaddr, count, addrsize=8):
+            return self.readfrom(addr, count)
+
+    class Timer:
+        ONE_SHOT = 0
+
+        def init(self, period, mode, callback):
+            pass
+
+        def deinit(self):
+            pass
+
+    class WDT:
+        def __init__(self, timeout):
+            pass
+
+        def feed(self):
+            pass
+
+    def reset():
+        raise AssertionError("machine.reset()")
+
+    module(
+        "machine",
+        Pin=Pin,
+        I2C=I2C,
+        Timer=Timer,
+        WDT=WDT,
+        PWRON_RESET=1,
+        WDT_RESET=3,
+        reset_cause=lambda: 1,
+        mem32={0x40058000: 0},
+        reset=reset,
+        soft_reset=reset,
+        unique_id=lambda: b"harness!",
+    )
+
+
+def fake_network():
+    class WLAN:
+        PM_PERFORMANCE = 0
+
+        def __init__(self, interface):
+            self._connected = True
+
+        def config(self, **kwargs):
+            pass
+
+        def active(self, active):
+            pass
+
+        def scan(self):
+            return [(b"harness", b"", 1, -50, 3, 0)]
+
+        def connect(self, ssid, password):
+            self._connected = True
+
+        def disconnect(self):
+            self._connected = False
+
+        def deinit(self):
+            pass
+
+        def isconnected(self):
+            return self._connected
+
+        def status(self):
+            return 3 if self._connected else 0
+
+        def ifconfig(self):
+            if self._connected:
+                return ("127.0.0.1", "255.0.0.0", "127.0.0.1", "127.0.0.1")
+            return ("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0")
+
+    module("network", WLAN=WLAN, STA_IF=0, STAT_GOT_IP=3, country=lambda c: None)
+
+
+def fake_usocket(broker: StalledBroker):
+    class Socket:
+        """
+        The micropython socket API on top of a CPython socket.
+        """
+
+        def __init__(self):
+            self._s = socket.socket()
+            self._s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+
+        def settimeout(self, timeout):
+            self._s.settimeout(timeout)
+
+        def setblocking(self, flag):
+            self._s.setblocking(flag)
+
+        def connect(self, address):
+            self._s.connect(address)
+
+        def _timed(self, f, *args):
+            start_s = time.monotonic()
+            try:
+                return f(*args)
+            except BlockingIOError:
+                # micropython: A non blocking read returns None
+                return None
+            except socket.timeout:
+                harness.stalled_s += time.monotonic() - start_s
+                print(f"HARNESS: broker stalled for {time.monotonic() - start_s:0.1f}s")
+                raise OSError(110, "ETIMEDOUT: broker")
+
+        def write(self, data, length=None):
+            if isinstance(data, str):
+                # micropython writes a str as utf-8
+                data = data.encode()
+            data = bytes(data if length is None else data[:length])
+            self._timed(self._s.sendall, data)
+            return len(data)
+
+        def read(self, count):
+            return self._timed(self._s.recv, count)
+
+        def close(self):
+            self._s.close()
+
+    module(
+        "usocket",
+        socket=Socket,
+        getaddrinfo=lambda host, port: [(2, 1, 0, "", broker.address)],
+    )
+
+
+def fake_modules(broker: StalledBroker):
+    builtins.const = lambda x: x
+    # Names only used in annotations: micropython does not evaluate them
+    builtins.Heater = builtins.Hardware = builtins.Sensoren = object
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    time.ticks_add = lambda ticks, delta: ticks + delta
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    gc.mem_alloc = lambda: 0
+    gc.mem_free = lambda: 200_000
+
+    fake_machine()
+    fake_network()
+    fake_usocket(broker)
+    module(
+        "micropython",
+        alloc_emergency_exception_buf=lambda size: None,
+        schedule=lambda f, arg: f(arg),
+    )
+    module("rp2", country=lambda c: None)
+    module("onewire", OneWire=object)
+    module("ds18x20", DS18X20=object)
+    module("ntptime", settime=lambda: harness.stall("NTP"))
+    module("urequests", get=lambda url: harness.stall("HTTP"))
+    module("ustruct", **struct.__dict__)
+    module("ubinascii", **binascii.__dict__)
+    module(
+        "config_secrets",
+        SSID_CREDENTIALS=((Ssid(b"harness"), "password"),),
+        MQTT_BROKER="127.0.0.1",
+        MQTT_BROKER_USER="user",
+        MQTT_BROKER_PW="password",
+        MQTT_CLIENT_ID="harness",
+        MQTT_TAGS={"setup": "harness"},
+        HW_SERIAL="harness",
+        HW_VERSION="harness",
+        APP_PACKAGE_URL="http://127.0.0.1/",
+        APP_PACKAGE_BRANCH="main",
+    )
+
+
+def run_mode(mode: str) -> None:
+    """
+    Runs main.py in this process. Exits the process: core 1 is still stalled.
+    """
+    broker = StalledBroker()
+    fake_modules(broker)
+    sys.path.insert(0, str(DIRECTORY_MICROPYTHON))
+    # Uncaught exceptions of `_thread.start_new_thread()`
+    def unraisablehook(args):
+        traceback.print_exception(args.exc_value)
+        harness.thread_errors.append(repr(args.exc_value))
+
+    sys.unraisablehook = unraisablehook
+
+    import config
+    import utils_constants
+
+    config.MEASURE_INTERVAL_MS = MEASURE_INTERVAL_MS
+    config.ENABLE_DUAL_CORE = mode == "dual_core"
+    # Nothing is written to the filesystem
+    config.LOGFILE_ENABLED = False
+    config.LOGRING_BYTES = 0
+    config.SPOOL_BUDGET_BYTES = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        utils_constants.DIRECTORY_LOGS = f"{tmp}/logs"
+        utils_constants.DIRECTORY_SPOOL = f"{tmp}/spool"
+        utils_constants.FILENAME_LOGRING = f"{tmp}/logring.txt"
+        utils_constants.FILENAME_LOGRING_UPLOAD = f"{tmp}/logring_upload.txt"
+        # The app package poll looks for files in the current directory
+        os.chdir(tmp)
+        source = (DIRECTORY_MICROPYTHON / "main.py").read_text()
+        try:
+            exec(compile(source, "main.py", "exec"), {"__name__": "__main__"})
+        except StopHarness:
+            pass
+        os.chdir(DIRECTORY_OF_THIS_FILE)
+
+    # The first cycle starts after the boot
+    gaps_ms = [
+        1000 * (b - a)
+        for a, b in zip(harness.heater_writes_s[2:], harness.heater_writes_s[3:])
+    ]
+    gap_max_ms = max(gaps_ms)
+    print(
+        f"RESULT {mode}: {len(gaps_ms)} cycles, heater gap max {gap_max_ms:0.0f}ms,"
+        f" network stalled {harness.stalled_s:0.1f}s,"
+        f" {harness.broker_connections} broker connections"
+    )
+    assert not harness.thread_errors, harness.thread_errors
+    assert harness.broker_connections >= 1
+    assert harness.stalled_s >= 2 * STALL_S, harness.stalled_s
+    if mode == "dual_core":
+        assert gap_max_ms < MEASURE_INTERVAL_MS + TOLERANCE_MS, gaps_ms
+    else:
+        # The heater waits for the network
+        assert gap_max_ms > 1000 * STALL_S, gaps_ms
+        assert (
+            gap_max_ms
+            < MEASURE_INTERVAL_MS + TOLERANCE_MS + 1000 * STALL_S * SINGLE_CORE_STALLS
+        ), gaps_ms
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def main():
+    results = []
+    for mode in MODES:
+        process = subprocess.run(
+            [sys.executable, __file__, mode],
+            capture_output=True,
+            text=True,
+            timeout=RUN_S + 30,
+        )
+        lines = [
+            line for line in process.stdout.splitlines() if line.startswith("RESULT")
+        ]
+        if process.returncode != 0:
+            print(process.stdout)
+            print(process.stderr)
+            raise AssertionError(f"{mode}: returncode {process.returncode}")
+        results.extend(lines)
+    print("\n".join(results))
+    print("OK")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_mode(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,242 @@
+"""
+Runs `utils_tar_stream.install()` of 'micropython/utils_tar_stream.py' on the PC.
+
+A local HTTP server stands in for the app package download.
+The tar and the '.tar.gz' are built like 'app_packager/app_packager.py' does.
+The '.tar.gz' is installed by `install(decompress(...))`: The micropython
+module 'deflate' is replaced by `DeflateIO` below.
+"""
+import hashlib
+import http.client
+import http.server
+import io
+import os
+import pathlib
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import types
+import urllib.request
+import zlib
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_tar_stream  # noqa: E402
+
+FILES_OLD = {
+    "main.py": b"print('old main')\n",
+    "utils_a.py": b"a = 1\n",
+}
+FILES_NEW = {
+    "main.py": b"print('new main')\n" * 200,
+    "utils_a.py": b"a = 2\n",
+    "utils_b.py": bytes(range(256)) * 40,
+    "lib/utils_c.py": b"c = 3\n",
+    "config_package_manifest.json": b'{"files": ["main.py", "utils_a.py", "utils_b.py", "lib/utils_c.py"]}',
+}
+
+
+def build_tar(files: dict) -> bytes:
+    """
+    A directory entry precedes the first file in it.
+    """
+    f = io.BytesIO()
+    with tarfile.open(name="app.tar", mode="w", fileobj=f) as tar:
+        directories = set()
+        for name, data in files.items():
+            directory = os.path.dirname(name)
+            if directory and (directory not in directories):
+                directories.add(directory)
+                tarinfo = tarfile.TarInfo(name=directory)
+                tarinfo.type = tarfile.DIRTYPE
+                tar.addfile(tarinfo)
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(data)
+            tar.addfile(tarinfo, io.BytesIO(data))
+    return f.getvalue()
+
+
+class DeflateIO:
+    """
+    On the PC: The API of 'deflate.DeflateIO' of micropython, used by
+    `utils_tar_stream.decompress()`. Only GZIP is implemented.
+    The window is limited to 2**wbits bytes like on the pico.
+    """
+
+    def __init__(self, stream, format=0, wbits=0, close=False):
+        assert format == deflate.GZIP, format
+        self._stream = stream
+        self._decompressor = zlib.decompressobj(16 + wbits)
+        self._pending = b""
+
+    def readinto(self, buf) -> int:
+        try:
+            while len(self._pending) == 0:
+                if self._decompressor.eof:
+                    return 0
+                data = self._decompressor.unconsumed_tail
+                if len(data) == 0:
+                    data = self._stream.read(len(buf))
+                    if len(data) == 0:
+                        # micropython: EIO
+                        raise OSError(5, "gzip truncated")
+                self._pending = self._decompressor.decompress(data, len(buf))
+        except zlib.error as e:
+            # micropython: EINVAL
+            raise OSError(22, str(e))
+        n = min(len(buf), len(self._pending))
+        buf[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+deflate = types.ModuleType("deflate")
+deflate.AUTO, deflate.RAW, deflate.ZLIB, deflate.GZIP = range(4)
+deflate.DeflateIO = DeflateIO
+sys.modules["deflate"] = deflate
+
+
+def build_tar_gz(tar: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + utils_tar_stream.GZIP_WBITS)
+    return compressor.compress(tar) + compressor.flush()
+
+
+class Server:
+    """
+    Serves 'files': {path: data}. 'truncate': Close the connection after this many bytes.
+    'bytes_per_s': Throttle like a slow WLAN.
+    """
+
+    def __init__(self, files: dict, bytes_per_s=None):
+        self.files = files
+        self.truncate = None
+        self.bytes_per_s = bytes_per_s
+        # The paths requested
+        self.requests = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                data = server.files.get(self.path, None)
+                if data is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if server.truncate is not None:
+                    data = data[: server.truncate]
+                # Small writes: The client sees partial reads
+                for i in range(0, len(data), 700):
+                    self.wfile.write(data[i : i + 700])
+                    self.wfile.flush()
+                    if server.bytes_per_s is not None:
+                        time.sleep(700 / server.bytes_per_s)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def close(self):
+        self._httpd.shutdown()
+
+
+def prepare(directory: pathlib.Path) -> None:
+    for filename in directory.iterdir():
+        if filename.is_dir():
+            shutil.rmtree(filename)
+        else:
+            filename.unlink()
+    for name, data in FILES_OLD.items():
+        (directory / name).write_bytes(data)
+
+
+def listing(directory: pathlib.Path) -> dict:
+    """
+    {relative path: data} of every file, directories are not listed.
+    """
+    return {
+        f.relative_to(directory).as_posix(): f.read_bytes()
+        for f in directory.rglob("*")
+        if f.is_file()
+    }
+
+
+def run_case(
+    label: str, server: Server, directory: pathlib.Path, sha256: str, path="/package.tar"
+):
+    prepare(directory)
+    with urllib.request.urlopen(server.url + path) as response:
+        stream = response
+        if path.endswith(".gz"):
+            stream = utils_tar_stream.decompress(response)
+        try:
+            installed = utils_tar_stream.install(stream, sha256_expected=sha256)
+        except http.client.IncompleteRead:
+            # urllib raises on a truncated body
+            installed = False
+    print(f"{label}: installed={installed}")
+    # A failed install removes the directories it created
+    assert (directory / "lib").is_dir() == installed
+    return installed, listing(directory)
+
+
+def main():
+    tar = build_tar(FILES_NEW)
+    tar_gz = build_tar_gz(tar)
+    sha256 = hashlib.sha256(tar).hexdigest()
+    server = Server({"/package.tar": tar, "/package.tar.gz": tar_gz})
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        os.chdir(directory)
+        try:
+            installed, files = run_case("valid", server, directory, sha256)
+            assert installed
+            assert files == FILES_NEW, files.keys()
+
+            installed, files = run_case("wrong sha256", server, directory, "0" * 64)
+            assert not installed
+            assert files == FILES_OLD, files.keys()
+
+            server.truncate = len(tar) // 2
+            installed, files = run_case("truncated", server, directory, sha256)
+            assert not installed
+            assert files == FILES_OLD, files.keys()
+            server.truncate = None
+
+            path = "/package.tar.gz"
+            installed, files = run_case("tar.gz", server, directory, sha256, path)
+            assert installed
+            assert files == FILES_NEW, files.keys()
+
+            # The gzip trailer: CRC-32 and size of the tar
+            server.files[path] = tar_gz[:-8] + bytes(8)
+            installed, files = run_case(
+                "corrupt tar.gz", server, directory, sha256, path
+            )
+            assert not installed
+            assert files == FILES_OLD, files.keys()
+
+            server.truncate = len(tar_gz) // 2
+            installed, files = run_case(
+                "truncated tar.gz", server, directory, sha256, path
+            )
+            assert not installed
+            assert files == FILES_OLD, files.keys()
+        finally:
+            os.chdir(cwd)
+            server.close()
+    print(f"OK: {len(tar)} bytes tar, no '{utils_tar_stream.STAGING_SUFFIX}' file left")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+NumPy versions of the functions in 'micropython/utils_humidity.py'.
+
+Intended to recompute dew point and absolute humidity of long logfiles
+on the PC. T, P and RH may be numpy arrays (or scalars) of the same shape.
+The results agree with the scalar functions within floating point
+rounding, see 'run_benchmark_humidity_numpy.py'.
+"""
+import numpy as np
+
+
+def _e_w(T: np.ndarray) -> np.ndarray:
+    """Sonntag-1994 eq 7; e_w in Pascals"""
+    ln_e_w = (
+        -6096 * T**-1
+        + 21.2409642
+        - 2.711193 * 10**-2 * T
+        + 1.673952 * 10**-5 * T**2
+        + 2.433502 * np.log(T)
+    )
+    return np.exp(ln_e_w)
+
+
+def _f_w(t: np.ndarray, e_w_hpa: np.ndarray, P_hpa: np.ndarray) -> np.ndarray:
+    """Sonntag-1994 eq 22, enhancement factor for water"""
+    return 1 + (10**-4 * e_w_hpa) / (273 + t) * (
+        ((38 + 173 * np.exp(-t / 43)) * (1 - (e_w_hpa / P_hpa)))
+        + ((6.39 + 4.28 * np.exp(-t / 107)) * ((P_hpa / e_w_hpa) - 1))
+    )
+
+
+def _e_prime(T: np.ndarray, P: np.ndarray, RH: np.ndarray):
+    """
+    Returns (e_prime, e_w_hpa, t, P_hpa)
+    e_prime: vapor pressure of water in air, in Pascals
+    """
+    t = T - 273.15  # Celsius from Kelvin
+    P_hpa = P / 100  # hectoPascals (hPa) from Pascals (Pa)
+    e_w = _e_w(T)
+    e_w_hpa = e_w / 100
+    e_prime_w = _f_w(t, e_w_hpa, P_hpa) * e_w  # Sonntag-1994 eq 18
+    e_prime = (RH / 100) * e_prime_w
+    return e_prime, e_w_hpa, t, P_hpa
+
+
+def _as_arrays(T, P, RH):
+    return np.broadcast_arrays(
+        np.asarray(T, dtype=np.float64),
+        np.asarray(P, dtype=np.float64),
+        np.asarray(RH, dtype=np.float64),
+    )
+
+
+def rel_to_abs(T, P, RH) -> np.ndarray:
+    """
+    Same as `utils_humidity.rel_to_abs()`.
+    Returns absolute humidity in units [kg water vapor / kg dry air].
+    """
+    T, P, RH = _as_arrays(T, P, RH)
+    epsilon = 0.62198  # (molar mass of water vapor) / (molar mass of dry air)
+    e_prime, _, _, _ = _e_prime(T, P, np.maximum(0.1, RH))
+    return (epsilon * e_prime) / (P - e_prime)
+
+
+def rel_to_vol(T, P, RH) -> np.ndarray:
+    """
+    Same as `utils_humidity.rel_to_vol()`.
+    Returns volumetric humidity in units [kg water vapor / m^3 moist air].
+    """
+    T, P, RH = _as_arrays(T, P, RH)
+    R_v = 461.525  # R/M_v; units: [J / (kg*K)]
+    c_1 = 10**5  # [(g/m^3) / ((1/hPa)*(J/(kg*K))*(K/1))]
+    e_prime, _, t, P_hpa = _e_prime(T, P, RH)
+    e_prime_hpa = e_prime / 100
+    z = 1 - (70 - t) * P_hpa * 10**-8  # Sonntag-1994 eq 3
+    d_v = (c_1 * e_prime_hpa) / (z * R_v * T)
+    return d_v / 1000
+
+
+def rel_to_dpt(T, P, RH) -> np.ndarray:
+    """
+    Same as `utils_humidity.rel_to_dpt()`.
+    Returns dew point temperature in units Kelvin (K).
+
+    The fixed point iteration runs on all elements at once. An element
+    is frozen as soon as it converged, exactly as the scalar loop would
+    return, so every element sees the same number of iterations as in
+    the scalar function.
+    """
+    T, P, RH = _as_arrays(T, P, RH)
+    shape = T.shape
+    T, P, RH = T.ravel(), P.ravel(), RH.ravel()
+    e_prime, e_w_hpa, _, P_hpa = _e_prime(T, P, np.maximum(0.1, RH))
+
+    def t_d_from(f_w_td: np.ndarray, e_prime: np.ndarray) -> np.ndarray:
+        # Sonntag-1994 eq 9, 20 and 10
+        y = np.log(e_prime / f_w_td / 611.213)
+        return (
+            13.715 * y
+            + 8.4262 * 10**-1 * y**2
+            + 1.9048 * 10**-2 * y**3
+            + 7.8158 * 10**-3 * y**4
+        )
+
+    # Sonntag-1994 eq 24, initial approximation
+    f = 1.0016 + 3.15 * 10**-6 * P_hpa - (0.074 / P_hpa)
+    t_d = t_d_from(f, e_prime)
+
+    active = np.ones(t_d.shape, dtype=bool)
+    for _n in range(1, 102):
+        idx = np.nonzero(active)
+        if len(idx[0]) == 0:
+            break
+        t_d_prev = t_d[idx]
+        f_w_td = _f_w(t_d_prev, e_w_hpa[idx], P_hpa[idx])
+        t_d_new = t_d_from(f_w_td, e_prime[idx])
+        t_d[idx] = t_d_new
+        converged = np.abs(t_d_new - t_d_prev) < 0.01
+        active[idx] = ~converged
+
+    return (273.15 + t_d).reshape(shape)
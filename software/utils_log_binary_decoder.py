@@ -0,0 +1,115 @@
+"""
+Decodes the binary logfile 'logdata_<n>.bin' written by 'micropython/utils_logfile.py'.
+The format is described in 'micropython/utils_log_binary.py'.
+
+The rows are the same as in the text logfile: `run_diagram.LogReader` reads both.
+"""
+import pathlib
+import struct
+import sys
+from typing import List, Tuple
+
+DIRECTORY_OF_THIS_FILE = pathlib.Path(__file__).parent
+sys.path.insert(0, str(DIRECTORY_OF_THIS_FILE / "micropython"))
+
+import utils_log_binary  # noqa: E402
+
+TAG_SENSORS_HEADER = "SENSORS_HEADER"
+TAG_SENSORS_UNITS = "SENSORS_UNITS"
+TAG_SENSORS_VALUES = "SENSORS_VALUES"
+TEXT_INVALID = "-"
+
+
+def _decode_values(data, pos, decimals, strings, previous, interval_ms) -> tuple:
+    """
+    Decode a RECORD_VALUES after the type.
+    Returns (row, interval_ms, position after it).
+    'previous' is only updated if the record is complete:
+    IndexError for a truncated record.
+    """
+    n, pos = utils_log_binary.unpack_varint(data, pos)
+    interval_ms += utils_log_binary.unzigzag(n)
+    # time_ms: Set by the caller
+    row = [None, TAG_SENSORS_VALUES]
+    values = list(previous)
+    for column, d in enumerate(decimals):
+        if d is None:
+            row.append(strings[column])
+            continue
+        n, pos = utils_log_binary.unpack_varint(data, pos)
+        if n == utils_log_binary.VALUE_INVALID:
+            row.append(TEXT_INVALID)
+            continue
+        values[column] += utils_log_binary.unzigzag(n - 1)
+        row.append(f"{values[column] / 10**d:0.{d}f}")
+    previous[:] = values
+    return row, interval_ms, pos
+
+
+def decode(data: bytes) -> Tuple[List[str], List[List[str]]]:
+    """
+    Returns (header, rows).
+    header: ["0", "SENSORS_HEADER", names...]
+    rows: ["0", "SENSORS_UNITS", units...], then
+      [time_ms, "SENSORS_VALUES", values...] per record.
+    A truncated last record (power loss) is ignored.
+    """
+    magic = utils_log_binary.MAGIC
+    if not data.startswith(magic):
+        raise ValueError("Not a binary logfile: magic missing")
+    pos = len(magic)
+    lines = []
+    for _ in range(3):
+        end = data.index(b"\n", pos)
+        lines.append(data[pos:end].decode().split("\t"))
+        pos = end + 1
+    names, units, decimals = lines
+    decimals = [
+        None if d == utils_log_binary.DECIMALS_STRING else int(d) for d in decimals
+    ]
+    header = ["0", TAG_SENSORS_HEADER, *names]
+    rows = [["0", TAG_SENSORS_UNITS, *units]]
+    strings = [""] * len(names)
+    previous = [0] * len(names)
+    time_ms = 0
+    interval_ms = 0
+    while pos < len(data):
+        record = data[pos]
+        if record == utils_log_binary.RECORD_STRING:
+            if pos + 3 > len(data):
+                break
+            _record, column, length = struct.unpack_from("<BBB", data, pos)
+            end = pos + 3 + length
+            if end > len(data):
+                break
+            strings[column] = data[pos + 3 : end].decode()
+            pos = end
+            continue
+        if record != utils_log_binary.RECORD_VALUES:
+            raise ValueError(f"Unknown record 0x{record:02X} at {pos}")
+        try:
+            row, interval_ms, pos = _decode_values(
+                data, pos + 1, decimals, strings, previous, interval_ms
+            )
+        except IndexError:
+            break
+        time_ms += interval_ms
+        row[0] = str(time_ms)
+        rows.append(row)
+    return header, rows
+
+
+def read(filename: pathlib.Path) -> Tuple[List[str], List[List[str]]]:
+    return decode(filename.read_bytes())
+
+
+def main():
+    filename = pathlib.Path(sys.argv[1])
+    header, rows = read(filename)
+    print("\t".join(header))
+    for row in rows:
+        print("\t".join(row))
+
+
+if __name__ == "__main__":
+    main()